@@ -1,199 +1,332 @@
 # aluminium_calculators.py
-from typing import Dict, Any
-from aluminium_constants import (
-    KWH_TO_MJ, L_DIESEL_MJ, L_HEAVYOIL_MJ, KG_COAL_MJ,
-    GRID_CO2_KG_PER_KWH, DIESEL_CO2_KG_PER_L, HEAVYOIL_CO2_KG_PER_L,
-    NG_CO2_KG_PER_MJ, COAL_CO2_KG_PER_KG, ANODE_CARBON_CO2_KG_PER_KG,
-    DIESEL_CH4_KG_PER_L, DIESEL_N2O_KG_PER_L,
-    PM_PER_DIESEL_L, NOX_PER_GAS_MJ, PM_PER_COAL_KG,
-    WATER_SCARCITY_FACTOR
-)
-
-
-def _sum_energy_mj_from_inputs(inputs: Dict[str, Any]) -> float:
-    """Sum energy from common fields if present (returns MJ)."""
-    total = 0.0
-    if "electricity_kWh" in inputs:
-        total += float(inputs.get("electricity_kWh", 0.0)) * KWH_TO_MJ
-    if "fuel_diesel_L" in inputs:
-        total += float(inputs.get("fuel_diesel_L", 0.0)) * L_DIESEL_MJ
-    if "fuel_heavyOil_L" in inputs:
-        total += float(inputs.get("fuel_heavyOil_L", 0.0)) * L_HEAVYOIL_MJ
-    if "fuel_coal_kg" in inputs:
-        total += float(inputs.get("fuel_coal_kg", 0.0)) * KG_COAL_MJ
-    if "fuel_naturalGas_MJ" in inputs:
-        total += float(inputs.get("fuel_naturalGas_MJ", 0.0))
-    return total
-
-
-def compute_mining(inputs: Dict[str, Any]) -> Dict[str, Any]:
-    # inputs expected: ore_input_kg, ore_grade_percent, process_recovery, electricity_kWh, fuel_diesel_L, freshwater_m3, process_water_m3, water_returned_m3 (optional)
-    ore_input_kg = float(inputs.get("ore_input_kg", 0.0))
-    ore_grade_percent = float(inputs.get("ore_grade_percent", 0.0))
-    process_recovery = float(inputs.get("process_recovery", 1.0))
-    aux_materials_kg = float(inputs.get("auxiliary_materials_kg", 0.0))
+from typing import Dict, Any, NamedTuple
+import numpy as np
+from aluminium_constants import AL_CONSTANTS
+from jit_utils import njit, prange, eager_signature
+from batch_utils import (batch_inputs, batch_size, batch_field, input_dtype,
+                         stage_section, stage_matrix, check_stage_matrix, field_alias)
+
+# example arguments used to build the eager-compilation signatures below
+_F = 0.0
+_FUEL_CO2 = (0.0, 0.0, 0.0, 0.0)
+
+
+# Flat per-stage results returned by the numeric cores; the public calculators
+# turn these into the nested result dicts exactly once.
+class MiningResult(NamedTuple):
+    yield_metal_t: float
+    total_material_input_kg: float
+    energy_MJ: float
+    water_m3: float
+    waste_solid_kg: float
+    co2_kg: float
+    ch4_kg: float
+    n2o_kg: float
+    nox_kg: float
+    particulates_kg: float
+    gwp_kgCO2e: float
+
+
+class ExtractionResult(NamedTuple):
+    yield_metal_t: float
+    total_material_input_kg: float
+    energy_MJ: float
+    waste_solid_kg: float
+    co2_kg: float
+    cf4_kg: float
+    c2f6_kg: float
+    pfc_co2e_kgCO2e: float
+    nox_kg: float
+    particulates_kg: float
+    gwp_kgCO2e: float
+
+
+class ManufacturingResult(NamedTuple):
+    yield_metal_t: float
+    total_material_input_kg: float
+    energy_MJ: float
+    water_m3: float
+    co2_kg: float
+    nox_kg: float
+    particulates_kg: float
+    gwp_kgCO2e: float
+
+
+@njit(eager_signature(2, AL_CONSTANTS, *(_F,) * 5, _FUEL_CO2), cache=True)
+def _sum_energy_and_co2(C, electricity_kWh, diesel_L, heavy_oil_L, coal_kg, ng_MJ, fuel_co2):
+    """Energy (MJ) and energy-related CO2 (kg) accumulated in a single pass.
+
+    fuel_co2 holds the stage's CO2 factors for (diesel, heavy oil, coal, natural gas);
+    electricity always uses the grid factor.
+    """
+    ef_diesel, ef_heavy_oil, ef_coal, ef_ng = fuel_co2
+    energy_mj = electricity_kWh * C.KWH_TO_MJ
+    co2_kg = electricity_kWh * C.GRID_CO2_KG_PER_KWH
+    energy_mj += diesel_L * C.L_DIESEL_MJ
+    co2_kg += diesel_L * ef_diesel
+    energy_mj += heavy_oil_L * C.L_HEAVYOIL_MJ
+    co2_kg += heavy_oil_L * ef_heavy_oil
+    energy_mj += coal_kg * C.KG_COAL_MJ
+    co2_kg += coal_kg * ef_coal
+    energy_mj += ng_MJ
+    co2_kg += ng_MJ * ef_ng
+    return energy_mj, co2_kg
+
+
+# -----------------------
+# Numeric cores (Numba-compiled when available). Positional floats in, result record out.
+# -----------------------
+
+
+@njit(eager_signature(MiningResult, AL_CONSTANTS, *(_F,) * 13), cache=True)
+def _mining_core(C, ore_input_kg, ore_grade_percent, process_recovery, aux_materials_kg,
+                 electricity_kWh, diesel_L, heavy_oil_L, coal_kg, ng_MJ,
+                 freshwater_m3, process_water_m3, water_returned_m3,
+                 co_product_outputs_total_kg):
     # yield metal in tonnes
     yield_metal_t = (ore_input_kg * (ore_grade_percent / 100.0)
                      * process_recovery) / 1000.0
 
     total_material_input_kg = ore_input_kg + aux_materials_kg
-    energy_mj = _sum_energy_mj_from_inputs(inputs)
+    energy_mj, emissions_co2 = _sum_energy_and_co2(
+        C, electricity_kWh, diesel_L, heavy_oil_L, coal_kg, ng_MJ,
+        (C.DIESEL_CO2_KG_PER_L, C.HEAVYOIL_CO2_KG_PER_L, 0.0, C.NG_CO2_KG_PER_MJ))
 
-    # water
-    freshwater_m3 = float(inputs.get("freshwater_m3", 0.0))
-    process_water_m3 = float(inputs.get("process_water_m3", 0.0))
-    water_returned_m3 = float(inputs.get("water_returned_m3", 0.0))
     water_consumed_m3 = freshwater_m3 + process_water_m3 - water_returned_m3
 
     # waste
-    co_product_outputs_total_kg = float(
-        inputs.get("co_product_outputs_total_kg", 0.0))
     waste_solid_kg = max(0.0, ore_input_kg - yield_metal_t *
                          1000.0 - co_product_outputs_total_kg)
 
     # emissions (air) simplified
-    emissions_co2 = 0.0
-    if "electricity_kWh" in inputs:
-        emissions_co2 += float(inputs.get("electricity_kWh",
-                               0.0)) * GRID_CO2_KG_PER_KWH
-    emissions_co2 += float(inputs.get("fuel_diesel_L",
-                           0.0)) * DIESEL_CO2_KG_PER_L
-    emissions_co2 += float(inputs.get("fuel_heavyOil_L",
-                           0.0)) * HEAVYOIL_CO2_KG_PER_L
-    emissions_co2 += float(inputs.get("fuel_naturalGas_MJ",
-                           0.0)) * NG_CO2_KG_PER_MJ
-
-    emissions_ch4 = float(inputs.get("fuel_diesel_L", 0.0)
-                          ) * DIESEL_CH4_KG_PER_L
-    emissions_n2o = float(inputs.get("fuel_diesel_L", 0.0)
-                          ) * DIESEL_N2O_KG_PER_L
-    emissions_nox = float(inputs.get("fuel_diesel_L", 0.0)
-                          ) * PM_PER_DIESEL_L  # placeholder
-    particulate = float(inputs.get("fuel_diesel_L", 0.0)) * PM_PER_DIESEL_L
+    emissions_ch4 = diesel_L * C.DIESEL_CH4_KG_PER_L
+    emissions_n2o = diesel_L * C.DIESEL_N2O_KG_PER_L
+    emissions_nox = diesel_L * C.PM_PER_DIESEL_L  # placeholder
+    particulate = diesel_L * C.PM_PER_DIESEL_L
 
     # basic LCIA metric: GWP in kg CO2e (CO2 + CH4*28 + N2O*265)
     gwp = emissions_co2 + emissions_ch4 * 28.0 + emissions_n2o * 265.0
 
-    return {
-        "yield_metal_t": yield_metal_t,
-        "total_material_input_kg": total_material_input_kg,
-        "energy_MJ": energy_mj,
-        "water_m3": water_consumed_m3,
-        "waste_solid_kg": waste_solid_kg,
-        "emissions": {
-            "co2_kg": emissions_co2,
-            "ch4_kg": emissions_ch4,
-            "n2o_kg": emissions_n2o,
-            "nox_kg": emissions_nox,
-            "particulates_kg": particulate
-        },
-        "gwp_kgCO2e": gwp
-    }
-
+    return MiningResult(yield_metal_t, total_material_input_kg, energy_mj, water_consumed_m3,
+                        waste_solid_kg, emissions_co2, emissions_ch4, emissions_n2o,
+                        emissions_nox, particulate, gwp)
 
-def compute_extraction(inputs: Dict[str, Any]) -> Dict[str, Any]:
-    # inputs: ore_input_kg, fraction_alumina, reduction_efficiency, electricity_kWh, fuel_coal_kg, anode_carbon_kg, fuel_naturalGas_MJ, etc.
-    ore_input_kg = float(inputs.get("ore_input_kg", 0.0))
-    fraction_alumina = float(inputs.get("fraction_alumina", 0.0))
-    reduction_efficiency = float(inputs.get("reduction_efficiency", 1.0))
 
+@njit(eager_signature(ExtractionResult, AL_CONSTANTS, *(_F,) * 15), cache=True)
+def _extraction_core(C, ore_input_kg, fraction_alumina, reduction_efficiency, anode_materials_kg,
+                     electricity_kWh, diesel_L, heavy_oil_L, coal_kg, ng_MJ,
+                     anode_carbon_kg, anode_effect_minutes, cf4_factor, c2f6_factor,
+                     impurity_fraction, anode_residue_kg):
     yield_metal_t = (ore_input_kg * fraction_alumina *
                      reduction_efficiency) / 1000.0
-    total_material_input_kg = ore_input_kg + \
-        float(inputs.get("anode_materials", 0.0))
-    energy_mj = _sum_energy_mj_from_inputs(inputs)
+    total_material_input_kg = ore_input_kg + anode_materials_kg
+    energy_mj, emissions_co2 = _sum_energy_and_co2(
+        C, electricity_kWh, diesel_L, heavy_oil_L, coal_kg, ng_MJ,
+        (0.0, 0.0, C.COAL_CO2_KG_PER_KG, C.NG_CO2_KG_PER_MJ))
 
     # waste
-    impurity_fraction = float(inputs.get("impurity_fraction", 0.0))
-    anode_residue_kg = float(inputs.get("anode_residue_kg", 0.0))
     waste_solid_kg = (ore_input_kg * impurity_fraction) + anode_residue_kg
 
-    # emissions
-    emissions_co2 = 0.0
-    if "electricity_kWh" in inputs:
-        emissions_co2 += float(inputs.get("electricity_kWh",
-                               0.0)) * GRID_CO2_KG_PER_KWH
-    emissions_co2 += float(inputs.get("fuel_coal_kg", 0.0)
-                           ) * COAL_CO2_KG_PER_KG
-    emissions_co2 += float(inputs.get("fuel_naturalGas_MJ",
-                           0.0)) * NG_CO2_KG_PER_MJ
-    emissions_co2 += float(inputs.get("anode_carbon_kg", 0.0)
-                           ) * ANODE_CARBON_CO2_KG_PER_KG
+    # emissions: energy-related CO2 plus anode consumption
+    emissions_co2 += anode_carbon_kg * C.ANODE_CARBON_CO2_KG_PER_KG
 
     # PFCs simple estimate
-    cf4_kg = float(inputs.get("anode_effect_minutes", 0.0)) * \
-        float(inputs.get("CF4_factor", 0.0))
-    c2f6_kg = float(inputs.get("anode_effect_minutes", 0.0)) * \
-        float(inputs.get("C2F6_factor", 0.0))
+    cf4_kg = anode_effect_minutes * cf4_factor
+    c2f6_kg = anode_effect_minutes * c2f6_factor
     pfc_co2e = cf4_kg * 7390.0 + c2f6_kg * 12200.0
 
     # other small emissions
-    nox_kg = float(inputs.get("fuel_naturalGas_MJ", 0.0)) * NOX_PER_GAS_MJ
-    particulates_kg = float(inputs.get("fuel_coal_kg", 0.0)) * PM_PER_COAL_KG
+    nox_kg = ng_MJ * C.NOX_PER_GAS_MJ
+    particulates_kg = coal_kg * C.PM_PER_COAL_KG
 
     gwp = emissions_co2 + pfc_co2e
 
-    return {
-        "yield_metal_t": yield_metal_t,
-        "total_material_input_kg": total_material_input_kg,
-        "energy_MJ": energy_mj,
-        "waste_solid_kg": waste_solid_kg,
-        "emissions": {
-            "co2_kg": emissions_co2,
-            "cf4_kg": cf4_kg,
-            "c2f6_kg": c2f6_kg,
-            "pfc_co2e_kgCO2e": pfc_co2e,
-            "nox_kg": nox_kg,
-            "particulates_kg": particulates_kg
-        },
-        "gwp_kgCO2e": gwp
-    }
+    return ExtractionResult(yield_metal_t, total_material_input_kg, energy_mj, waste_solid_kg,
+                            emissions_co2, cf4_kg, c2f6_kg, pfc_co2e, nox_kg, particulates_kg,
+                            gwp)
 
 
-def compute_manufacturing(inputs: Dict[str, Any]) -> Dict[str, Any]:
-    # inputs: metal_input_kg, process_yield, electricity_kWh, fuel_naturalGas_MJ, lubricants_kg, etc.
-    metal_input_kg = float(inputs.get(
-        "metal_input_kg", inputs.get("metal_input", 0.0)))
-    process_yield = float(inputs.get("process_yield", 1.0))
+@njit(eager_signature(ManufacturingResult, AL_CONSTANTS, *(_F,) * 12), cache=True)
+def _manufacturing_core(C, metal_input_kg, process_yield, lubricants_kg,
+                        electricity_kWh, diesel_L, heavy_oil_L, coal_kg, ng_MJ,
+                        freshwater_m3, process_water_m3, water_returned_m3,
+                        aux_materials_kg):
     yield_metal_t = (metal_input_kg * process_yield) / 1000.0
-    total_material_input_kg = metal_input_kg + \
-        float(inputs.get("lubricants_kg", 0.0))
-    energy_mj = _sum_energy_mj_from_inputs(inputs)
+    total_material_input_kg = metal_input_kg + lubricants_kg
+    energy_mj, emissions_co2 = _sum_energy_and_co2(
+        C, electricity_kWh, diesel_L, heavy_oil_L, coal_kg, ng_MJ,
+        (0.0, 0.0, 0.0, C.NG_CO2_KG_PER_MJ))
 
     # water consumed
-    freshwater_m3 = float(inputs.get("freshwater_m3", 0.0))
-    process_water_m3 = float(inputs.get("process_water_m3", 0.0))
-    water_returned_m3 = float(inputs.get("cooling_water_returned", 0.0))
     water_consumed_m3 = freshwater_m3 + process_water_m3 - water_returned_m3
 
     # emissions
-    emissions_co2 = 0.0
-    if "electricity_kWh" in inputs:
-        emissions_co2 += float(inputs.get("electricity_kWh",
-                               0.0)) * GRID_CO2_KG_PER_KWH
-    emissions_co2 += float(inputs.get("fuel_naturalGas_MJ",
-                           0.0)) * NG_CO2_KG_PER_MJ
-
-    nox_kg = float(inputs.get("fuel_naturalGas_MJ", 0.0)) * NOX_PER_GAS_MJ
-    particulates_kg = float(inputs.get("auxiliary_materials_kg", 0.0)) * 0.001
+    nox_kg = ng_MJ * C.NOX_PER_GAS_MJ
+    particulates_kg = aux_materials_kg * 0.001
 
     gwp = emissions_co2
 
+    return ManufacturingResult(yield_metal_t, total_material_input_kg, energy_mj,
+                               water_consumed_m3, emissions_co2, nox_kg, particulates_kg, gwp)
+
+
+# Input fields (and defaults) in the positional order each core expects
+_MINING_FIELDS = (
+    ("ore_input_kg", 0.0), ("ore_grade_percent", 0.0), ("process_recovery", 1.0),
+    ("auxiliary_materials_kg", 0.0), ("electricity_kWh", 0.0), ("fuel_diesel_L", 0.0),
+    ("fuel_heavyOil_L", 0.0), ("fuel_coal_kg", 0.0), ("fuel_naturalGas_MJ", 0.0),
+    ("freshwater_m3", 0.0), ("process_water_m3", 0.0), ("water_returned_m3", 0.0),
+    ("co_product_outputs_total_kg", 0.0),
+)
+_EXTRACTION_FIELDS = (
+    ("ore_input_kg", 0.0), ("fraction_alumina", 0.0), ("reduction_efficiency", 1.0),
+    ("anode_materials", 0.0), ("electricity_kWh", 0.0), ("fuel_diesel_L", 0.0),
+    ("fuel_heavyOil_L", 0.0), ("fuel_coal_kg", 0.0), ("fuel_naturalGas_MJ", 0.0),
+    ("anode_carbon_kg", 0.0), ("anode_effect_minutes", 0.0), ("CF4_factor", 0.0),
+    ("C2F6_factor", 0.0), ("impurity_fraction", 0.0), ("anode_residue_kg", 0.0),
+)
+_MANUFACTURING_FIELDS = (
+    ("metal_input_kg", 0.0), ("process_yield", 1.0), ("lubricants_kg", 0.0),
+    ("electricity_kWh", 0.0), ("fuel_diesel_L", 0.0), ("fuel_heavyOil_L", 0.0),
+    ("fuel_coal_kg", 0.0), ("fuel_naturalGas_MJ", 0.0), ("freshwater_m3", 0.0),
+    ("process_water_m3", 0.0), ("cooling_water_returned", 0.0),
+    ("auxiliary_materials_kg", 0.0),
+)
+
+
+# -----------------------
+# Stage calculators: unpack the dict once, run the core, repack the result.
+# The factors travel into the cores as AL_CONSTANTS, so the only per-field
+# lookup left here is the bound inputs.get.
+# -----------------------
+
+
+def compute_mining(inputs: Dict[str, Any]) -> Dict[str, Any]:
+    # inputs expected: ore_input_kg, ore_grade_percent, process_recovery, electricity_kWh, fuel_diesel_L, freshwater_m3, process_water_m3, water_returned_m3 (optional)
+    get = inputs.get
+    r = _mining_core(
+        AL_CONSTANTS,
+        float(get("ore_input_kg", 0.0)),
+        float(get("ore_grade_percent", 0.0)),
+        float(get("process_recovery", 1.0)),
+        float(get("auxiliary_materials_kg", 0.0)),
+        float(get("electricity_kWh", 0.0)),
+        float(get("fuel_diesel_L", 0.0)),
+        float(get("fuel_heavyOil_L", 0.0)),
+        float(get("fuel_coal_kg", 0.0)),
+        float(get("fuel_naturalGas_MJ", 0.0)),
+        float(get("freshwater_m3", 0.0)),
+        float(get("process_water_m3", 0.0)),
+        float(get("water_returned_m3", 0.0)),
+        float(get("co_product_outputs_total_kg", 0.0)))
+    return _mining_dict(r)
+
+
+def _mining_dict(r: MiningResult) -> Dict[str, Any]:
+    # r holds floats (one scenario) or arrays (a batch)
     return {
-        "yield_metal_t": yield_metal_t,
-        "total_material_input_kg": total_material_input_kg,
-        "energy_MJ": energy_mj,
-        "water_m3": water_consumed_m3,
-        "waste_solid_kg": float(inputs.get("scrap_kg", 0.0)),
+        "yield_metal_t": r.yield_metal_t,
+        "total_material_input_kg": r.total_material_input_kg,
+        "energy_MJ": r.energy_MJ,
+        "water_m3": r.water_m3,
+        "waste_solid_kg": r.waste_solid_kg,
         "emissions": {
-            "co2_kg": emissions_co2,
-            "nox_kg": nox_kg,
-            "particulates_kg": particulates_kg
+            "co2_kg": r.co2_kg,
+            "ch4_kg": r.ch4_kg,
+            "n2o_kg": r.n2o_kg,
+            "nox_kg": r.nox_kg,
+            "particulates_kg": r.particulates_kg
         },
-        "gwp_kgCO2e": gwp
+        "gwp_kgCO2e": r.gwp_kgCO2e
     }
 
 
+def compute_extraction(inputs: Dict[str, Any]) -> Dict[str, Any]:
+    # inputs: ore_input_kg, fraction_alumina, reduction_efficiency, electricity_kWh, fuel_coal_kg, anode_carbon_kg, fuel_naturalGas_MJ, etc.
+    get = inputs.get
+    r = _extraction_core(
+        AL_CONSTANTS,
+        float(get("ore_input_kg", 0.0)),
+        float(get("fraction_alumina", 0.0)),
+        float(get("reduction_efficiency", 1.0)),
+        float(get("anode_materials", 0.0)),
+        float(get("electricity_kWh", 0.0)),
+        float(get("fuel_diesel_L", 0.0)),
+        float(get("fuel_heavyOil_L", 0.0)),
+        float(get("fuel_coal_kg", 0.0)),
+        float(get("fuel_naturalGas_MJ", 0.0)),
+        float(get("anode_carbon_kg", 0.0)),
+        float(get("anode_effect_minutes", 0.0)),
+        float(get("CF4_factor", 0.0)),
+        float(get("C2F6_factor", 0.0)),
+        float(get("impurity_fraction", 0.0)),
+        float(get("anode_residue_kg", 0.0)))
+    return _extraction_dict(r)
+
+
+def _extraction_dict(r: ExtractionResult) -> Dict[str, Any]:
+    return {
+        "yield_metal_t": r.yield_metal_t,
+        "total_material_input_kg": r.total_material_input_kg,
+        "energy_MJ": r.energy_MJ,
+        "waste_solid_kg": r.waste_solid_kg,
+        "emissions": {
+            "co2_kg": r.co2_kg,
+            "cf4_kg": r.cf4_kg,
+            "c2f6_kg": r.c2f6_kg,
+            "pfc_co2e_kgCO2e": r.pfc_co2e_kgCO2e,
+            "nox_kg": r.nox_kg,
+            "particulates_kg": r.particulates_kg
+        },
+        "gwp_kgCO2e": r.gwp_kgCO2e
+    }
+
+
+def compute_manufacturing(inputs: Dict[str, Any]) -> Dict[str, Any]:
+    # inputs: metal_input_kg, process_yield, electricity_kWh, fuel_naturalGas_MJ, lubricants_kg, etc.
+    get = inputs.get
+    scrap_kg = float(get("scrap_kg", 0.0))
+    r = _manufacturing_core(
+        AL_CONSTANTS,
+        float(get("metal_input_kg", get("metal_input", 0.0))),
+        float(get("process_yield", 1.0)),
+        float(get("lubricants_kg", 0.0)),
+        float(get("electricity_kWh", 0.0)),
+        float(get("fuel_diesel_L", 0.0)),
+        float(get("fuel_heavyOil_L", 0.0)),
+        float(get("fuel_coal_kg", 0.0)),
+        float(get("fuel_naturalGas_MJ", 0.0)),
+        float(get("freshwater_m3", 0.0)),
+        float(get("process_water_m3", 0.0)),
+        float(get("cooling_water_returned", 0.0)),
+        float(get("auxiliary_materials_kg", 0.0)))
+    return _manufacturing_dict(r, scrap_kg)
+
+
+def _manufacturing_dict(r: ManufacturingResult, scrap_kg) -> Dict[str, Any]:
+    return {
+        "yield_metal_t": r.yield_metal_t,
+        "total_material_input_kg": r.total_material_input_kg,
+        "energy_MJ": r.energy_MJ,
+        "water_m3": r.water_m3,
+        "waste_solid_kg": scrap_kg,
+        "emissions": {
+            "co2_kg": r.co2_kg,
+            "nox_kg": r.nox_kg,
+            "particulates_kg": r.particulates_kg
+        },
+        "gwp_kgCO2e": r.gwp_kgCO2e
+    }
+
+
+def warm_up() -> None:
+    """Touch each numeric core once so the API can do it before serving traffic."""
+    _mining_core(AL_CONSTANTS, *(_F,) * 13)
+    _extraction_core(AL_CONSTANTS, *(_F,) * 15)
+    _manufacturing_core(AL_CONSTANTS, *(_F,) * 12)
+    compute_combined_lca_batch({"inputs": {}})
+
+
 def compute_combined_lca(payload: Dict[str, Any]) -> Dict[str, Any]:
     """
     payload contains:
@@ -253,3 +386,154 @@ def compute_combined_lca(payload: Dict[str, Any]) -> Dict[str, Any]:
             "avoided_primary_co2e_kg": avoided
         }
     }
+
+
+# -----------------------
+# Per-stage batch: the same cores over N scenarios, every output field an array
+# -----------------------
+
+
+@njit(parallel=True, nogil=True, cache=True)
+def _mining_batch(C, rows, out):
+    """Fill out[:, i] with the MiningResult fields of scenario i, in parallel."""
+    for i in prange(out.shape[1]):
+        m = rows[i]
+        r = _mining_core(C, m[0], m[1], m[2], m[3], m[4], m[5], m[6], m[7], m[8], m[9],
+                         m[10], m[11], m[12])
+        for j in range(len(r)):
+            out[j, i] = r[j]
+
+
+@njit(parallel=True, nogil=True, cache=True)
+def _extraction_batch(C, rows, out):
+    """Fill out[:, i] with the ExtractionResult fields of scenario i, in parallel."""
+    for i in prange(out.shape[1]):
+        e = rows[i]
+        r = _extraction_core(C, e[0], e[1], e[2], e[3], e[4], e[5], e[6], e[7], e[8], e[9],
+                             e[10], e[11], e[12], e[13], e[14])
+        for j in range(len(r)):
+            out[j, i] = r[j]
+
+
+@njit(parallel=True, nogil=True, cache=True)
+def _manufacturing_batch(C, rows, out):
+    """Fill out[:, i] with the ManufacturingResult fields of scenario i, in parallel."""
+    for i in prange(out.shape[1]):
+        f = rows[i]
+        r = _manufacturing_core(C, f[0], f[1], f[2], f[3], f[4], f[5], f[6], f[7], f[8],
+                                f[9], f[10], f[11])
+        for j in range(len(r)):
+            out[j, i] = r[j]
+
+
+def _stage_batch(kernel, result_type, inputs, fields, stage: str):
+    """Run one stage kernel over a batch section; the result record holds one array per field."""
+    n = batch_size(inputs)
+    rows = check_stage_matrix(stage_matrix(inputs, fields, n), fields, stage)
+    out = np.empty((len(result_type._fields), n), dtype=np.float64)
+    kernel(AL_CONSTANTS, rows, out)
+    return result_type(*out)
+
+
+def compute_mining_batch(inputs: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Batch compute_mining: inputs holds one array (or list) per field, scalars broadcast, or
+    is a structured array such as MINING_INPUT_DTYPE. Every output field is an array.
+    Raises ValueError if any input is non-numeric, NaN, infinite or negative.
+    """
+    return _mining_dict(_stage_batch(_mining_batch, MiningResult, inputs, _MINING_FIELDS,
+                                     "mining"))
+
+
+def compute_extraction_batch(inputs: Dict[str, Any]) -> Dict[str, Any]:
+    """Batch compute_extraction, same conventions as compute_mining_batch."""
+    return _extraction_dict(_stage_batch(_extraction_batch, ExtractionResult, inputs,
+                                         _EXTRACTION_FIELDS, "extraction"))
+
+
+def compute_manufacturing_batch(inputs: Dict[str, Any]) -> Dict[str, Any]:
+    """Batch compute_manufacturing, same conventions as compute_mining_batch."""
+    inputs = field_alias(inputs, "metal_input_kg", "metal_input")
+    r = _stage_batch(_manufacturing_batch, ManufacturingResult, inputs,
+                     _MANUFACTURING_FIELDS, "manufacturing")
+    # scrap_kg is only reported, never fed to the core
+    n = len(r.energy_MJ)
+    scrap_kg = batch_field(inputs, "scrap_kg", 0.0, n) if isinstance(inputs, dict) \
+        else np.zeros(n)
+    return _manufacturing_dict(r, scrap_kg)
+
+
+# -----------------------
+# Parallel combined batch: per-scenario totals for Monte Carlo / sensitivity sweeps
+# -----------------------
+BATCH_COLUMNS = (
+    "gwp_kgCO2e", "energy_MJ", "water_m3",
+    "mining_gwp_kgCO2e", "extraction_gwp_kgCO2e", "manufacturing_gwp_kgCO2e",
+)
+
+
+@njit(parallel=True, nogil=True, cache=True)
+def _run_batch(C, mining, extraction, manufacturing, out):
+    """Fill out[:, i] (rows as BATCH_COLUMNS) for every scenario i, in parallel."""
+    for i in prange(out.shape[1]):
+        m = mining[i]
+        e = extraction[i]
+        f = manufacturing[i]
+        mining_res = _mining_core(C, m[0], m[1], m[2], m[3], m[4], m[5], m[6],
+                                  m[7], m[8], m[9], m[10], m[11], m[12])
+        extraction_res = _extraction_core(C, e[0], e[1], e[2], e[3], e[4], e[5], e[6],
+                                          e[7], e[8], e[9], e[10], e[11], e[12], e[13], e[14])
+        manufacturing_res = _manufacturing_core(C, f[0], f[1], f[2], f[3], f[4], f[5],
+                                                f[6], f[7], f[8], f[9], f[10], f[11])
+        out[0, i] = mining_res.gwp_kgCO2e + extraction_res.gwp_kgCO2e + \
+            manufacturing_res.gwp_kgCO2e
+        out[1, i] = mining_res.energy_MJ + extraction_res.energy_MJ + \
+            manufacturing_res.energy_MJ
+        out[2, i] = mining_res.water_m3 + manufacturing_res.water_m3
+        out[3, i] = mining_res.gwp_kgCO2e
+        out[4, i] = extraction_res.gwp_kgCO2e
+        out[5, i] = manufacturing_res.gwp_kgCO2e
+
+
+MINING_INPUT_DTYPE = input_dtype(_MINING_FIELDS)
+EXTRACTION_INPUT_DTYPE = input_dtype(_EXTRACTION_FIELDS)
+MANUFACTURING_INPUT_DTYPE = input_dtype(_MANUFACTURING_FIELDS)
+
+
+def compute_combined_lca_batch(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Batch version of compute_combined_lca.
+    payload["inputs"] has the usual mining / extraction / manufacturing sections, but each
+    field is an array (or list) with one value per scenario; scalars broadcast. A section
+    may also be a structured array such as MINING_INPUT_DTYPE.
+    Returns {"n_scenarios": n, "results": {column: array}} with BATCH_COLUMNS plus
+    avoided_primary_co2e_kg. A stage left out contributes zero, as in the scalar path.
+    Raises ValueError if a section is not an object or any input is non-numeric,
+    NaN, infinite or negative.
+    """
+    inputs = batch_inputs(payload)
+    mining_inputs = stage_section(inputs, "mining")
+    extraction_inputs = stage_section(inputs, "extraction")
+    manufacturing_inputs = field_alias(
+        stage_section(inputs, "manufacturing"), "metal_input_kg", "metal_input")
+
+    n = max(batch_size(mining_inputs), batch_size(extraction_inputs),
+            batch_size(manufacturing_inputs))
+    # one contiguous row per output column
+    out = np.empty((len(BATCH_COLUMNS), n), dtype=np.float64)
+    _run_batch(AL_CONSTANTS,
+               check_stage_matrix(stage_matrix(mining_inputs, _MINING_FIELDS, n),
+                                  _MINING_FIELDS, "mining"),
+               check_stage_matrix(stage_matrix(extraction_inputs, _EXTRACTION_FIELDS, n),
+                                  _EXTRACTION_FIELDS, "extraction"),
+               check_stage_matrix(stage_matrix(manufacturing_inputs, _MANUFACTURING_FIELDS, n),
+                                  _MANUFACTURING_FIELDS, "manufacturing"),
+               out)
+
+    results = {name: out[j] for j, name in enumerate(BATCH_COLUMNS)}
+    recycling_rate = batch_field(payload, "recycling_rate", 0.0, n)
+    primary_route_gwp = batch_field(
+        payload, "primary_route_gwp_kgCO2e", 0.0, n) if "primary_route_gwp_kgCO2e" in payload \
+        else results["gwp_kgCO2e"]
+    results["avoided_primary_co2e_kg"] = recycling_rate * primary_route_gwp
+    return {"n_scenarios": n, "results": results}
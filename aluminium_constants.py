@@ -1,5 +1,6 @@
 # aluminium_constants.py
 # Default conversion factors and emission factors. Tweak to match your dataset.
+from typing import NamedTuple
 
 # energy conversions
 KWH_TO_MJ = 3.6
@@ -35,4 +36,49 @@ CF_GWP_CO2E = {
 # scarcity / water factors
 WATER_SCARCITY_FACTOR = 1.0
 
+
+
+class AlConstants(NamedTuple):
+    """The scalar factors above bundled into one immutable record.
+
+    The Numba cores take this as an argument rather than reading module
+    globals, so a changed factor here is never hidden by a stale JIT cache.
+    """
+    KWH_TO_MJ: float
+    L_DIESEL_MJ: float
+    L_HEAVYOIL_MJ: float
+    KG_COAL_MJ: float
+    GRID_CO2_KG_PER_KWH: float
+    DIESEL_CO2_KG_PER_L: float
+    HEAVYOIL_CO2_KG_PER_L: float
+    NG_CO2_KG_PER_MJ: float
+    COAL_CO2_KG_PER_KG: float
+    ANODE_CARBON_CO2_KG_PER_KG: float
+    DIESEL_CH4_KG_PER_L: float
+    DIESEL_N2O_KG_PER_L: float
+    PM_PER_DIESEL_L: float
+    NOX_PER_GAS_MJ: float
+    PM_PER_COAL_KG: float
+    WATER_SCARCITY_FACTOR: float
+
+
+AL_CONSTANTS = AlConstants(
+    KWH_TO_MJ=KWH_TO_MJ,
+    L_DIESEL_MJ=L_DIESEL_MJ,
+    L_HEAVYOIL_MJ=L_HEAVYOIL_MJ,
+    KG_COAL_MJ=KG_COAL_MJ,
+    GRID_CO2_KG_PER_KWH=GRID_CO2_KG_PER_KWH,
+    DIESEL_CO2_KG_PER_L=DIESEL_CO2_KG_PER_L,
+    HEAVYOIL_CO2_KG_PER_L=HEAVYOIL_CO2_KG_PER_L,
+    NG_CO2_KG_PER_MJ=NG_CO2_KG_PER_MJ,
+    COAL_CO2_KG_PER_KG=COAL_CO2_KG_PER_KG,
+    ANODE_CARBON_CO2_KG_PER_KG=ANODE_CARBON_CO2_KG_PER_KG,
+    DIESEL_CH4_KG_PER_L=DIESEL_CH4_KG_PER_L,
+    DIESEL_N2O_KG_PER_L=DIESEL_N2O_KG_PER_L,
+    PM_PER_DIESEL_L=PM_PER_DIESEL_L,
+    NOX_PER_GAS_MJ=NOX_PER_GAS_MJ,
+    PM_PER_COAL_KG=PM_PER_COAL_KG,
+    WATER_SCARCITY_FACTOR=WATER_SCARCITY_FACTOR,
+)
+
 # placeholders for other LCIA categories (expand later)
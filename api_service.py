@@ -1,119 +1,160 @@
 # api_service.py
-from typing import Dict, Any, Optional
+from typing import Dict, Any
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException, Request
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel
-import traceback
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, Response
+from starlette.concurrency import run_in_threadpool
+from collections import OrderedDict
+import hashlib
+import orjson
+import os
+import sys
+import threading
 import uvicorn
 import logging
+import logging.handlers
+import queue
+
+if __name__ == "__main__":
+    # Deployment setting for the launcher below, made before any calculator imports numba:
+    # the parallel batch kernels run on the API's worker threads, and the TBB threading
+    # layer can hang interpreter shutdown after use off the main thread, so prefer OpenMP.
+    # Worker and reloader processes inherit it. Under gunicorn, export
+    # NUMBA_THREADING_LAYER_PRIORITY="omp tbb workqueue" in the service environment instead.
+    os.environ.setdefault("NUMBA_THREADING_LAYER_PRIORITY", "omp tbb workqueue")
 
 logger = logging.getLogger("metal-lca-engine")
-logging.basicConfig(level=logging.INFO,
-                    format="%(levelname)s:%(name)s:%(message)s")
+
+
+class _RecordQueueHandler(logging.handlers.QueueHandler):
+    """Enqueue records unformatted: the queue is in-process, so exc_info can ride along."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def _start_log_listener() -> logging.handlers.QueueListener:
+    """
+    Route log records through a queue to a listener thread that formats them and does the
+    stderr writes, so an error storm (each with a traceback) doesn't block request
+    handling on formatting or console I/O.
+    """
+    log_queue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter("%(levelname)s:%(name)s:%(message)s"))
+    logging.basicConfig(level=logging.INFO, handlers=[_RecordQueueHandler(log_queue)])
+    listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    listener.start()
+    return listener
+
+
+def _stop_log_listener(listener: logging.handlers.QueueListener) -> None:
+    """Flush the queue and take the queue handler back off the root logger."""
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        if isinstance(handler, _RecordQueueHandler) and handler.queue is listener.queue:
+            root.removeHandler(handler)
+    listener.stop()
 
 # Try to import calculators. If a module is missing, we set the reference to None and report at runtime.
 try:
     from aluminium_calculators import compute_combined_lca as compute_combined_lca_aluminium
+    from aluminium_calculators import compute_combined_lca_batch as compute_combined_lca_batch_aluminium
+    from aluminium_calculators import warm_up as warm_up_aluminium
 except Exception as e:
     compute_combined_lca_aluminium = None
+    compute_combined_lca_batch_aluminium = None
+    warm_up_aluminium = None
     logger.warning(
         "aluminium_calculators.compute_combined_lca not available: %s", e)
 
 try:
     # your copper calculator function name (you used compute_combined_lca_copper earlier)
     from copper_calculators import compute_combined_lca_copper
+    from copper_calculators import compute_combined_lca_copper_batch
+    from copper_calculators import warm_up as warm_up_copper
 except Exception as e:
     compute_combined_lca_copper = None
+    compute_combined_lca_copper_batch = None
+    warm_up_copper = None
     logger.warning(
         "copper_calculators.compute_combined_lca_copper not available: %s", e)
 
 try:
     from steel_calculators import compute_combined_lca_steel
+    from steel_calculators import compute_combined_lca_steel_batch
+    from steel_calculators import warm_up as warm_up_steel
 except Exception as e:
     compute_combined_lca_steel = None
+    compute_combined_lca_steel_batch = None
+    warm_up_steel = None
     logger.warning(
         "steel_calculators.compute_combined_lca_steel not available: %s", e)
 
 try:
     from tin_calculators import compute_combined_lca_tin
+    from tin_calculators import compute_combined_lca_tin_batch
+    from tin_calculators import warm_up as warm_up_tin
 except Exception as e:
     compute_combined_lca_tin = None
+    compute_combined_lca_tin_batch = None
+    warm_up_tin = None
     logger.warning(
         "tin_calculators.compute_combined_lca_tin not available: %s", e)
 
 try:
     from lithium_calculators import compute_combined_lca_lithium
+    from lithium_calculators import warm_up as warm_up_lithium
 except Exception as e:
     compute_combined_lca_lithium = None
+    warm_up_lithium = None
     logger.warning(
         "lithium_calculators.compute_combined_lca_lithium not available: %s", e)
 
 
-app = FastAPI(title="Metal LCA Engine", version="0.2.0")
+# /metal/run dispatch map (a calculator is None if its module failed to import)
+METAL_DISPATCH = {
+    "aluminium": compute_combined_lca_aluminium,
+    "aluminum": compute_combined_lca_aluminium,  # US spelling
+    "copper": compute_combined_lca_copper,
+    "steel": compute_combined_lca_steel,
+    "tin": compute_combined_lca_tin,
+    "lithium": compute_combined_lca_lithium,
+}
 
+_SUPPORTED_METALS_HINT = f"Supported metals: {list(METAL_DISPATCH)}"
 
-# -----------------------
-# Pydantic models (kept simple/optional to accept partial stage payloads)
-# -----------------------
-class MiningInputs(BaseModel):
-    ore_input_kg: Optional[float] = None
-    ore_grade_percent: Optional[float] = None
-    process_recovery: Optional[float] = None
-    electricity_kWh: Optional[float] = None
-    fuel_diesel_L: Optional[float] = None
-    fuel_heavyOil_L: Optional[float] = None
-    fuel_naturalGas_MJ: Optional[float] = None
-    freshwater_m3: Optional[float] = None
-    process_water_m3: Optional[float] = None
-    water_returned_m3: Optional[float] = None
-    auxiliary_materials_kg: Optional[float] = None
-    co_product_outputs_total_kg: Optional[float] = None
-
-
-class ExtractionInputs(BaseModel):
-    ore_input_kg: Optional[float] = None
-    fraction_alumina: Optional[float] = None
-    fraction_metal: Optional[float] = None
-    reduction_efficiency: Optional[float] = None
-    electricity_kWh: Optional[float] = None
-    fuel_coal_kg: Optional[float] = None
-    fuel_naturalGas_MJ: Optional[float] = None
-    anode_carbon_kg: Optional[float] = None
-    anode_effect_minutes: Optional[float] = None
-    CF4_factor: Optional[float] = None
-    C2F6_factor: Optional[float] = None
-    impurity_fraction: Optional[float] = None
-    anode_residue_kg: Optional[float] = None
-
-
-class ManufacturingInputs(BaseModel):
-    metal_input_kg: Optional[float] = None
-    process_yield: Optional[float] = None
-    electricity_kWh: Optional[float] = None
-    fuel_naturalGas_MJ: Optional[float] = None
-    lubricants_kg: Optional[float] = None
-    auxiliary_materials_kg: Optional[float] = None
-    freshwater_m3: Optional[float] = None
-    process_water_m3: Optional[float] = None
-    cooling_water_returned: Optional[float] = None
-    scrap_kg: Optional[float] = None
-
-
-class StageInputs(BaseModel):
-    mining: Optional[MiningInputs] = None
-    extraction: Optional[ExtractionInputs] = None
-    manufacturing: Optional[ManufacturingInputs] = None
-
-
-class MetalRequest(BaseModel):
-    projectId: str
-    scenarioId: str
-    metal: str
-    route: Optional[str] = None
-    stage: Optional[str] = None
-    functionalUnit_kg: Optional[float] = 1.0
-    recycling_rate: Optional[float] = 0.0
-    inputs: Optional[StageInputs] = None
+
+class ORJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson (C serializer; NumPy arrays serialize natively)."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    log_listener = _start_log_listener()
+    try:
+        # compile (or load from the Numba cache) the calculator cores before serving traffic
+        for warm_up in (warm_up_aluminium, warm_up_copper, warm_up_steel, warm_up_tin,
+                        warm_up_lithium):
+            if warm_up is not None:
+                warm_up()
+        yield
+    finally:
+        _stop_log_listener(log_listener)
+
+
+APP_TITLE = "Metal LCA Engine"
+APP_VERSION = "0.2.0"
+
+app = FastAPI(title=APP_TITLE, version=APP_VERSION, lifespan=lifespan,
+              default_response_class=ORJSONResponse)
+# batch and multi-stage results are float-heavy JSON that compresses well; the
+# size floor keeps small responses (health check, errors) uncompressed
+app.add_middleware(GZipMiddleware, minimum_size=1024)
 
 
 # -----------------------
@@ -124,8 +165,8 @@ async def _read_json_request(request: Request) -> Dict[str, Any]:
     Safely read JSON body from request; returns dict or raises HTTPException upon failure.
     """
     try:
-        payload: Dict[str, Any] = await request.json()
-    except Exception as e:
+        payload: Dict[str, Any] = orjson.loads(await request.body())
+    except orjson.JSONDecodeError as e:
         raise HTTPException(status_code=400, detail=f"Invalid JSON body: {e}")
     if not isinstance(payload, dict):
         raise HTTPException(
@@ -133,135 +174,257 @@ async def _read_json_request(request: Request) -> Dict[str, Any]:
     return payload
 
 
+def _canonical_json(payload: Dict[str, Any]) -> bytes:
+    """Key-order independent JSON bytes of a payload, hashed for the cache key."""
+    return orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)
+
+
+# -----------------------
+# Response cache: serialized results of the (deterministic) calculators, so repeated
+# scenarios (UI re-renders, dashboards polling) skip both the calculation and the JSON encode
+# -----------------------
+# modules whose factors and formulas a cached response depends on
+_CACHE_SOURCE_MODULES = ("aluminium_constants", "aluminium_calculators", "copper_calculators",
+                         "steel_calculators", "tin_calculators", "lithium_calculators")
+_LCA_CACHE_MAX_ENTRIES = 4096
+# larger payloads are computed every time instead of being kept in memory
+_LCA_CACHE_MAX_PAYLOAD_BYTES = 64 * 1024
+
+_lca_cache: "OrderedDict[tuple, bytes]" = OrderedDict()
+_lca_cache_lock = threading.Lock()
+_constants_version = ""
+_constants_record = None  # the AL_CONSTANTS object _constants_version was computed with
+
+
+def _compute_constants_version() -> str:
+    """Digest of the calculator and constants sources currently loaded."""
+    h = hashlib.blake2b(digest_size=16)
+    for name in _CACHE_SOURCE_MODULES:
+        path = getattr(sys.modules.get(name), "__file__", None)
+        if not path:
+            continue
+        try:
+            with open(path, "rb") as f:
+                h.update(f.read())
+        except OSError:
+            h.update(name.encode())
+    return h.hexdigest()
+
+
+def clear_lca_cache() -> None:
+    """Drop every cached response and recompute the constants version."""
+    global _constants_version, _constants_record
+    with _lca_cache_lock:
+        _lca_cache.clear()
+        _constants_version = _compute_constants_version()
+        _constants_record = getattr(
+            sys.modules.get("aluminium_constants"), "AL_CONSTANTS", None)
+
+
+def _current_constants_version() -> str:
+    # importlib.reload(aluminium_constants) rebinds AL_CONSTANTS: start a fresh cache
+    if getattr(sys.modules.get("aluminium_constants"), "AL_CONSTANTS", None) \
+            is not _constants_record:
+        clear_lca_cache()
+    return _constants_version
+
+
+def _lca_body(calc_fn, payload: Dict[str, Any]) -> bytes:
+    """
+    Serialized JSON result of calc_fn(payload), from the cache when the same payload was
+    run before. Entries are keyed on the calculator, the constants version and a blake2b
+    digest of the canonical payload, so the payload itself is never kept.
+    """
+    canonical = _canonical_json(payload)
+    if len(canonical) > _LCA_CACHE_MAX_PAYLOAD_BYTES:
+        return ORJSONResponse(content=calc_fn(payload)).body
+    key = (calc_fn, _current_constants_version(),
+           hashlib.blake2b(canonical, digest_size=16).digest())
+    with _lca_cache_lock:
+        body = _lca_cache.get(key)
+        if body is not None:
+            _lca_cache.move_to_end(key)
+            return body
+    body = ORJSONResponse(content=calc_fn(payload)).body
+    with _lca_cache_lock:
+        _lca_cache[key] = body
+        if len(_lca_cache) > _LCA_CACHE_MAX_ENTRIES:
+            _lca_cache.popitem(last=False)
+    return body
+
+
+clear_lca_cache()
+
+
 def _ensure_calc_available(calc_fn, metal_name: str):
     if calc_fn is None:
         raise HTTPException(
             status_code=500, detail=f"Calculator for '{metal_name}' not available on server. Please deploy {metal_name}_calculators.py.")
 
 
+async def _run_batch_endpoint(request: Request, batch_fn, metal_name: str) -> ORJSONResponse:
+    """Shared body of the /<metal>/run_batch endpoints."""
+    payload = await _read_json_request(request)
+    _ensure_calc_available(batch_fn, metal_name)
+    try:
+        # large batches run for a while: keep the event loop free while the kernel runs
+        result = await run_in_threadpool(batch_fn, payload)
+    except ValueError as e:
+        # mismatched column lengths, non-numeric, NaN or negative values
+        raise HTTPException(
+            status_code=400, detail=f"Invalid batch inputs: {e}")
+    except Exception as e:
+        logger.exception("%s batch LCA failed", metal_name)
+        raise HTTPException(
+            status_code=500, detail=f"Server error running {metal_name} batch LCA: {e}")
+    logger.info("Run %s batch LCA (%d scenarios, project=%s)",
+                metal_name, result["n_scenarios"], payload.get("projectId"))
+    return ORJSONResponse(status_code=200, content=result)
+
+
 # -----------------------
 # Endpoints
 # -----------------------
+# the health payload never changes: serialize it once
+_ROOT_BODY = orjson.dumps(
+    {"message": f"{APP_TITLE} running", "version": APP_VERSION})
+
+
 @app.get("/")
-async def root():
-    return {"message": "Metal LCA Engine running", "version": app.version}
+async def root() -> Response:
+    return Response(content=_ROOT_BODY, media_type="application/json")
 
 
 # aluminium endpoint (unchanged)
 @app.post("/aluminium/run")
-async def run_aluminium(request: Request) -> JSONResponse:
+async def run_aluminium(request: Request) -> Response:
     payload = await _read_json_request(request)
     _ensure_calc_available(compute_combined_lca_aluminium, "aluminium")
     try:
-        result = compute_combined_lca_aluminium(payload)
+        body = _lca_body(compute_combined_lca_aluminium, payload)
         logger.info("Run aluminium LCA (route=%s project=%s)",
                     payload.get("route"), payload.get("projectId"))
-        return JSONResponse(status_code=200, content=result)
+        return Response(status_code=200, content=body, media_type="application/json")
     except Exception as e:
-        traceback.print_exc()
+        logger.exception("aluminium LCA failed")
         raise HTTPException(
             status_code=500, detail=f"Server error running aluminium LCA: {e}")
 
 
+# batch endpoints: every input field is a list with one value per scenario
+@app.post("/aluminium/run_batch")
+async def run_aluminium_batch(request: Request) -> ORJSONResponse:
+    return await _run_batch_endpoint(request, compute_combined_lca_batch_aluminium, "aluminium")
+
+
 # copper endpoint (unchanged)
 @app.post("/copper/run")
-async def run_copper(request: Request) -> JSONResponse:
+async def run_copper(request: Request) -> Response:
     payload = await _read_json_request(request)
     _ensure_calc_available(compute_combined_lca_copper, "copper")
     try:
-        result = compute_combined_lca_copper(payload)
+        body = _lca_body(compute_combined_lca_copper, payload)
         logger.info("Run copper LCA (route=%s project=%s)",
                     payload.get("route"), payload.get("projectId"))
-        return JSONResponse(status_code=200, content=result)
+        return Response(status_code=200, content=body, media_type="application/json")
     except Exception as e:
-        traceback.print_exc()
+        logger.exception("copper LCA failed")
         raise HTTPException(
             status_code=500, detail=f"Server error running copper LCA: {e}")
 
 
+@app.post("/copper/run_batch")
+async def run_copper_batch(request: Request) -> ORJSONResponse:
+    return await _run_batch_endpoint(request, compute_combined_lca_copper_batch, "copper")
+
+
 # steel endpoint (new)
 @app.post("/steel/run")
-async def run_steel(request: Request) -> JSONResponse:
+async def run_steel(request: Request) -> Response:
     payload = await _read_json_request(request)
     _ensure_calc_available(compute_combined_lca_steel, "steel")
     try:
-        result = compute_combined_lca_steel(payload)
+        body = _lca_body(compute_combined_lca_steel, payload)
         logger.info("Run steel LCA (route=%s project=%s)",
                     payload.get("route"), payload.get("projectId"))
-        return JSONResponse(status_code=200, content=result)
+        return Response(status_code=200, content=body, media_type="application/json")
     except Exception as e:
-        traceback.print_exc()
+        logger.exception("steel LCA failed")
         raise HTTPException(
             status_code=500, detail=f"Server error running steel LCA: {e}")
 
 
+@app.post("/steel/run_batch")
+async def run_steel_batch(request: Request) -> ORJSONResponse:
+    return await _run_batch_endpoint(request, compute_combined_lca_steel_batch, "steel")
+
+
 # tin endpoint (new)
 @app.post("/tin/run")
-async def run_tin(request: Request) -> JSONResponse:
+async def run_tin(request: Request) -> Response:
     payload = await _read_json_request(request)
     _ensure_calc_available(compute_combined_lca_tin, "tin")
     try:
-        result = compute_combined_lca_tin(payload)
+        body = _lca_body(compute_combined_lca_tin, payload)
         logger.info("Run tin LCA (route=%s project=%s)",
                     payload.get("route"), payload.get("projectId"))
-        return JSONResponse(status_code=200, content=result)
+        return Response(status_code=200, content=body, media_type="application/json")
     except Exception as e:
-        traceback.print_exc()
+        logger.exception("tin LCA failed")
         raise HTTPException(
             status_code=500, detail=f"Server error running tin LCA: {e}")
 
 
+@app.post("/tin/run_batch")
+async def run_tin_batch(request: Request) -> ORJSONResponse:
+    return await _run_batch_endpoint(request, compute_combined_lca_tin_batch, "tin")
+
+
 # lithium endpoint (new)
 @app.post("/lithium/run")
-async def run_lithium(request: Request) -> JSONResponse:
+async def run_lithium(request: Request) -> Response:
     payload = await _read_json_request(request)
     _ensure_calc_available(compute_combined_lca_lithium, "lithium")
     try:
-        result = compute_combined_lca_lithium(payload)
+        body = _lca_body(compute_combined_lca_lithium, payload)
         logger.info("Run lithium LCA (route=%s project=%s)",
                     payload.get("route"), payload.get("projectId"))
-        return JSONResponse(status_code=200, content=result)
+        return Response(status_code=200, content=body, media_type="application/json")
     except Exception as e:
-        traceback.print_exc()
+        logger.exception("lithium LCA failed")
         raise HTTPException(
             status_code=500, detail=f"Server error running lithium LCA: {e}")
 
 
 # Generic dispatch endpoint: frontend can POST to /metal/run with "metal" set
 @app.post("/metal/run")
-async def run_metal(request: Request) -> JSONResponse:
+async def run_metal(request: Request) -> Response:
     payload = await _read_json_request(request)
-    metal = (payload.get("metal") or "").strip().lower()
+    metal = payload.get("metal") or ""
+    # canonical spellings hit the dict directly; only normalize on a miss
+    if metal not in METAL_DISPATCH:
+        metal = metal.strip().lower()
     if not metal:
         raise HTTPException(
             status_code=400, detail="Missing 'metal' field in payload")
 
-    # dispatch map
-    dispatch_map = {
-        "aluminium": compute_combined_lca_aluminium,
-        "aluminum": compute_combined_lca_aluminium,  # US spelling
-        "copper": compute_combined_lca_copper,
-        "steel": compute_combined_lca_steel,
-        "tin": compute_combined_lca_tin,
-        "lithium": compute_combined_lca_lithium,
-    }
-
-    calc_fn = dispatch_map.get(metal)
+    calc_fn = METAL_DISPATCH.get(metal)
     if calc_fn is None:
         # If calc function exists but is None because module import failed, give helpful message
-        if metal in dispatch_map:
+        if metal in METAL_DISPATCH:
             raise HTTPException(
                 status_code=500, detail=f"Calculator for '{metal}' not available on server. Please ensure module is deployed.")
         raise HTTPException(
-            status_code=400, detail=f"Unsupported metal '{metal}'. Supported metals: {list(dispatch_map.keys())}")
+            status_code=400, detail=f"Unsupported metal '{metal}'. {_SUPPORTED_METALS_HINT}")
 
     try:
-        result = calc_fn(payload)
+        # keyed on calc_fn, so identical payloads share entries with /<metal>/run
+        body = _lca_body(calc_fn, payload)
         logger.info("Dispatching LCA for metal=%s route=%s project=%s",
                     metal, payload.get("route"), payload.get("projectId"))
-        return JSONResponse(status_code=200, content=result)
+        return Response(status_code=200, content=body, media_type="application/json")
     except Exception as e:
-        traceback.print_exc()
+        logger.exception("%s LCA failed", metal)
         raise HTTPException(
             status_code=500, detail=f"Server error running {metal} LCA: {e}")
 
@@ -279,14 +442,25 @@ async def run_metal(request: Request) -> JSONResponse:
 #         mining_inputs = payload.get("inputs", {}).get("mining", {})
 #         from aluminium_calculators import compute_mining
 #         res = compute_mining(mining_inputs)
-#         return JSONResponse(status_code=200, content={"stage": "mining", "result": res})
+#         return ORJSONResponse(status_code=200, content={"stage": "mining", "result": res})
 #     except Exception:
-#         traceback.print_exc()
+#         logger.exception("aluminium mining stage failed")
 #         raise HTTPException(status_code=500, detail="Error running mining stage")
 #
 # -----------------------
 # Run server for local debug (if you run python api_service.py)
 # -----------------------
 if __name__ == "__main__":
-    # default bind for development; when you deploy with uvicorn entrypoint, use that command.
-    uvicorn.run("api_service:app", host="0.0.0.0", port=8000, reload=True)
+    if os.getenv("PROD"):
+        # production: one worker process per core, no file watcher. Behind gunicorn the
+        # equivalent is (with the threading-layer variable set above exported):
+        # gunicorn -k uvicorn.workers.UvicornWorker -w <cores> api_service:app
+        uvicorn.run("api_service:app", host="0.0.0.0", port=8000,
+                    workers=os.cpu_count() or 1, loop="auto", http="auto",
+                    reload=False)
+    else:
+        # default bind for development; when you deploy with uvicorn entrypoint, use that command.
+        # "auto" picks uvloop / httptools when installed (not on Windows for uvloop)
+        # and falls back to asyncio / h11 otherwise.
+        uvicorn.run("api_service:app", host="0.0.0.0", port=8000,
+                    loop="auto", http="auto", reload=True)
@@ -0,0 +1,97 @@
+# batch_utils.py
+# Packing helpers shared by the batch calculators: a batch payload has the usual
+# mining / extraction / manufacturing sections, with one value per scenario in
+# each field (scalars broadcast), or a structured array per section.
+from typing import Dict, Any
+import numpy as np
+
+
+def batch_size(inputs: Dict[str, Any]) -> int:
+    """Length of the longest array-valued field (scalars broadcast)."""
+    if isinstance(inputs, np.ndarray):
+        return inputs.size
+    n = 1
+    for v in inputs.values():
+        size = np.size(v)
+        if size > n:
+            n = size
+    return n
+
+
+def batch_field(inputs: Dict[str, Any], key: str, default: float, n: int) -> np.ndarray:
+    """Fetch one input column as a float64 array of length n; finite and non-negative."""
+    try:
+        column = np.broadcast_to(np.asarray(inputs.get(key, default), dtype=np.float64), (n,))
+    except (TypeError, ValueError):
+        raise ValueError(f"{key} must be a number or a list of {n} numbers")
+    bad = ~(column >= 0.0) | np.isinf(column)  # NaN compares False; null arrives as NaN
+    if bad.any():
+        row = np.flatnonzero(bad)[0]
+        raise ValueError(
+            f"{key} must be finite and non-negative (scenario {row}: {column[row]})")
+    return column
+
+
+def input_dtype(fields) -> np.dtype:
+    """One float64 field per core argument, in core order; a record is one scenario."""
+    return np.dtype([(key, np.float64) for key, _ in fields])
+
+
+def stage_records(inputs, fields, n: int) -> np.ndarray:
+    """
+    Pack one stage's inputs into a structured array of n scenarios.
+    inputs is a dict of scalars / arrays or a structured array; missing fields get their defaults.
+    """
+    if isinstance(inputs, np.ndarray):
+        names = inputs.dtype.names or ()
+    else:
+        names = inputs
+    rec = np.empty(n, dtype=input_dtype(fields))
+    for key, default in fields:
+        try:
+            rec[key] = inputs[key] if key in names else default
+        except (TypeError, ValueError):
+            raise ValueError(f"{key} must be a number or a list of {n} numbers")
+    return rec
+
+
+def batch_inputs(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """The "inputs" object of a batch payload, {} if absent."""
+    inputs = payload.get("inputs") or {}
+    if not isinstance(inputs, dict):
+        raise ValueError("inputs must be an object of stage sections")
+    return inputs
+
+
+def stage_section(inputs: Dict[str, Any], name: str):
+    """One stage section of a batch payload: a dict or a structured array, {} if absent."""
+    section = inputs.get(name)
+    if section is None:
+        return {}
+    if not isinstance(section, (dict, np.ndarray)):
+        raise ValueError(f"{name} must be an object of input columns")
+    return section
+
+
+def stage_matrix(inputs, fields, n: int) -> np.ndarray:
+    """(n, len(fields)) float64 view of the stage records, as the kernels expect."""
+    return stage_records(inputs, fields, n).view(np.float64).reshape(n, len(fields))
+
+
+def check_stage_matrix(matrix: np.ndarray, fields, stage: str) -> np.ndarray:
+    """Reject NaN / inf / negative inputs up front; one bad scenario spoils the whole batch."""
+    bad = ~(matrix >= 0.0)  # NaN compares False
+    bad |= np.isinf(matrix)
+    if bad.any():
+        row, col = np.argwhere(bad)[0]
+        raise ValueError(
+            f"{stage}.{fields[col][0]} must be finite and non-negative "
+            f"(scenario {row}: {matrix[row, col]})")
+    return matrix
+
+
+def field_alias(section, key: str, alias: str):
+    """A dict section that gives `key` only under `alias` (the scalar path's fallback name)."""
+    if isinstance(section, dict) and key not in section and alias in section:
+        return dict(section, **{key: section[alias]})
+    return section
@@ -1,3 +1,4 @@
+import functools
 import brightway2 as bw
 import pandas as pd
 
@@ -5,6 +6,19 @@ import pandas as pd
 PROJECT_NAME = "metal_lca"
 bw.projects.set_current(PROJECT_NAME)
 
+# biosphere3 "Carbon dioxide, fossil" (air, unspecified)
+CO2_FOSSIL_KEY = ("biosphere3", "349b29d1-3e58-4c66-98b9-9d1a076efd2e")
+
+
+@functools.lru_cache(maxsize=None)
+def _co2_flow_key():
+    """Key of the fossil CO2 flow: direct lookup, full-text search only as a fallback."""
+    try:
+        return bw.get_activity(CO2_FOSSIL_KEY).key
+    except Exception:
+        bio = bw.Database("biosphere3")
+        return bio.search("carbon dioxide, fossil")[0].key
+
 
 def build_single_metal_db(df_subset: pd.DataFrame, metal: str, route: str):
     """
@@ -22,16 +36,16 @@ def build_single_metal_db(df_subset: pd.DataFrame, metal: str, route: str):
     db = bw.Database(db_name)
 
     # get CO2 biosphere flow
-    bio = bw.Database("biosphere3")
-    co2_flow = bio.search("carbon dioxide, fossil")[0]
+    co2_flow_key = _co2_flow_key()
 
     data = {}
 
     # ---- stage activities ----
-    for _, row in df_subset.iterrows():
-        stage = str(row["stage"])
+    # read the two columns once instead of boxing a Series per row
+    stages = df_subset["stage"].astype(str).tolist()
+    co2_values = df_subset["CO2_per_kg"].astype(float).tolist()
+    for stage, co2 in zip(stages, co2_values):
         code = f"{metal}_{stage}"
-        co2 = float(row["CO2_per_kg"])
 
         data[(db_name, code)] = {
             "name": f"{metal} {stage}",
@@ -48,7 +62,7 @@ def build_single_metal_db(df_subset: pd.DataFrame, metal: str, route: str):
                 },
                 # CO2 emission
                 {
-                    "input": co2_flow.key,
+                    "input": co2_flow_key,
                     "amount": co2,
                     "unit": "kilogram",
                     "type": "biosphere",
@@ -69,7 +83,8 @@ def build_single_metal_db(df_subset: pd.DataFrame, metal: str, route: str):
         }
     ]
 
-    for stage_name in df_subset["stage"].unique():
+    # distinct stages in first-seen order, from the column already read above
+    for stage_name in dict.fromkeys(stages):
         exchanges.append(
             {
                 "input": (db_name, f"{metal}_{stage_name}"),
@@ -1,5 +1,9 @@
 # copper_calculators.py
-from typing import Dict, Any
+from typing import Dict, Any, NamedTuple
+import numpy as np
+from jit_utils import njit, prange, eager_signature
+from batch_utils import (batch_inputs, batch_size, batch_field, input_dtype,
+                         stage_section, stage_matrix, check_stage_matrix, field_alias)
 
 # ---- Default constants (you can override per-request in payload) ----
 KWH_TO_MJ = 3.6
@@ -11,6 +15,24 @@ KG_COAL_MJ = 26.0
 # Emission factors (defaults)
 GRID_CO2_KG_PER_KWH_GLOBAL = 0.48
 GRID_CO2_KG_PER_KWH_INDIA = 0.82
+# grid factors by ISO 3166 alpha-2 code, used when a stage gives no grid_co2_factor
+GRID_CO2_KG_PER_KWH_BY_ISO = {
+    "IN": GRID_CO2_KG_PER_KWH_INDIA,
+    "FR": 0.068,
+    "CA": 0.120,
+    "PY": 0.024,
+    "ZM": 0.121,
+}
+
+
+def _grid_co2_for_iso(code):
+    """
+    Grid factor for a country_iso value: codes are matched case-insensitively, unknown
+    codes get GRID_CO2_KG_PER_KWH_GLOBAL. None if code is not a string.
+    """
+    if not isinstance(code, str):
+        return None
+    return GRID_CO2_KG_PER_KWH_BY_ISO.get(code.strip().upper(), GRID_CO2_KG_PER_KWH_GLOBAL)
 DIESEL_CO2_KG_PER_L = 2.68
 HEAVYOIL_CO2_KG_PER_L = 3.11
 NG_CO2_KG_PER_MJ = 0.0561
@@ -23,278 +45,366 @@ PM_COAL_KG_PER_KG = 0.001
 PM_PER_DIESEL_L = 0.0005
 WATER_SCARCITY_FACTOR = 1.0
 
-# Helper: sum energy fields (returns MJ)
-
-
-def _sum_energy_mj_from_inputs(inputs: Dict[str, Any]) -> float:
-    total = 0.0
-    if not inputs:
-        return 0.0
-    if "electricity_kWh" in inputs and inputs.get("electricity_kWh") is not None:
-        total += float(inputs.get("electricity_kWh", 0.0)) * KWH_TO_MJ
-    if "fuel_diesel_L" in inputs and inputs.get("fuel_diesel_L") is not None:
-        total += float(inputs.get("fuel_diesel_L", 0.0)) * L_DIESEL_MJ
-    if "fuel_heavyOil_L" in inputs and inputs.get("fuel_heavyOil_L") is not None:
-        total += float(inputs.get("fuel_heavyOil_L", 0.0)) * L_HEAVYOIL_MJ
-    if "fuel_coal_kg" in inputs and inputs.get("fuel_coal_kg") is not None:
-        # copper spec used 29.3 MJ/kg for coal; choose constant if provided in inputs use that
-        coal_mj = float(inputs.get("fuel_coal_kg", 0.0)) * KG_COAL_MJ
-        total += coal_mj
-    if "fuel_naturalGas_MJ" in inputs and inputs.get("fuel_naturalGas_MJ") is not None:
-        total += float(inputs.get("fuel_naturalGas_MJ", 0.0))
-    return total
+# example argument used to build the eager-compilation signatures below
+_F = 0.0
+
 
 # -----------------------
-# Copper: Mining stage
+# Input helpers
 # -----------------------
 
 
-def compute_copper_mining(inputs: Dict[str, Any]) -> Dict[str, Any]:
-    # inputs expected: ore_input_kg, ore_grade_percent, process_recovery, electricity_kWh,
-    # fuel_diesel_L, fuel_naturalGas_MJ, freshwater_m3, process_water_m3, land_area_m2,
-    # auxiliary_materials_kg, transport_*_tkm
-    ore_input_kg = float(inputs.get("ore_input_kg", 0.0) or 0.0)
-    ore_grade_percent = float(inputs.get("ore_grade_percent", 0.0) or 0.0)
-    # stage efficiency / yield (if provided else assume 0.9)
-    eta_stage = float(inputs.get("process_recovery", 0.9) or 0.9)
+def _fuel(inputs: Dict[str, Any], key: str) -> float:
+    """Energy carrier amount; a missing or null field counts as zero."""
+    value = inputs.get(key)
+    return 0.0 if value is None else (float(value) or 0.0)
+
+
+# Flat per-stage results returned by the numeric cores; the public calculators
+# turn these into the nested result dicts exactly once.
+class CopperMiningResult(NamedTuple):
+    yield_metal_t: float
+    total_material_input_kg: float
+    energy_MJ: float
+    water_m3: float
+    waste_solid_kg: float
+    co2_kg: float
+    so2_kg: float
+    nox_kg: float
+    particulates_kg: float
+    ch4_kg: float
+    n2o_kg: float
+    gwp_kgCO2e: float
+    metal_ions_kg: float
+    suspended_solids_kg: float
+
+
+class CopperExtractionResult(NamedTuple):
+    yield_metal_t: float
+    total_material_input_kg: float
+    energy_MJ: float
+    waste_solid_kg: float
+    co2_kg: float
+    cf4_kg: float
+    c2f6_kg: float
+    pfc_co2e_kgCO2e: float
+    so2_kg: float
+    nox_kg: float
+    particulates_kg: float
+    gwp_kgCO2e: float
+    metal_ions_kg: float
+    chemicals_kg: float
+
+
+class CopperManufacturingResult(NamedTuple):
+    yield_metal_t: float
+    total_material_input_kg: float
+    energy_MJ: float
+    water_m3: float
+    co2_kg: float
+    nox_kg: float
+    particulates_kg: float
+    gwp_kgCO2e: float
+
+
+# -----------------------
+# Numeric cores (Numba-compiled when available). Positional floats in, result record out.
+# -----------------------
+
 
+@njit(eager_signature(1, *(_F,) * 5), cache=True)
+def _energy_mj(electricity_kWh, diesel_L, heavy_oil_L, coal_kg, ng_MJ):
+    """Total energy (MJ) of the stage's energy carriers."""
+    return electricity_kWh * KWH_TO_MJ + diesel_L * L_DIESEL_MJ + \
+        heavy_oil_L * L_HEAVYOIL_MJ + coal_kg * KG_COAL_MJ + ng_MJ
+
+
+@njit(eager_signature(CopperMiningResult, *(_F,) * 17), cache=True)
+def _mining_core(ore_input_kg, ore_grade_percent, eta_stage, aux_materials_kg,
+                 electricity_kWh, diesel_L, heavy_oil_L, coal_kg, ng_MJ,
+                 freshwater_m3, process_water_m3, water_returned_m3, grid_factor,
+                 s_content, acid_recovery_factor, metal_leaching_factor, runoff_fraction):
     # yield metal in tonnes
     mwf = ore_grade_percent / 100.0  # mass fraction of metal in ore
     yield_metal_t = (ore_input_kg * mwf * eta_stage) / 1000.0
 
-    total_material_input_kg = ore_input_kg + \
-        float(inputs.get("auxiliary_materials_kg", 0.0) or 0.0)
-
-    energy_mj = _sum_energy_mj_from_inputs(inputs)
+    total_material_input_kg = ore_input_kg + aux_materials_kg
+    energy_mj = _energy_mj(electricity_kWh, diesel_L,
+                           heavy_oil_L, coal_kg, ng_MJ)
 
-    # water
-    freshwater_m3 = float(inputs.get("freshwater_m3", 0.0) or 0.0)
-    process_water_m3 = float(inputs.get("process_water_m3", 0.0) or 0.0)
-    water_consumed_m3 = freshwater_m3 + process_water_m3 - \
-        float(inputs.get("water_returned_m3", 0.0) or 0.0)
-
-    # land occupied
-    land_occupied_m2 = float(inputs.get("land_area_m2", 0.0) or 0.0)
+    water_consumed_m3 = freshwater_m3 + process_water_m3 - water_returned_m3
 
     # waste (tailings + overburden approximation)
     waste_solid_kg = max(0.0, ore_input_kg * (1.0 - mwf) * (1.0 - eta_stage))
 
-    # Emissions: electricity + diesel + natural gas
-    grid_factor = float(inputs.get(
-        "grid_co2_factor", GRID_CO2_KG_PER_KWH_GLOBAL) or GRID_CO2_KG_PER_KWH_GLOBAL)
-    emissions_co2 = 0.0
-    if "electricity_kWh" in inputs and inputs.get("electricity_kWh") is not None:
-        emissions_co2 += float(inputs.get("electricity_kWh")) * grid_factor
-    emissions_co2 += float(inputs.get("fuel_diesel_L", 0.0)
-                           or 0.0) * DIESEL_CO2_KG_PER_L
-    emissions_co2 += float(inputs.get("fuel_heavyOil_L", 0.0)
-                           or 0.0) * HEAVYOIL_CO2_KG_PER_L
-    emissions_co2 += float(inputs.get("fuel_naturalGas_MJ",
-                           0.0) or 0.0) * NG_CO2_KG_PER_MJ
-    emissions_co2 += float(inputs.get("fuel_coal_kg", 0.0)
-                           or 0.0) * COAL_CO2_KG_PER_KG
-
-    # SO2 from sulfur in ore (if S_content provided)
-    s_content = float(inputs.get("S_content", 0.0) or 0.0)  # fraction
-    acid_recovery_factor = float(inputs.get(
-        "acid_recovery_factor", 0.85) or 0.85)
-    # kg S -> convert to SO2 kg via factor 2 (approx) per spec
+    # Emissions: electricity + diesel + heavy oil + natural gas + coal
+    emissions_co2 = electricity_kWh * grid_factor + diesel_L * DIESEL_CO2_KG_PER_L + \
+        heavy_oil_L * HEAVYOIL_CO2_KG_PER_L + ng_MJ * NG_CO2_KG_PER_MJ + \
+        coal_kg * COAL_CO2_KG_PER_KG
+
+    # SO2 from sulfur in ore: kg S -> SO2 kg via factor 2 (approx) per spec
     emissions_so2 = (s_content * ore_input_kg * 2.0) * \
         (1.0 - acid_recovery_factor)
 
     # NOx approx from fuel energy
-    total_fuel_mj = _sum_energy_mj_from_inputs(inputs)
-    emissions_nox = total_fuel_mj * NOX_PER_MJ
+    emissions_nox = energy_mj * NOX_PER_MJ
 
     # particulates
-    particulate = float(inputs.get("fuel_diesel_L", 0.0) or 0.0) * PM_PER_DIESEL_L + \
-        float(inputs.get("fuel_coal_kg", 0.0) or 0.0) * PM_COAL_KG_PER_KG
+    particulate = diesel_L * PM_PER_DIESEL_L + coal_kg * PM_COAL_KG_PER_KG
 
     # water emissions
-    emissions_water_metal_ions = ore_input_kg * \
-        float(inputs.get("metal_leaching_factor", 0.0003) or 0.0003)
-    emissions_water_ss = waste_solid_kg * \
-        float(inputs.get("runoff_fraction", 0.02) or 0.02)
-
-    # Simple GWP: CO2 + 25*CH4 + 298*N2O if those are known - here we only have CO2 from fuels
-    # But we will add tiny combustion CH4/N2O estimates:
-    emissions_ch4 = total_fuel_mj * 0.001 / 1000.0   # per spec small factor
-    emissions_n2o = total_fuel_mj * 0.0001 / 1000.0
-    gwp = emissions_co2 + emissions_ch4 * 25.0 + emissions_n2o * 298.0
+    emissions_water_metal_ions = ore_input_kg * metal_leaching_factor
+    emissions_water_ss = waste_solid_kg * runoff_fraction
 
-    return {
-        "yield_metal_t": yield_metal_t,
-        "total_material_input_kg": total_material_input_kg,
-        "energy_MJ": energy_mj,
-        "water_m3": water_consumed_m3,
-        "land_occupied_m2": land_occupied_m2,
-        "waste_solid_kg": waste_solid_kg,
-        "emissions": {
-            "co2_kg": emissions_co2,
-            "so2_kg": emissions_so2,
-            "nox_kg": emissions_nox,
-            "particulates_kg": particulate,
-            "ch4_kg": emissions_ch4,
-            "n2o_kg": emissions_n2o
-        },
-        "gwp_kgCO2e": gwp,
-        "emissions_water": {
-            "metal_ions_kg": emissions_water_metal_ions,
-            "suspended_solids_kg": emissions_water_ss
-        }
-    }
-
-# -----------------------
-# Copper: Extraction (smelting + refining)
-# -----------------------
+    # Simple GWP: CO2 + 25*CH4 + 298*N2O, with tiny combustion CH4/N2O estimates
+    emissions_ch4 = energy_mj * 0.001 / 1000.0   # per spec small factor
+    emissions_n2o = energy_mj * 0.0001 / 1000.0
+    gwp = emissions_co2 + emissions_ch4 * 25.0 + emissions_n2o * 298.0
 
+    return CopperMiningResult(yield_metal_t, total_material_input_kg, energy_mj,
+                              water_consumed_m3, waste_solid_kg, emissions_co2, emissions_so2,
+                              emissions_nox, particulate, emissions_ch4, emissions_n2o, gwp,
+                              emissions_water_metal_ions, emissions_water_ss)
 
-def compute_copper_extraction(inputs: Dict[str, Any]) -> Dict[str, Any]:
-    # inputs expected: ore_input_kg (concentrate), fraction_alumina/fraction_cu etc.,
-    ore_input_kg = float(inputs.get("ore_input_kg", 0.0) or 0.0)
-    # fraction of metal in concentrate
-    fraction_metal = float(inputs.get("fraction_metal", 0.0) or 0.0)
-    reduction_efficiency = float(inputs.get(
-        "reduction_efficiency", 0.95) or 0.95)
 
+@njit(eager_signature(CopperExtractionResult, *(_F,) * 22), cache=True)
+def _extraction_core(ore_input_kg, fraction_metal, reduction_efficiency, aux_materials_kg,
+                     electricity_kWh, diesel_L, heavy_oil_L, coal_kg, ng_MJ,
+                     impurity_fraction, anode_residue_kg, grid_factor, process_co2,
+                     anode_effect_minutes, cf4_factor, c2f6_factor, cf4_gwp, c2f6_gwp,
+                     s_content, acid_recovery_factor, metal_leaching_factor, process_water_m3):
     # yield metal tonnes
     yield_metal_t = (ore_input_kg * fraction_metal *
                      reduction_efficiency) / 1000.0
 
-    total_material_input_kg = ore_input_kg + \
-        float(inputs.get("auxiliary_materials_kg", 0.0) or 0.0)
-
-    energy_mj = _sum_energy_mj_from_inputs(inputs)
+    total_material_input_kg = ore_input_kg + aux_materials_kg
+    energy_mj = _energy_mj(electricity_kWh, diesel_L,
+                           heavy_oil_L, coal_kg, ng_MJ)
 
     # waste
-    impurity_fraction = float(inputs.get("impurity_fraction", 0.0) or 0.0)
-    anode_residue_kg = float(inputs.get("anode_residue_kg", 0.0) or 0.0)
     waste_solid_kg = (ore_input_kg * impurity_fraction) + anode_residue_kg
 
-    # emissions from energy + process
-    grid_factor = float(inputs.get(
-        "grid_co2_factor", GRID_CO2_KG_PER_KWH_GLOBAL) or GRID_CO2_KG_PER_KWH_GLOBAL)
-    emissions_co2 = 0.0
-    if "electricity_kWh" in inputs and inputs.get("electricity_kWh") is not None:
-        emissions_co2 += float(inputs.get("electricity_kWh")) * grid_factor
-    emissions_co2 += float(inputs.get("fuel_coal_kg", 0.0)
-                           or 0.0) * COAL_CO2_KG_PER_KG
-    emissions_co2 += float(inputs.get("fuel_naturalGas_MJ",
-                           0.0) or 0.0) * NG_CO2_KG_PER_MJ
-    # process CO2 from smelting chemical reactions (approx)
-    process_co2 = float(inputs.get("CO2_proc_smelting", 400.0)
-                        or 400.0)  # per tonne Cu typical
-    # scale by metal produced (if yield_metal > 0)
-    emissions_co2 += process_co2 * (yield_metal_t or 0.0)
+    # emissions from energy + process CO2 of smelting (per tonne Cu, scaled by metal produced)
+    emissions_co2 = electricity_kWh * grid_factor + coal_kg * COAL_CO2_KG_PER_KG + \
+        ng_MJ * NG_CO2_KG_PER_MJ
+    emissions_co2 += process_co2 * yield_metal_t
 
     # PFCs: if present
-    cf4_kg = float(inputs.get("anode_effect_minutes", 0.0) or 0.0) * \
-        float(inputs.get("CF4_factor", 0.0) or 0.0)
-    c2f6_kg = float(inputs.get("anode_effect_minutes", 0.0)
-                    or 0.0) * float(inputs.get("C2F6_factor", 0.0) or 0.0)
-    pfc_co2e = cf4_kg * float(inputs.get("CF4_GWP", 7390.0) or 7390.0) + \
-        c2f6_kg * float(inputs.get("C2F6_GWP", 12200.0) or 12200.0)
-
-    # SO2 from sulfur in feed (if S_content provided)
-    s_content = float(inputs.get("S_content", 0.0) or 0.0)
-    acid_recovery_factor = float(inputs.get(
-        "acid_recovery_factor", 0.85) or 0.85)
+    cf4_kg = anode_effect_minutes * cf4_factor
+    c2f6_kg = anode_effect_minutes * c2f6_factor
+    pfc_co2e = cf4_kg * cf4_gwp + c2f6_kg * c2f6_gwp
+
+    # SO2 from sulfur in feed
     emissions_so2 = (s_content * ore_input_kg * 2.0) * \
         (1.0 - acid_recovery_factor)
 
     # other small emissions
-    total_fuel_mj = _sum_energy_mj_from_inputs(inputs)
-    emissions_nox = total_fuel_mj * NOX_PER_MJ
-    particulates_kg = float(inputs.get(
-        "fuel_coal_kg", 0.0) or 0.0) * PM_COAL_KG_PER_KG
+    emissions_nox = energy_mj * NOX_PER_MJ
+    particulates_kg = coal_kg * PM_COAL_KG_PER_KG
 
     gwp = emissions_co2 + pfc_co2e
 
     # water emissions
-    emissions_water_metal_ions = ore_input_kg * \
-        float(inputs.get("metal_leaching_factor", 0.0003) or 0.0003)
-    emissions_water_chemicals = float(
-        inputs.get("process_water_m3", 0.0) or 0.0) * 0.5
+    emissions_water_metal_ions = ore_input_kg * metal_leaching_factor
+    emissions_water_chemicals = process_water_m3 * 0.5
+
+    return CopperExtractionResult(yield_metal_t, total_material_input_kg, energy_mj,
+                                  waste_solid_kg, emissions_co2, cf4_kg, c2f6_kg, pfc_co2e,
+                                  emissions_so2, emissions_nox, particulates_kg, gwp,
+                                  emissions_water_metal_ions, emissions_water_chemicals)
+
+
+@njit(eager_signature(CopperManufacturingResult, *(_F,) * 12), cache=True)
+def _manufacturing_core(metal_input_kg, process_yield, aux_materials_kg,
+                        electricity_kWh, diesel_L, heavy_oil_L, coal_kg, ng_MJ,
+                        freshwater_m3, process_water_m3, cooling_water_returned, grid_factor):
+    yield_metal_t = (metal_input_kg * process_yield) / 1000.0
+
+    total_material_input_kg = metal_input_kg + aux_materials_kg
+    energy_mj = _energy_mj(electricity_kWh, diesel_L,
+                           heavy_oil_L, coal_kg, ng_MJ)
+
+    water_consumed_m3 = freshwater_m3 + process_water_m3 - cooling_water_returned
+
+    emissions_co2 = electricity_kWh * grid_factor + ng_MJ * NG_CO2_KG_PER_MJ
+
+    nox_kg = ng_MJ * NOX_PER_MJ
+    particulates_kg = aux_materials_kg * 0.001
+
+    gwp = emissions_co2
+
+    return CopperManufacturingResult(yield_metal_t, total_material_input_kg, energy_mj,
+                                     water_consumed_m3, emissions_co2, nox_kg, particulates_kg,
+                                     gwp)
+
+
+# -----------------------
+# Copper: Mining stage
+# -----------------------
+
+
+def compute_copper_mining(inputs: Dict[str, Any],
+                          grid_default: float = GRID_CO2_KG_PER_KWH_GLOBAL) -> Dict[str, Any]:
+    # inputs expected: ore_input_kg, ore_grade_percent, process_recovery, electricity_kWh,
+    # fuel_diesel_L, fuel_naturalGas_MJ, freshwater_m3, process_water_m3, land_area_m2,
+    # auxiliary_materials_kg, transport_*_tkm
+    get = inputs.get
+    r = _mining_core(
+        float(get("ore_input_kg", 0.0) or 0.0),
+        float(get("ore_grade_percent", 0.0) or 0.0),
+        # stage efficiency / yield (if provided else assume 0.9)
+        float(get("process_recovery", 0.9) or 0.9),
+        float(get("auxiliary_materials_kg", 0.0) or 0.0),
+        _fuel(inputs, "electricity_kWh"),
+        _fuel(inputs, "fuel_diesel_L"),
+        _fuel(inputs, "fuel_heavyOil_L"),
+        _fuel(inputs, "fuel_coal_kg"),
+        _fuel(inputs, "fuel_naturalGas_MJ"),
+        float(get("freshwater_m3", 0.0) or 0.0),
+        float(get("process_water_m3", 0.0) or 0.0),
+        float(get("water_returned_m3", 0.0) or 0.0),
+        float(get("grid_co2_factor", grid_default) or grid_default),
+        float(get("S_content", 0.0) or 0.0),  # fraction
+        float(get("acid_recovery_factor", 0.85) or 0.85),
+        float(get("metal_leaching_factor", 0.0003) or 0.0003),
+        float(get("runoff_fraction", 0.02) or 0.02))
 
     return {
-        "yield_metal_t": yield_metal_t,
-        "total_material_input_kg": total_material_input_kg,
-        "energy_MJ": energy_mj,
-        "waste_solid_kg": waste_solid_kg,
-        "waste_hazardous_kg": waste_solid_kg * 0.05,
+        "yield_metal_t": r.yield_metal_t,
+        "total_material_input_kg": r.total_material_input_kg,
+        "energy_MJ": r.energy_MJ,
+        "water_m3": r.water_m3,
+        "land_occupied_m2": float(get("land_area_m2", 0.0) or 0.0),
+        "waste_solid_kg": r.waste_solid_kg,
         "emissions": {
-            "co2_kg": emissions_co2,
-            "cf4_kg": cf4_kg,
-            "c2f6_kg": c2f6_kg,
-            "pfc_co2e_kgCO2e": pfc_co2e,
-            "so2_kg": emissions_so2,
-            "nox_kg": emissions_nox,
-            "particulates_kg": particulates_kg
+            "co2_kg": r.co2_kg,
+            "so2_kg": r.so2_kg,
+            "nox_kg": r.nox_kg,
+            "particulates_kg": r.particulates_kg,
+            "ch4_kg": r.ch4_kg,
+            "n2o_kg": r.n2o_kg
         },
-        "gwp_kgCO2e": gwp,
+        "gwp_kgCO2e": r.gwp_kgCO2e,
         "emissions_water": {
-            "metal_ions_kg": emissions_water_metal_ions,
-            "chemicals_kg": emissions_water_chemicals
+            "metal_ions_kg": r.metal_ions_kg,
+            "suspended_solids_kg": r.suspended_solids_kg
         }
     }
 
 # -----------------------
-# Copper: Manufacturing (semifab, casting, rolling, extrusion)
+# Copper: Extraction (smelting + refining)
 # -----------------------
 
 
-def compute_copper_manufacturing(inputs: Dict[str, Any]) -> Dict[str, Any]:
-    metal_input_kg = float(inputs.get(
-        "metal_input_kg", inputs.get("metal_input", 0.0)) or 0.0)
-    process_yield = float(inputs.get("process_yield", 1.0) or 1.0)
-    yield_metal_t = (metal_input_kg * process_yield) / 1000.0
-
-    total_material_input_kg = metal_input_kg + \
-        float(inputs.get("auxiliary_materials_kg", 0.0) or 0.0)
-    energy_mj = _sum_energy_mj_from_inputs(inputs)
+def compute_copper_extraction(inputs: Dict[str, Any],
+                              grid_default: float = GRID_CO2_KG_PER_KWH_GLOBAL) -> Dict[str, Any]:
+    # inputs expected: ore_input_kg (concentrate), fraction_alumina/fraction_cu etc.,
+    get = inputs.get
+    r = _extraction_core(
+        float(get("ore_input_kg", 0.0) or 0.0),
+        # fraction of metal in concentrate
+        float(get("fraction_metal", 0.0) or 0.0),
+        float(get("reduction_efficiency", 0.95) or 0.95),
+        float(get("auxiliary_materials_kg", 0.0) or 0.0),
+        _fuel(inputs, "electricity_kWh"),
+        _fuel(inputs, "fuel_diesel_L"),
+        _fuel(inputs, "fuel_heavyOil_L"),
+        _fuel(inputs, "fuel_coal_kg"),
+        _fuel(inputs, "fuel_naturalGas_MJ"),
+        float(get("impurity_fraction", 0.0) or 0.0),
+        float(get("anode_residue_kg", 0.0) or 0.0),
+        float(get("grid_co2_factor", grid_default) or grid_default),
+        float(get("CO2_proc_smelting", 400.0) or 400.0),  # per tonne Cu typical
+        float(get("anode_effect_minutes", 0.0) or 0.0),
+        float(get("CF4_factor", 0.0) or 0.0),
+        float(get("C2F6_factor", 0.0) or 0.0),
+        float(get("CF4_GWP", 7390.0) or 7390.0),
+        float(get("C2F6_GWP", 12200.0) or 12200.0),
+        float(get("S_content", 0.0) or 0.0),
+        float(get("acid_recovery_factor", 0.85) or 0.85),
+        float(get("metal_leaching_factor", 0.0003) or 0.0003),
+        float(get("process_water_m3", 0.0) or 0.0))
 
-    freshwater_m3 = float(inputs.get("freshwater_m3", 0.0) or 0.0)
-    process_water_m3 = float(inputs.get("process_water_m3", 0.0) or 0.0)
-    water_consumed_m3 = freshwater_m3 + process_water_m3 - \
-        float(inputs.get("cooling_water_returned", 0.0) or 0.0)
+    return {
+        "yield_metal_t": r.yield_metal_t,
+        "total_material_input_kg": r.total_material_input_kg,
+        "energy_MJ": r.energy_MJ,
+        "waste_solid_kg": r.waste_solid_kg,
+        "waste_hazardous_kg": r.waste_solid_kg * 0.05,
+        "emissions": {
+            "co2_kg": r.co2_kg,
+            "cf4_kg": r.cf4_kg,
+            "c2f6_kg": r.c2f6_kg,
+            "pfc_co2e_kgCO2e": r.pfc_co2e_kgCO2e,
+            "so2_kg": r.so2_kg,
+            "nox_kg": r.nox_kg,
+            "particulates_kg": r.particulates_kg
+        },
+        "gwp_kgCO2e": r.gwp_kgCO2e,
+        "emissions_water": {
+            "metal_ions_kg": r.metal_ions_kg,
+            "chemicals_kg": r.chemicals_kg
+        }
+    }
 
-    emissions_co2 = 0.0
-    grid_factor = float(inputs.get(
-        "grid_co2_factor", GRID_CO2_KG_PER_KWH_GLOBAL) or GRID_CO2_KG_PER_KWH_GLOBAL)
-    if "electricity_kWh" in inputs and inputs.get("electricity_kWh") is not None:
-        emissions_co2 += float(inputs.get("electricity_kWh")) * grid_factor
-    emissions_co2 += float(inputs.get("fuel_naturalGas_MJ",
-                           0.0) or 0.0) * NG_CO2_KG_PER_MJ
+# -----------------------
+# Copper: Manufacturing (semifab, casting, rolling, extrusion)
+# -----------------------
 
-    nox_kg = float(inputs.get("fuel_naturalGas_MJ", 0.0) or 0.0) * NOX_PER_MJ
-    particulates_kg = float(inputs.get(
-        "auxiliary_materials_kg", 0.0) or 0.0) * 0.001
 
-    gwp = emissions_co2
+def compute_copper_manufacturing(inputs: Dict[str, Any],
+                                 grid_default: float = GRID_CO2_KG_PER_KWH_GLOBAL) -> Dict[str, Any]:
+    get = inputs.get
+    r = _manufacturing_core(
+        float(get("metal_input_kg", get("metal_input", 0.0)) or 0.0),
+        float(get("process_yield", 1.0) or 1.0),
+        float(get("auxiliary_materials_kg", 0.0) or 0.0),
+        _fuel(inputs, "electricity_kWh"),
+        _fuel(inputs, "fuel_diesel_L"),
+        _fuel(inputs, "fuel_heavyOil_L"),
+        _fuel(inputs, "fuel_coal_kg"),
+        _fuel(inputs, "fuel_naturalGas_MJ"),
+        float(get("freshwater_m3", 0.0) or 0.0),
+        float(get("process_water_m3", 0.0) or 0.0),
+        float(get("cooling_water_returned", 0.0) or 0.0),
+        float(get("grid_co2_factor", grid_default) or grid_default))
 
     return {
-        "yield_metal_t": yield_metal_t,
-        "total_material_input_kg": total_material_input_kg,
-        "energy_MJ": energy_mj,
-        "water_m3": water_consumed_m3,
-        "waste_solid_kg": float(inputs.get("scrap_kg", 0.0) or 0.0),
+        "yield_metal_t": r.yield_metal_t,
+        "total_material_input_kg": r.total_material_input_kg,
+        "energy_MJ": r.energy_MJ,
+        "water_m3": r.water_m3,
+        "waste_solid_kg": float(get("scrap_kg", 0.0) or 0.0),
         "emissions": {
-            "co2_kg": emissions_co2,
-            "nox_kg": nox_kg,
-            "particulates_kg": particulates_kg
+            "co2_kg": r.co2_kg,
+            "nox_kg": r.nox_kg,
+            "particulates_kg": r.particulates_kg
         },
-        "gwp_kgCO2e": gwp
+        "gwp_kgCO2e": r.gwp_kgCO2e
     }
 
+
+def warm_up() -> None:
+    """Touch each numeric core once so the API can do it before serving traffic."""
+    _mining_core(*(_F,) * 17)
+    _extraction_core(*(_F,) * 22)
+    _manufacturing_core(*(_F,) * 12)
+    compute_combined_lca_copper_batch({"inputs": {}})
+
 # -----------------------
 # Combined wrapper for copper
 # -----------------------
 
+# stand-in emissions for a stage left out of the payload (read-only)
+_NO_EMISSIONS = {"so2_kg": 0.0, "nox_kg": 0.0}
+
 
 def compute_combined_lca_copper(payload: Dict[str, Any]) -> Dict[str, Any]:
     """
     payload contains:
       - projectId, scenarioId, route, functionalUnit_kg, recycling_rate
+      - country_iso (optional): picks the grid factor from GRID_CO2_KG_PER_KWH_BY_ISO;
+        anything but a string code gets the global factor
       - inputs: { mining: {...}, extraction: {...}, manufacturing: {...} }
     Returns breakdown & totals.
     """
@@ -303,11 +413,17 @@ def compute_combined_lca_copper(payload: Dict[str, Any]) -> Dict[str, Any]:
     extraction_inputs = inputs.get("extraction", {}) or {}
     manufacturing_inputs = inputs.get("manufacturing", {}) or {}
 
-    mining_res = compute_copper_mining(mining_inputs) if mining_inputs else {}
+    # regional grid factor for stages that don't set grid_co2_factor themselves
+    grid_default = _grid_co2_for_iso(payload.get("country_iso"))
+    if grid_default is None:
+        grid_default = GRID_CO2_KG_PER_KWH_GLOBAL
+
+    mining_res = compute_copper_mining(
+        mining_inputs, grid_default) if mining_inputs else {}
     extraction_res = compute_copper_extraction(
-        extraction_inputs) if extraction_inputs else {}
+        extraction_inputs, grid_default) if extraction_inputs else {}
     manufacturing_res = compute_copper_manufacturing(
-        manufacturing_inputs) if manufacturing_inputs else {}
+        manufacturing_inputs, grid_default) if manufacturing_inputs else {}
 
     total_gwp = 0.0
     total_energy = 0.0
@@ -326,10 +442,12 @@ def compute_combined_lca_copper(payload: Dict[str, Any]) -> Dict[str, Any]:
     avoided = recycling_rate * primary_route_gwp
 
     # minimal LCIA placeholders (backend may compute full LCIA later)
+    mining_em = mining_res["emissions"] if mining_res else _NO_EMISSIONS
+    extraction_em = extraction_res["emissions"] if extraction_res else _NO_EMISSIONS
     lcia = {
         "global_warming_kg_co2e": total_gwp,
-        "acidification_kg_so2e": (mining_res.get("emissions", {}).get("so2_kg", 0.0) + extraction_res.get("emissions", {}).get("so2_kg", 0.0)) * 1.2,
-        "eutrophication_kg_po4e": (mining_res.get("emissions", {}).get("nox_kg", 0.0) + extraction_res.get("emissions", {}).get("nox_kg", 0.0)) * 0.1,
+        "acidification_kg_so2e": (mining_em["so2_kg"] + extraction_em["so2_kg"]) * 1.2,
+        "eutrophication_kg_po4e": (mining_em["nox_kg"] + extraction_em["nox_kg"]) * 0.1,
         "water_depletion_m3": total_water,
         "resource_depletion_kg_resource_eq": float(mining_inputs.get("ore_input_kg", 0.0)),
         "human_toxicity_ctu": 0.0,
@@ -359,3 +477,145 @@ def compute_combined_lca_copper(payload: Dict[str, Any]) -> Dict[str, Any]:
         },
         "lcia_results": lcia
     }
+
+
+# -----------------------
+# Parallel combined batch: per-scenario totals for Monte Carlo / sensitivity sweeps
+# -----------------------
+BATCH_COLUMNS = (
+    "gwp_kgCO2e", "energy_MJ", "water_m3",
+    "mining_gwp_kgCO2e", "extraction_gwp_kgCO2e", "manufacturing_gwp_kgCO2e",
+)
+
+# Input fields (and defaults) in the positional order each core expects
+_MINING_FIELDS = (
+    ("ore_input_kg", 0.0), ("ore_grade_percent", 0.0), ("process_recovery", 0.9),
+    ("auxiliary_materials_kg", 0.0), ("electricity_kWh", 0.0), ("fuel_diesel_L", 0.0),
+    ("fuel_heavyOil_L", 0.0), ("fuel_coal_kg", 0.0), ("fuel_naturalGas_MJ", 0.0),
+    ("freshwater_m3", 0.0), ("process_water_m3", 0.0), ("water_returned_m3", 0.0),
+    ("grid_co2_factor", GRID_CO2_KG_PER_KWH_GLOBAL), ("S_content", 0.0),
+    ("acid_recovery_factor", 0.85), ("metal_leaching_factor", 0.0003),
+    ("runoff_fraction", 0.02),
+)
+_EXTRACTION_FIELDS = (
+    ("ore_input_kg", 0.0), ("fraction_metal", 0.0), ("reduction_efficiency", 0.95),
+    ("auxiliary_materials_kg", 0.0), ("electricity_kWh", 0.0), ("fuel_diesel_L", 0.0),
+    ("fuel_heavyOil_L", 0.0), ("fuel_coal_kg", 0.0), ("fuel_naturalGas_MJ", 0.0),
+    ("impurity_fraction", 0.0), ("anode_residue_kg", 0.0),
+    ("grid_co2_factor", GRID_CO2_KG_PER_KWH_GLOBAL), ("CO2_proc_smelting", 400.0),
+    ("anode_effect_minutes", 0.0), ("CF4_factor", 0.0), ("C2F6_factor", 0.0),
+    ("CF4_GWP", 7390.0), ("C2F6_GWP", 12200.0), ("S_content", 0.0),
+    ("acid_recovery_factor", 0.85), ("metal_leaching_factor", 0.0003),
+    ("process_water_m3", 0.0),
+)
+_MANUFACTURING_FIELDS = (
+    ("metal_input_kg", 0.0), ("process_yield", 1.0), ("auxiliary_materials_kg", 0.0),
+    ("electricity_kWh", 0.0), ("fuel_diesel_L", 0.0), ("fuel_heavyOil_L", 0.0),
+    ("fuel_coal_kg", 0.0), ("fuel_naturalGas_MJ", 0.0), ("freshwater_m3", 0.0),
+    ("process_water_m3", 0.0), ("cooling_water_returned", 0.0),
+    ("grid_co2_factor", GRID_CO2_KG_PER_KWH_GLOBAL),
+)
+
+MINING_INPUT_DTYPE = input_dtype(_MINING_FIELDS)
+EXTRACTION_INPUT_DTYPE = input_dtype(_EXTRACTION_FIELDS)
+MANUFACTURING_INPUT_DTYPE = input_dtype(_MANUFACTURING_FIELDS)
+
+
+@njit(parallel=True, nogil=True, cache=True)
+def _run_batch(mining, extraction, manufacturing, out):
+    """Fill out[:, i] (rows as BATCH_COLUMNS) for every scenario i, in parallel."""
+    for i in prange(out.shape[1]):
+        m = mining[i]
+        e = extraction[i]
+        f = manufacturing[i]
+        mining_res = _mining_core(m[0], m[1], m[2], m[3], m[4], m[5], m[6], m[7], m[8],
+                                  m[9], m[10], m[11], m[12], m[13], m[14], m[15], m[16])
+        extraction_res = _extraction_core(e[0], e[1], e[2], e[3], e[4], e[5], e[6], e[7],
+                                          e[8], e[9], e[10], e[11], e[12], e[13], e[14],
+                                          e[15], e[16], e[17], e[18], e[19], e[20], e[21])
+        manufacturing_res = _manufacturing_core(f[0], f[1], f[2], f[3], f[4], f[5],
+                                                f[6], f[7], f[8], f[9], f[10], f[11])
+        out[0, i] = mining_res.gwp_kgCO2e + extraction_res.gwp_kgCO2e + \
+            manufacturing_res.gwp_kgCO2e
+        out[1, i] = mining_res.energy_MJ + extraction_res.energy_MJ + \
+            manufacturing_res.energy_MJ
+        out[2, i] = mining_res.water_m3 + manufacturing_res.water_m3
+        out[3, i] = mining_res.gwp_kgCO2e
+        out[4, i] = extraction_res.gwp_kgCO2e
+        out[5, i] = manufacturing_res.gwp_kgCO2e
+
+
+def _copper_stage_matrix(inputs, fields, n: int, stage: str, grid_default) -> np.ndarray:
+    """
+    Checked stage matrix; a 0 takes the field's default, like `or default` in the scalar
+    path. grid_co2_factor defaults to grid_default (scalar or one value per scenario).
+    """
+    if isinstance(inputs, dict) and "grid_co2_factor" not in inputs:
+        inputs = dict(inputs, grid_co2_factor=grid_default)
+    matrix = check_stage_matrix(stage_matrix(inputs, fields, n), fields, stage)
+    defaults = np.empty((n, len(fields)))
+    defaults[:] = [default for _, default in fields]
+    defaults[:, [key for key, _ in fields].index("grid_co2_factor")] = grid_default
+    return np.where(matrix == 0.0, defaults, matrix)
+
+
+def _grid_default_batch(payload: Dict[str, Any], n: int):
+    """
+    Grid factor per scenario from payload["country_iso"]: one code, or a list with one
+    code (or null, for the global factor) per scenario. Raises ValueError otherwise.
+    """
+    iso = payload.get("country_iso")
+    if iso is None:
+        return GRID_CO2_KG_PER_KWH_GLOBAL
+    if isinstance(iso, str):
+        return _grid_co2_for_iso(iso)
+    if not isinstance(iso, list):
+        raise ValueError("country_iso must be a string code or a list of codes")
+    factors = np.empty(len(iso), dtype=np.float64)
+    for i, code in enumerate(iso):
+        factor = GRID_CO2_KG_PER_KWH_GLOBAL if code is None else _grid_co2_for_iso(code)
+        if factor is None:
+            raise ValueError(f"country_iso must be string codes (scenario {i}: {code!r})")
+        factors[i] = factor
+    try:
+        return np.broadcast_to(factors, (n,))
+    except ValueError:
+        raise ValueError(f"country_iso must be one code or a list of {n} codes")
+
+
+def compute_combined_lca_copper_batch(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Batch version of compute_combined_lca_copper, same payload conventions as the
+    aluminium batch: each stage field is an array (or list) with one value per
+    scenario, scalars broadcast, and a section may be a structured array such as
+    MINING_INPUT_DTYPE. country_iso may be one code or a list with one per scenario.
+    Returns {"n_scenarios": n, "results": {column: array}} with BATCH_COLUMNS plus
+    avoided_primary_co2e_kg.
+    Raises ValueError if a section is not an object, country_iso is not a code (or a
+    list of codes), or any input is non-numeric, NaN, infinite or negative.
+    """
+    inputs = batch_inputs(payload)
+    mining_inputs = stage_section(inputs, "mining")
+    extraction_inputs = stage_section(inputs, "extraction")
+    manufacturing_inputs = field_alias(
+        stage_section(inputs, "manufacturing"), "metal_input_kg", "metal_input")
+
+    n = max(batch_size(mining_inputs), batch_size(extraction_inputs),
+            batch_size(manufacturing_inputs))
+    # one contiguous row per output column
+    out = np.empty((len(BATCH_COLUMNS), n), dtype=np.float64)
+    grid_default = _grid_default_batch(payload, n)
+    _run_batch(_copper_stage_matrix(mining_inputs, _MINING_FIELDS, n, "mining", grid_default),
+               _copper_stage_matrix(extraction_inputs, _EXTRACTION_FIELDS, n, "extraction",
+                                    grid_default),
+               _copper_stage_matrix(manufacturing_inputs, _MANUFACTURING_FIELDS, n,
+                                    "manufacturing", grid_default),
+               out)
+
+    results = {name: out[j] for j, name in enumerate(BATCH_COLUMNS)}
+    recycling_rate = batch_field(payload, "recycling_rate", 0.0, n)
+    total_gwp = results["gwp_kgCO2e"]
+    primary_route_gwp = batch_field(payload, "primary_route_gwp_kgCO2e", 0.0, n)
+    results["avoided_primary_co2e_kg"] = recycling_rate * \
+        np.where(primary_route_gwp == 0.0, total_gwp, primary_route_gwp)
+    return {"n_scenarios": n, "results": results}
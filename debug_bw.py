@@ -1,22 +1,29 @@
-import brightway2 as bw
-
 PROJECT_NAME = "metal_lca"
 DB_NAME = "aluminium_primary_global"
 
-print(f"Using Brightway project: {PROJECT_NAME}")
-bw.projects.set_current(PROJECT_NAME)
 
-print("\n📚 Available databases:")
-for name in bw.databases:
-    print(" -", name)
+def main():
+    # imported here so importing this module doesn't pull in the brightway stack
+    import brightway2 as bw
+
+    print(f"Using Brightway project: {PROJECT_NAME}")
+    bw.projects.set_current(PROJECT_NAME)
+
+    print("\n📚 Available databases:")
+    for name in bw.databases:
+        print(" -", name)
+
+    if DB_NAME not in bw.databases:
+        print(f"\n❌ Database '{DB_NAME}' NOT found.")
+    else:
+        db = bw.Database(DB_NAME)
+        print(f"\n✅ Activities in '{DB_NAME}':")
+        # one bulk read of the whole database instead of one query per activity
+        for key, data in db.load().items():
+            code = key[1]               # key is ('aluminium_primary_global', 'some_code')
+            name = data.get('name')     # human-readable name
+            print("  ", key, "| code:", code, "| name:", name)
+
 
-if DB_NAME not in bw.databases:
-    print(f"\n❌ Database '{DB_NAME}' NOT found.")
-else:
-    db = bw.Database(DB_NAME)
-    print(f"\n✅ Activities in '{DB_NAME}':")
-    for act in db:
-        key = act.key         # ('aluminium_primary_global', 'some_code')
-        code = act['code']    # the internal code string
-        name = act['name']    # human-readable name
-        print("  ", key, "| code:", code, "| name:", name)
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+# jit_utils.py
+# Optional Numba support for the calculators. If numba is not installed the
+# decorators below are no-ops and the numeric cores run as plain Python.
+#
+# Where the time goes: a single-scenario request is dominated by JSON
+# (de)serialization and dict handling; the stage cores are a few dozen
+# multiply-adds each, i.e. compute-bound but tiny. So the cores are compiled
+# eagerly with cache=True (no first-request JIT), serial, and without
+# fastmath - reassociating the sums would change results against the plain
+# Python path, and there is nothing to vectorize in one scenario. Only the
+# batch kernel (_run_batch) uses parallel=True, where the work is per-row.
+import logging
+
+logger = logging.getLogger("metal-lca-engine")
+
+try:
+    from numba import njit, prange, typeof, types
+    NUMBA_AVAILABLE = True
+except Exception as e:
+    NUMBA_AVAILABLE = False
+    logger.warning("numba not available, calculators run without JIT: %s", e)
+    prange = range
+
+    def njit(*args, **kwargs):
+        """Fallback for @njit and @njit(...) when numba is missing."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def wrap(fn):
+            return fn
+        return wrap
+
+
+def eager_signature(ret, *example_args):
+    """
+    Build an explicit Numba signature from example arguments so @njit compiles
+    (or loads from cache) at import instead of on the first request.
+    ret is either the number of float64 return values (a tuple when > 1) or a
+    NamedTuple class whose fields are all floats.
+    Returns None without numba, which @njit treats as lazy compilation.
+    """
+    if not NUMBA_AVAILABLE:
+        return None
+    if isinstance(ret, int):
+        ret_type = types.float64 if ret == 1 else types.UniTuple(types.float64, ret)
+    else:
+        ret_type = types.NamedUniTuple(types.float64, len(ret._fields), ret)
+    return ret_type(*(typeof(a) for a in example_args))
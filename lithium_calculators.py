@@ -1,6 +1,7 @@
 # lithium_calculators.py
-from typing import Dict, Any
+from typing import Dict, Any, NamedTuple
 import math
+from jit_utils import njit, eager_signature
 
 # --- Default constants / EF (change later if you have more accurate local values) ---
 EF_ELECTRICITY_GLOBAL = 0.48  # kg CO2 / kWh
@@ -17,6 +18,46 @@ EF_NOX_PER_MJ = 0.15 / 1000  # kg NOx / MJ
 EF_CH4_PER_MJ = 0.001 / 1000
 EF_N2O_PER_MJ = 0.0001 / 1000
 
+# example argument used to build the eager-compilation signatures below
+_F = 0.0
+
+
+# Per-stage defaults, built once at import instead of per request.
+class LithiumStageDefaults(NamedTuple):
+    eta_stage: float = 0.9
+    slag_factor: float = 0.2
+    hazardous_fraction: float = 0.05
+    yield_override_t: float = 0.0
+    waste_factor_aux: float = 0.5
+    ef_electricity: float = EF_ELECTRICITY_GLOBAL
+    s_content_coal: float = 0.02  # 2% default
+    desulfurization_efficiency: float = 0.0
+    ef_so2_diesel: float = 0.0
+    dust_factor: float = 0.0001
+    ef_pm_coal: float = 0.002
+    chem_concentration_kg_per_m3: float = 0.5
+    leaching_factor_metal: float = 0.0001
+    process_CO2_direct: float = 0.0
+    ore_grade_percent: float = 0.0
+
+
+# default stage parameters for lithium routes (you can fine-tune per route)
+MINING_DEFAULTS = LithiumStageDefaults(
+    eta_stage=0.90,
+    ef_electricity=EF_ELECTRICITY_GLOBAL,
+    waste_factor_aux=0.5,
+    leaching_factor_metal=0.0001,
+    chem_concentration_kg_per_m3=0.5)
+EXTRACTION_DEFAULTS = LithiumStageDefaults(
+    eta_stage=0.90,
+    ef_electricity=EF_ELECTRICITY_GLOBAL,
+    slag_factor=0.15,
+    hazardous_fraction=0.05,
+    leaching_factor_metal=0.0001)
+MANUFACTURING_DEFAULTS = LithiumStageDefaults(
+    eta_stage=0.98,
+    ef_electricity=EF_ELECTRICITY_GLOBAL)
+
 # helper util
 
 
@@ -29,132 +70,143 @@ def _safe_float(x, default=0.0):
         return default
 
 
-def _sum_energy_mj(inputs: Dict[str, Any]) -> float:
-    # supports electricity_kWh, fuel_naturalGas_MJ, fuel_coal_kg, fuel_diesel_L
-    el = _safe_float(inputs.get("electricity_kWh", 0.0))
-    gas = _safe_float(inputs.get("fuel_naturalGas_MJ", 0.0))
-    coal = _safe_float(inputs.get("fuel_coal_kg", 0.0))
-    diesel = _safe_float(inputs.get("fuel_diesel_L", 0.0))
-    return el * MJ_PER_KWH + gas + coal * MJ_PER_KG_COAL + diesel * MJ_PER_L_DIESEL
-
-
-def _co2_from_energy(inputs: Dict[str, Any], ef_electricity=EF_ELECTRICITY_GLOBAL) -> float:
-    el = _safe_float(inputs.get("electricity_kWh", 0.0))
-    gas = _safe_float(inputs.get("fuel_naturalGas_MJ", 0.0))
-    coal = _safe_float(inputs.get("fuel_coal_kg", 0.0))
-    diesel = _safe_float(inputs.get("fuel_diesel_L", 0.0))
-    co2 = el * ef_electricity + gas * EF_GAS_CO2_PER_MJ + \
-        coal * EF_COAL_CO2_PER_KG + diesel * EF_DIESEL_CO2_PER_L
-    return co2
-
-
-def _combustion_GHGs(inputs: Dict[str, Any]) -> Dict[str, float]:
-    total_mj = _sum_energy_mj(inputs)
-    ch4 = total_mj * EF_CH4_PER_MJ
-    n2o = total_mj * EF_N2O_PER_MJ
-    nox = total_mj * EF_NOX_PER_MJ
-    return {"CH4": ch4, "N2O": n2o, "NOx": nox, "TotalFuelMJ": total_mj}
-
-# Main single-stage calculator helper
-
-
-def _calc_stage_common(stage_inputs: Dict[str, Any], defaults: Dict[str, Any]) -> Dict[str, Any]:
+@njit(eager_signature(5, *(_F,) * 5), cache=True)
+def _energy_bundle(el, gas, coal, diesel, ef_electricity):
     """
-    stage_inputs - raw dict from payload for this stage (can be empty)
-    defaults - dictionary with stage defaults (eta, slag_factor, hazardous_fraction, etc.)
+    One pass over the four energy carriers (electricity_kWh, fuel_naturalGas_MJ,
+    fuel_coal_kg, fuel_diesel_L). Returns (total_mj, co2, ch4, n2o, nox).
     """
-    # read inputs with safe float conversions
-    ore_input_kg = _safe_float(stage_inputs.get("ore_input_kg", 0.0))
-    electricity_kWh = _safe_float(stage_inputs.get("electricity_kWh", 0.0))
-    fuel_naturalGas_MJ = _safe_float(
-        stage_inputs.get("fuel_naturalGas_MJ", 0.0))
-    fuel_coal_kg = _safe_float(stage_inputs.get("fuel_coal_kg", 0.0))
-    fuel_diesel_L = _safe_float(stage_inputs.get("fuel_diesel_L", 0.0))
-    freshwater_m3 = _safe_float(stage_inputs.get("freshwater_m3", 0.0))
-    process_water_m3 = _safe_float(stage_inputs.get("process_water_m3", 0.0))
-    auxiliary_materials_kg = _safe_float(
-        stage_inputs.get("auxiliary_materials_kg", 0.0))
-    ore_grade_percent = _safe_float(stage_inputs.get(
-        "ore_grade_percent", None) or defaults.get("ore_grade_percent", 0.0))
-    eta = defaults.get("eta_stage", 0.9)
-    slag_factor = defaults.get("slag_factor", 0.2)
-    hazardous_fraction = defaults.get("hazardous_fraction", 0.05)
-
+    total_mj = el * MJ_PER_KWH + gas + coal * MJ_PER_KG_COAL + diesel * MJ_PER_L_DIESEL
+    co2 = el * ef_electricity + gas * EF_GAS_CO2_PER_MJ + \
+        coal * EF_COAL_CO2_PER_KG + diesel * EF_DIESEL_CO2_PER_L
+    return (total_mj, co2, total_mj * EF_CH4_PER_MJ,
+            total_mj * EF_N2O_PER_MJ, total_mj * EF_NOX_PER_MJ)
+
+
+# Flat stage result returned by the numeric core; _calc_stage_common turns it
+# into the nested result dict exactly once.
+class LithiumStageResult(NamedTuple):
+    yield_metal_t: float
+    total_material_input_kg: float
+    energy_MJ: float
+    water_m3: float
+    waste_solid_kg: float
+    waste_hazardous_kg: float
+    co2_kg: float
+    ch4_kg: float
+    n2o_kg: float
+    nox_kg: float
+    so2_kg: float
+    particulates_kg: float
+    chemicals_kg: float
+    metal_ions_kg: float
+
+
+@njit(eager_signature(LithiumStageResult, *(_F,) * 22), cache=True)
+def _stage_core(ore_input_kg, electricity_kWh, fuel_naturalGas_MJ, fuel_coal_kg, fuel_diesel_L,
+                freshwater_m3, process_water_m3, auxiliary_materials_kg, ore_grade_percent,
+                process_co2_direct, eta, hazardous_fraction, yield_override_t, waste_factor_aux,
+                ef_electricity, s_content_coal, desulfur_eff, ef_so2_diesel, dust_factor,
+                ef_pm_coal, chem_concentration, leaching_factor_metal):
     # yield_metal_t: if ore_input provided and grade given, else use eta*ore_input
-    MWF = ore_grade_percent / 100.0 if ore_grade_percent else None
-    if ore_input_kg and MWF is not None:
+    MWF = ore_grade_percent / 100.0  # only used when a grade is given
+    if ore_input_kg and ore_grade_percent:
         yield_metal_t = (ore_input_kg * MWF * eta) / 1000.0
     elif ore_input_kg:
         yield_metal_t = (ore_input_kg * eta) / 1000.0
     else:
-        yield_metal_t = defaults.get("yield_override_t", 0.0)
+        yield_metal_t = yield_override_t
 
     # material & energy
     total_material_input_kg = ore_input_kg + auxiliary_materials_kg
-    energy_MJ = _sum_energy_mj(stage_inputs)
+    energy_MJ, co2_from_energy, ch4_kg, n2o_kg, nox_kg = _energy_bundle(
+        electricity_kWh, fuel_naturalGas_MJ, fuel_coal_kg, fuel_diesel_L, ef_electricity)
     water_m3 = freshwater_m3 + process_water_m3
 
     # waste
-    if ore_input_kg and MWF is not None:
-        waste_solid_kg = ore_input_kg * \
-            (1.0 - (MWF if MWF is not None else 0.0)) * (1.0 - eta)
+    if ore_input_kg and ore_grade_percent:
+        waste_solid_kg = ore_input_kg * (1.0 - MWF) * (1.0 - eta)
     elif ore_input_kg:
         waste_solid_kg = ore_input_kg * (1.0 - eta)
     else:
         # fallback for brine mining etc - proportional to auxiliaries
-        waste_solid_kg = auxiliary_materials_kg * \
-            (defaults.get("waste_factor_aux", 0.5))
+        waste_solid_kg = auxiliary_materials_kg * waste_factor_aux
 
     waste_hazardous_kg = waste_solid_kg * hazardous_fraction
 
     # emissions
-    co2_from_energy = _co2_from_energy(stage_inputs, ef_electricity=defaults.get(
-        "ef_electricity", EF_ELECTRICITY_GLOBAL))
-    combustion = _combustion_GHGs(stage_inputs)
-    # optional simple process CO2 (user may provide or defaults)
-    process_co2_direct = _safe_float(stage_inputs.get(
-        "process_CO2_direct", defaults.get("process_CO2_direct", 0.0)))
     emissions_air_co2_kg = co2_from_energy + process_co2_direct
 
     # SO2 approx: from coal sulfur (if coal present)
-    s_content_coal = defaults.get("s_content_coal", 0.02)  # 2% default
-    desulfur_eff = defaults.get("desulfurization_efficiency", 0.0)
     so2_from_coal = fuel_coal_kg * s_content_coal * 2.0 * (1.0 - desulfur_eff)
-    so2_from_diesel = fuel_diesel_L * defaults.get("ef_so2_diesel", 0.0)
+    so2_from_diesel = fuel_diesel_L * ef_so2_diesel
     emissions_air_so2_kg = so2_from_coal + so2_from_diesel
 
     # particulates: simple sum
-    particulates = ore_input_kg * \
-        defaults.get("dust_factor", 0.0001) + fuel_coal_kg * \
-        defaults.get("ef_pm_coal", 0.002)
+    particulates = ore_input_kg * dust_factor + fuel_coal_kg * ef_pm_coal
 
     # water emissions (simplified)
-    emissions_water_chemicals_kg = process_water_m3 * \
-        defaults.get("chem_concentration_kg_per_m3", 0.5)
-    emissions_water_metal_ions_kg = ore_input_kg * \
-        defaults.get("leaching_factor_metal", 0.0001)
+    emissions_water_chemicals_kg = process_water_m3 * chem_concentration
+    emissions_water_metal_ions_kg = ore_input_kg * leaching_factor_metal
+
+    return LithiumStageResult(yield_metal_t, total_material_input_kg, energy_MJ, water_m3,
+                              waste_solid_kg, waste_hazardous_kg, emissions_air_co2_kg,
+                              ch4_kg, n2o_kg, nox_kg, emissions_air_so2_kg, particulates,
+                              emissions_water_chemicals_kg, emissions_water_metal_ions_kg)
+
+# Main single-stage calculator helper
+
+
+def _calc_stage_common(stage_inputs: Dict[str, Any], defaults: LithiumStageDefaults) -> Dict[str, Any]:
+    """
+    stage_inputs - raw dict from payload for this stage (can be empty)
+    defaults - stage defaults record (eta, slag_factor, hazardous_fraction, etc.)
+    """
+    # read inputs with safe float conversions
+    get = stage_inputs.get
+    D = defaults
+    r = _stage_core(
+        _safe_float(get("ore_input_kg", 0.0)),
+        _safe_float(get("electricity_kWh", 0.0)),
+        _safe_float(get("fuel_naturalGas_MJ", 0.0)),
+        _safe_float(get("fuel_coal_kg", 0.0)),
+        _safe_float(get("fuel_diesel_L", 0.0)),
+        _safe_float(get("freshwater_m3", 0.0)),
+        _safe_float(get("process_water_m3", 0.0)),
+        _safe_float(get("auxiliary_materials_kg", 0.0)),
+        _safe_float(get("ore_grade_percent", None) or D.ore_grade_percent),
+        # optional simple process CO2 (user may provide or defaults)
+        _safe_float(get("process_CO2_direct", D.process_CO2_direct)),
+        D.eta_stage, D.hazardous_fraction, D.yield_override_t, D.waste_factor_aux,
+        D.ef_electricity, D.s_content_coal, D.desulfurization_efficiency, D.ef_so2_diesel,
+        D.dust_factor, D.ef_pm_coal, D.chem_concentration_kg_per_m3, D.leaching_factor_metal)
 
     return {
-        "yield_metal_t": yield_metal_t,
-        "total_material_input_kg": total_material_input_kg,
-        "energy_MJ": energy_MJ,
-        "water_m3": water_m3,
-        "waste_solid_kg": waste_solid_kg,
-        "waste_hazardous_kg": waste_hazardous_kg,
+        "yield_metal_t": r.yield_metal_t,
+        "total_material_input_kg": r.total_material_input_kg,
+        "energy_MJ": r.energy_MJ,
+        "water_m3": r.water_m3,
+        "waste_solid_kg": r.waste_solid_kg,
+        "waste_hazardous_kg": r.waste_hazardous_kg,
         "emissions": {
-            "co2_kg": emissions_air_co2_kg,
-            "ch4_kg": combustion["CH4"],
-            "n2o_kg": combustion["N2O"],
-            "nox_kg": combustion["NOx"],
-            "so2_kg": emissions_air_so2_kg,
-            "particulates_kg": particulates
+            "co2_kg": r.co2_kg,
+            "ch4_kg": r.ch4_kg,
+            "n2o_kg": r.n2o_kg,
+            "nox_kg": r.nox_kg,
+            "so2_kg": r.so2_kg,
+            "particulates_kg": r.particulates_kg
         },
         "emissions_water": {
-            "chemicals_kg": emissions_water_chemicals_kg,
-            "metal_ions_kg": emissions_water_metal_ions_kg
+            "chemicals_kg": r.chemicals_kg,
+            "metal_ions_kg": r.metal_ions_kg
         },
     }
 
+
+def warm_up() -> None:
+    """Touch the numeric core once so the API can do it before serving traffic."""
+    _stage_core(*(_F,) * 22)
+
 # Top-level combined LCA function
 
 
@@ -172,40 +224,23 @@ def compute_combined_lca_lithium(payload: Dict[str, Any]) -> Dict[str, Any]:
                      )  # default to 1000 kg = 1 t
     inputs = payload.get("inputs", {})
 
-    # default stage parameters for lithium routes (you can fine-tune per route)
-    defaults_mining = {
-        "eta_stage": 0.90,
-        "ef_electricity": EF_ELECTRICITY_GLOBAL,
-        "waste_factor_aux": 0.5,
-        "leaching_factor_metal": 0.0001,
-        "chem_concentration_kg_per_m3": 0.5
-    }
-    defaults_extraction = {
-        "eta_stage": 0.90,
-        "ef_electricity": EF_ELECTRICITY_GLOBAL,
-        "slag_factor": 0.15,
-        "hazardous_fraction": 0.05,
-        "leaching_factor_metal": 0.0001
-    }
-    defaults_manufacturing = {
-        "eta_stage": 0.98,
-        "ef_electricity": EF_ELECTRICITY_GLOBAL
-    }
-
     # mining stage
     mining_inputs = inputs.get("mining", {}) or {}
     extraction_inputs = inputs.get("extraction", {}) or {}
     manufacturing_inputs = inputs.get("manufacturing", {}) or {}
 
-    mining_res = _calc_stage_common(mining_inputs, defaults_mining)
-    extraction_res = _calc_stage_common(extraction_inputs, defaults_extraction)
+    mining_res = _calc_stage_common(mining_inputs, MINING_DEFAULTS)
+    extraction_res = _calc_stage_common(extraction_inputs, EXTRACTION_DEFAULTS)
     manufacturing_res = _calc_stage_common(
-        manufacturing_inputs, defaults_manufacturing)
+        manufacturing_inputs, MANUFACTURING_DEFAULTS)
+
+    # every stage result carries the full emissions dict
+    mining_em = mining_res["emissions"]
+    extraction_em = extraction_res["emissions"]
+    manufacturing_em = manufacturing_res["emissions"]
 
     # totals
-    totals_gwp = mining_res["emissions"]["co2_kg"] + \
-        extraction_res["emissions"]["co2_kg"] + \
-        manufacturing_res["emissions"]["co2_kg"]
+    totals_gwp = mining_em["co2_kg"] + extraction_em["co2_kg"] + manufacturing_em["co2_kg"]
     totals_energy = mining_res["energy_MJ"] + \
         extraction_res["energy_MJ"] + manufacturing_res["energy_MJ"]
     totals_water = mining_res["water_m3"] + \
@@ -216,21 +251,16 @@ def compute_combined_lca_lithium(payload: Dict[str, Any]) -> Dict[str, Any]:
     avoided_primary_co2e_kg = 0.0  # need benchmark to compute; left zero for now
 
     # simple LCIA results (GWP using CH4 & N2O)
-    total_ch4 = mining_res["emissions"]["ch4_kg"] + \
-        extraction_res["emissions"]["ch4_kg"] + \
-        manufacturing_res["emissions"]["ch4_kg"]
-    total_n2o = mining_res["emissions"]["n2o_kg"] + \
-        extraction_res["emissions"]["n2o_kg"] + \
-        manufacturing_res["emissions"]["n2o_kg"]
+    total_ch4 = mining_em["ch4_kg"] + extraction_em["ch4_kg"] + manufacturing_em["ch4_kg"]
+    total_n2o = mining_em["n2o_kg"] + extraction_em["n2o_kg"] + manufacturing_em["n2o_kg"]
+    total_so2 = mining_em["so2_kg"] + extraction_em["so2_kg"] + manufacturing_em["so2_kg"]
+    total_nox = mining_em["nox_kg"] + extraction_em["nox_kg"] + manufacturing_em["nox_kg"]
     global_warming = totals_gwp + 25.0 * total_ch4 + 298.0 * total_n2o
-    acidification = 1.2 * (mining_res["emissions"].get("so2_kg", 0.0) + extraction_res["emissions"].get("so2_kg", 0.0) + manufacturing_res["emissions"].get("so2_kg", 0.0)) \
-        + 0.7 * (mining_res["emissions"].get("nox_kg", 0.0) + extraction_res["emissions"].get(
-            "nox_kg", 0.0) + manufacturing_res["emissions"].get("nox_kg", 0.0))
-    eutrophication = 0.1 * (mining_res["emissions"].get("nox_kg", 0.0) + extraction_res["emissions"].get(
-        "nox_kg", 0.0) + manufacturing_res["emissions"].get("nox_kg", 0.0))
+    acidification = 1.2 * total_so2 + 0.7 * total_nox
+    eutrophication = 0.1 * total_nox
     water_depletion = totals_water  # region CF not applied
-    resource_depletion = _safe_float(payload.get("inputs", {}).get(
-        "mining", {}).get("ore_input_kg", 0.0)) * 1.0  # placeholder
+    resource_depletion = _safe_float(
+        mining_inputs.get("ore_input_kg", 0.0)) * 1.0  # placeholder
 
     response = {
         "metadata": metadata,
@@ -10,31 +10,70 @@ import joblib
 MODEL_PATH = os.path.join("models", "xgb_missing_values.pkl")
 
 _xgb_model = None  # cached model
+_xgb_booster = None  # its raw Booster, predicted from without a DMatrix copy
+_iteration_range = (0, 0)  # trees to use; (0, 0) = all, as XGBoost defaults
+_NOT_FAILED = object()
+_failed_mtime = _NOT_FAILED  # model file mtime (None = missing) when loading last failed
+
+
+def _model_mtime():
+    try:
+        return os.stat(MODEL_PATH).st_mtime_ns
+    except OSError:
+        return None
 
 
 def _load_model():
-    """Lazy-load the XGBoost model from disk."""
-    global _xgb_model
+    """
+    Lazy-load the XGBoost model from disk. A successful load is kept for the process;
+    a failed one is retried once the model file appears or changes.
+    """
+    global _xgb_model, _xgb_booster, _iteration_range, _failed_mtime
 
     if _xgb_model is not None:
         return _xgb_model
+    mtime = _model_mtime()
+    if mtime == _failed_mtime:
+        # same file (or still no file) as the last failed attempt
+        return None
 
-    if not os.path.exists(MODEL_PATH):
+    if mtime is None:
         print(f"[ml_utils] WARNING: model file not found at {MODEL_PATH}. "
               f"Skipping imputation.")
-        _xgb_model = None
+        _failed_mtime = None
         return None
 
     try:
         _xgb_model = joblib.load(MODEL_PATH)
         print("[ml_utils] Loaded XGBoost model from", MODEL_PATH)
+        if hasattr(_xgb_model, "get_booster"):
+            # sklearn wrapper: keep its early-stopping cut-off, as .predict would
+            _xgb_booster = _xgb_model.get_booster()
+            try:
+                _iteration_range = (0, _xgb_model.best_iteration + 1)
+            except AttributeError:
+                pass
+        elif hasattr(_xgb_model, "inplace_predict"):
+            _xgb_booster = _xgb_model
+        if _xgb_booster is not None:
+            # configure prediction threads once here rather than per predict call
+            _xgb_booster.set_param({"nthread": os.cpu_count() or 1})
     except Exception as e:
         print("[ml_utils] ERROR loading model:", e)
         _xgb_model = None
+        _xgb_booster = None
+        _failed_mtime = mtime
 
     return _xgb_model
 
 
+def _predict(model, X: np.ndarray) -> np.ndarray:
+    """Booster.inplace_predict when available (no DMatrix built per call), else model.predict."""
+    if _xgb_booster is not None:
+        return _xgb_booster.inplace_predict(X, iteration_range=_iteration_range)
+    return model.predict(X)
+
+
 def impute_missing_values(df: pd.DataFrame) -> pd.DataFrame:
     """
     Fill missing CO2_per_kg using the XGBoost model.
@@ -46,11 +85,6 @@ def impute_missing_values(df: pd.DataFrame) -> pd.DataFrame:
     If model is not available, returns df unchanged.
     """
 
-    model = _load_model()
-    if model is None:
-        # no model available; do nothing
-        return df
-
     if "CO2_per_kg" not in df.columns:
         # nothing to do
         return df
@@ -63,21 +97,32 @@ def impute_missing_values(df: pd.DataFrame) -> pd.DataFrame:
         # "region_index",
     ]
 
+    # no features configured yet: nothing to predict from, don't touch the model file
+    if not feature_cols:
+        return df
+
     # If you haven't added those columns yet, just return df
     if not set(feature_cols).issubset(df.columns):
         print("[ml_utils] Feature columns missing; skipping imputation.")
         return df
 
-    mask = df["CO2_per_kg"].isna()
-    if not mask.any():
+    rows = np.flatnonzero(pd.isna(df["CO2_per_kg"].to_numpy()))
+    if rows.size == 0:
+        return df
+
+    # only now is the model needed
+    model = _load_model()
+    if model is None:
+        # no model available; do nothing
         return df
 
-    X = df.loc[mask, feature_cols].values
+    # XGBoost predicts in float32 anyway; hand it a contiguous float32 block
+    X = np.ascontiguousarray(df[feature_cols].iloc[rows].to_numpy(dtype=np.float32))
 
     try:
-        y_pred = model.predict(X)
-        df.loc[mask, "CO2_per_kg"] = y_pred
-        print(f"[ml_utils] Imputed {mask.sum()} missing CO2_per_kg values.")
+        y_pred = _predict(model, X)
+        df.iloc[rows, df.columns.get_loc("CO2_per_kg")] = y_pred
+        print(f"[ml_utils] Imputed {rows.size} missing CO2_per_kg values.")
     except Exception as e:
         print("[ml_utils] ERROR during prediction:", e)
 
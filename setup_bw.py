@@ -1,11 +1,18 @@
-import brightway2 as bw
-
 PROJECT_NAME = "metal_lca"
 
-bw.projects.set_current(PROJECT_NAME)
 
-if "biosphere3" not in bw.databases:
-    print("Running bw2setup() to install biosphere3 + LCIA methods...")
-    bw.bw2setup()
-else:
-    print("Project already initialised with biosphere3.")
+def main():
+    # imported here so importing this module doesn't pull in the brightway stack
+    import brightway2 as bw
+
+    bw.projects.set_current(PROJECT_NAME)
+
+    if "biosphere3" not in bw.databases:
+        print("Running bw2setup() to install biosphere3 + LCIA methods...")
+        bw.bw2setup()
+    else:
+        print("Project already initialised with biosphere3.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,201 +1,312 @@
 # steel_calculators.py
-from typing import Dict, Any
-from aluminium_constants import (  # reuse constants already in repo
-    KWH_TO_MJ, L_DIESEL_MJ, KG_COAL_MJ,
-    GRID_CO2_KG_PER_KWH, DIESEL_CO2_KG_PER_L,
-    COAL_CO2_KG_PER_KG, NG_CO2_KG_PER_MJ
-)
-
-# Default energy content (if not in aluminium_constants)
-EF_ENERGY_COAL_MJ_PER_KG = KG_COAL_MJ if 'KG_COAL_MJ' in globals() else 29.3
-EF_ENERGY_DIESEL_MJ_PER_L = L_DIESEL_MJ if 'L_DIESEL_MJ' in globals() else 38.6
+from typing import Dict, Any, NamedTuple
+import numpy as np
+# Energy contents and the diesel / coal / gas CO2 factors come from AL_CONSTANTS (steel
+# uses the aluminium figures), passed to the cores as an argument: Numba freezes globals
+# into its on-disk cache and only notices when this file changes, not when
+# aluminium_constants.py does.
+from aluminium_constants import AL_CONSTANTS
+from jit_utils import njit, prange, eager_signature
+from batch_utils import (batch_inputs, batch_size, batch_field, input_dtype,
+                         stage_section, stage_matrix, check_stage_matrix, field_alias)
 
 # Default emission factors (India / typical)
 EF_ELECTRICITY_CO2_INDIA = 0.82  # kg CO2 / kWh
-EF_DIESEL_CO2 = DIESEL_CO2_KG_PER_L if 'DIESEL_CO2_KG_PER_L' in globals() else 2.68
-EF_COAL_CO2 = COAL_CO2_KG_PER_KG if 'COAL_CO2_KG_PER_KG' in globals() else 2.42
-EF_GAS_CO2 = NG_CO2_KG_PER_MJ if 'NG_CO2_KG_PER_MJ' in globals() else 0.056
 
 # Other generic factors
-EF_NOX_PER_GJ = 0.15  # kg NOx / GJ -> convert to per MJ by /1000
+EF_NOX_PER_GJ = 0.15  # kg NOx / GJ
 EF_CH4_PER_GJ = 0.001  # kg CH4 / GJ
 EF_N2O_PER_GJ = 0.0001  # kg N2O / GJ
+EF_NOX_PER_MJ = EF_NOX_PER_GJ / 1000.0
+EF_CH4_PER_MJ = EF_CH4_PER_GJ / 1000.0
+EF_N2O_PER_MJ = EF_N2O_PER_GJ / 1000.0
 DUST_FACTOR_PER_ORE_KG = 0.0001  # kg PM per kg ore
+# default slag per kg ore by route (BF-BOF larger slag; EAF smaller)
+SLAG_FACTOR_BF_BOF = 0.25
+SLAG_FACTOR_EAF = 0.12
 PM2_5_FRACTION = 0.75
 
-
-def _sum_energy_mj_from_inputs(inputs: Dict[str, Any]) -> float:
+# GWP100 weights (kg CO2e / kg), IPCC AR4
+GWP_CH4 = 25.0
+GWP_N2O = 298.0
+
+
+# example argument used to build the eager-compilation signatures below
+_F = 0.0
+
+
+def _fuel_inputs(inputs: Dict[str, Any]):
+    """(electricity_kWh, fuel_diesel_L, fuel_coal_kg, fuel_naturalGas_MJ), each read once; missing = 0."""
+    get = inputs.get
+    return (float(get("electricity_kWh", 0.0)), float(get("fuel_diesel_L", 0.0)),
+            float(get("fuel_coal_kg", 0.0)), float(get("fuel_naturalGas_MJ", 0.0)))
+
+
+# Flat per-stage results returned by the numeric cores; the public calculators
+# turn these into the nested result dicts exactly once.
+class SteelMiningResult(NamedTuple):
+    yield_metal_t: float
+    total_material_input_kg: float
+    energy_MJ: float
+    water_m3: float
+    waste_solid_kg: float
+    co2_kg: float
+    ch4_kg: float
+    n2o_kg: float
+    nox_kg: float
+    particulates_kg: float
+    gwp_kgCO2e: float
+
+
+class SteelExtractionResult(NamedTuple):
+    yield_metal_t: float
+    total_material_input_kg: float
+    energy_MJ: float
+    waste_solid_kg: float
+    waste_hazardous_kg: float
+    co2_kg: float
+    ch4_kg: float
+    n2o_kg: float
+    nox_kg: float
+    particulates_kg: float
+    gwp_kgCO2e: float
+
+
+class SteelManufacturingResult(NamedTuple):
+    yield_metal_t: float
+    total_material_input_kg: float
+    energy_MJ: float
+    water_m3: float
+    co2_kg: float
+    nox_kg: float
+    particulates_kg: float
+    gwp_kgCO2e: float
+
+
+# -----------------------
+# Numeric cores (Numba-compiled when available). Positional floats in, result record out.
+# -----------------------
+
+
+@njit(eager_signature(1, AL_CONSTANTS, *(_F,) * 4), cache=True)
+def _energy_mj(C, electricity_kWh, diesel_L, coal_kg, gas_MJ):
     total = 0.0
-    if not inputs:
-        return 0.0
-    if "electricity_kWh" in inputs:
-        total += float(inputs.get("electricity_kWh", 0.0)) * KWH_TO_MJ
-    if "fuel_diesel_L" in inputs:
-        total += float(inputs.get("fuel_diesel_L", 0.0)) * \
-            EF_ENERGY_DIESEL_MJ_PER_L
-    if "fuel_coal_kg" in inputs:
-        total += float(inputs.get("fuel_coal_kg", 0.0)) * \
-            EF_ENERGY_COAL_MJ_PER_KG
-    if "fuel_naturalGas_MJ" in inputs:
-        total += float(inputs.get("fuel_naturalGas_MJ", 0.0))
+    total += electricity_kWh * C.KWH_TO_MJ
+    total += diesel_L * C.L_DIESEL_MJ
+    total += coal_kg * C.KG_COAL_MJ
+    total += gas_MJ
     return total
 
 
-def compute_steel_mining(inputs: Dict[str, Any]) -> Dict[str, Any]:
-    # mining inputs: ore_input_kg, ore_grade_percent, process_recovery, electricity_kWh, fuel_diesel_L, fuel_coal_kg, freshwater_m3, process_water_m3, land_area_m2, auxiliary_materials_kg
-    ore_input_kg = float(inputs.get("ore_input_kg", 0.0))
-    ore_grade_percent = float(inputs.get("ore_grade_percent", 0.0))
-    eta = float(inputs.get("process_recovery", 0.95))  # default yield
-    aux_kg = float(inputs.get("auxiliary_materials_kg", 0.0))
-
+@njit(eager_signature(SteelMiningResult, AL_CONSTANTS, *(_F,) * 10), cache=True)
+def _mining_core(C, ore_input_kg, ore_grade_percent, eta, aux_kg,
+                 electricity_kWh, diesel_L, coal_kg, gas_MJ,
+                 freshwater_m3, process_water_m3):
     MWF = ore_grade_percent / 100.0
     yield_metal_t = (ore_input_kg * MWF * eta) / 1000.0
 
     total_material_input_kg = ore_input_kg + aux_kg
-    energy_mj = _sum_energy_mj_from_inputs(inputs)
+    energy_mj = _energy_mj(C, electricity_kWh, diesel_L, coal_kg, gas_MJ)
 
-    freshwater_m3 = float(inputs.get("freshwater_m3", 0.0))
-    process_water_m3 = float(inputs.get("process_water_m3", 0.0))
     water_consumed_m3 = freshwater_m3 + process_water_m3
 
-    land_occupied_m2 = float(inputs.get("land_area_m2", 0.0))
-
     waste_solid_kg = ore_input_kg * (1 - MWF) * (1 - eta)
 
     # emissions
     emissions_co2 = 0.0
-    emissions_co2 += float(inputs.get("electricity_kWh",
-                           0.0)) * EF_ELECTRICITY_CO2_INDIA
-    emissions_co2 += float(inputs.get("fuel_diesel_L", 0.0)) * EF_DIESEL_CO2
-    emissions_co2 += float(inputs.get("fuel_coal_kg", 0.0)) * EF_COAL_CO2
-    emissions_ch4 = _sum_energy_mj_from_inputs(
-        inputs) * (EF_CH4_PER_GJ / 1000.0)
-    emissions_n2o = _sum_energy_mj_from_inputs(
-        inputs) * (EF_N2O_PER_GJ / 1000.0)
-    emissions_nox = _sum_energy_mj_from_inputs(
-        inputs) * (EF_NOX_PER_GJ / 1000.0)
-    particulates = ore_input_kg * DUST_FACTOR_PER_ORE_KG + \
-        float(inputs.get("fuel_diesel_L", 0.0)) * 0.0005
-
-    gwp = emissions_co2 + emissions_ch4 * 25.0 + emissions_n2o * 298.0
+    emissions_co2 += electricity_kWh * EF_ELECTRICITY_CO2_INDIA
+    emissions_co2 += diesel_L * C.DIESEL_CO2_KG_PER_L
+    emissions_co2 += coal_kg * C.COAL_CO2_KG_PER_KG
+    emissions_ch4 = energy_mj * EF_CH4_PER_MJ
+    emissions_n2o = energy_mj * EF_N2O_PER_MJ
+    emissions_nox = energy_mj * EF_NOX_PER_MJ
+    particulates = ore_input_kg * DUST_FACTOR_PER_ORE_KG + diesel_L * 0.0005
 
-    return {
-        "yield_metal_t": yield_metal_t,
-        "total_material_input_kg": total_material_input_kg,
-        "energy_MJ": energy_mj,
-        "water_m3": water_consumed_m3,
-        "land_occupied_m2": land_occupied_m2,
-        "waste_solid_kg": waste_solid_kg,
-        "emissions": {
-            "co2_kg": emissions_co2,
-            "ch4_kg": emissions_ch4,
-            "n2o_kg": emissions_n2o,
-            "nox_kg": emissions_nox,
-            "particulates_kg": particulates
-        },
-        "gwp_kgCO2e": gwp
-    }
+    gwp = emissions_co2 + emissions_ch4 * GWP_CH4 + emissions_n2o * GWP_N2O
 
+    return SteelMiningResult(yield_metal_t, total_material_input_kg, energy_mj,
+                             water_consumed_m3, waste_solid_kg, emissions_co2, emissions_ch4,
+                             emissions_n2o, emissions_nox, particulates, gwp)
 
-def compute_steel_extraction(inputs: Dict[str, Any], route: str = "primary") -> Dict[str, Any]:
-    # extraction / smelting inputs vary; default factors used
-    ore_input_kg = float(inputs.get("ore_input_kg", 0.0))
-    eta = float(inputs.get("reduction_efficiency",
-                inputs.get("process_recovery", 0.95)))
-    aux_kg = float(inputs.get("auxiliary_materials_kg", 0.0))
 
+@njit(eager_signature(SteelExtractionResult, AL_CONSTANTS, *(_F,) * 9), cache=True)
+def _extraction_core(C, ore_input_kg, eta, aux_kg, electricity_kWh, diesel_L, coal_kg,
+                     gas_MJ, slag_factor, process_co2_direct):
     # yield: extraction usually refers to metal produced from concentrate
     yield_metal_t = (ore_input_kg * eta) / 1000.0
 
     total_material_input_kg = ore_input_kg + aux_kg
-    energy_mj = _sum_energy_mj_from_inputs(inputs)
-
-    # choose slag factor by route (BF-BOF larger slag; EAF smaller)
-    if route and "eaf" in route:
-        slag_factor = float(inputs.get("slag_factor", 0.12))
-    else:
-        slag_factor = float(inputs.get("slag_factor", 0.25))
+    energy_mj = _energy_mj(C, electricity_kWh, diesel_L, coal_kg, gas_MJ)
 
     waste_solid_kg = ore_input_kg * slag_factor
     hazardous_kg = waste_solid_kg * 0.05
 
     # emissions
     emissions_co2 = 0.0
-    emissions_co2 += float(inputs.get("electricity_kWh",
-                           0.0)) * EF_ELECTRICITY_CO2_INDIA
-    emissions_co2 += float(inputs.get("fuel_coal_kg", 0.0)) * EF_COAL_CO2
-    emissions_co2 += float(inputs.get("fuel_naturalGas_MJ", 0.0)) * EF_GAS_CO2
-    # process CO2 (reduction + carbonate decomposition) - approximate
-    process_co2_direct = float(inputs.get("process_CO2_direct", ore_input_kg * 0.5 / 1000.0)) * \
-        1000.0 if inputs.get("process_CO2_direct") else ore_input_kg * 0.5
+    emissions_co2 += electricity_kWh * EF_ELECTRICITY_CO2_INDIA
+    emissions_co2 += coal_kg * C.COAL_CO2_KG_PER_KG
+    emissions_co2 += gas_MJ * C.NG_CO2_KG_PER_MJ
     emissions_co2 += process_co2_direct
 
-    total_fuel_mj = _sum_energy_mj_from_inputs(inputs)
-    emissions_ch4 = total_fuel_mj * (EF_CH4_PER_GJ / 1000.0)
-    emissions_n2o = total_fuel_mj * (EF_N2O_PER_GJ / 1000.0)
-    emissions_nox = total_fuel_mj * (EF_NOX_PER_GJ / 1000.0)
-    particulates = float(inputs.get("fuel_coal_kg", 0.0)) * \
-        0.002 + ore_input_kg * DUST_FACTOR_PER_ORE_KG
+    emissions_ch4 = energy_mj * EF_CH4_PER_MJ
+    emissions_n2o = energy_mj * EF_N2O_PER_MJ
+    emissions_nox = energy_mj * EF_NOX_PER_MJ
+    particulates = coal_kg * 0.002 + ore_input_kg * DUST_FACTOR_PER_ORE_KG
+
+    gwp = emissions_co2 + emissions_ch4 * GWP_CH4 + emissions_n2o * GWP_N2O
+
+    return SteelExtractionResult(yield_metal_t, total_material_input_kg, energy_mj,
+                                 waste_solid_kg, hazardous_kg, emissions_co2, emissions_ch4,
+                                 emissions_n2o, emissions_nox, particulates, gwp)
+
+
+@njit(eager_signature(SteelManufacturingResult, AL_CONSTANTS, *(_F,) * 9), cache=True)
+def _manufacturing_core(C, metal_input_kg, eta, aux_kg, electricity_kWh, diesel_L, coal_kg,
+                        gas_MJ, freshwater_m3, process_water_m3):
+    yield_metal_t = (metal_input_kg * eta) / 1000.0
+    total_material_input_kg = metal_input_kg + aux_kg
+    energy_mj = _energy_mj(C, electricity_kWh, diesel_L, coal_kg, gas_MJ)
+    water_consumed_m3 = freshwater_m3 + process_water_m3
+
+    emissions_co2 = 0.0
+    emissions_co2 += electricity_kWh * EF_ELECTRICITY_CO2_INDIA
+    emissions_co2 += gas_MJ * C.NG_CO2_KG_PER_MJ
+
+    emissions_nox = energy_mj * EF_NOX_PER_MJ
+    particulates = aux_kg * 0.001
+
+    return SteelManufacturingResult(yield_metal_t, total_material_input_kg, energy_mj,
+                                    water_consumed_m3, emissions_co2, emissions_nox,
+                                    particulates, emissions_co2)
+
+
+# -----------------------
+# Stage calculators
+# -----------------------
 
-    gwp = emissions_co2 + emissions_ch4 * 25.0 + emissions_n2o * 298.0
 
+def _mining_record(inputs: Dict[str, Any]) -> SteelMiningResult:
+    # mining inputs: ore_input_kg, ore_grade_percent, process_recovery, electricity_kWh, fuel_diesel_L, fuel_coal_kg, freshwater_m3, process_water_m3, land_area_m2, auxiliary_materials_kg
+    get = inputs.get
+    return _mining_core(
+        AL_CONSTANTS,
+        float(get("ore_input_kg", 0.0)),
+        float(get("ore_grade_percent", 0.0)),
+        float(get("process_recovery", 0.95)),  # default yield
+        float(get("auxiliary_materials_kg", 0.0)),
+        *_fuel_inputs(inputs),
+        float(get("freshwater_m3", 0.0)),
+        float(get("process_water_m3", 0.0)))
+
+
+def _mining_dict(r: SteelMiningResult, inputs: Dict[str, Any]) -> Dict[str, Any]:
     return {
-        "yield_metal_t": yield_metal_t,
-        "total_material_input_kg": total_material_input_kg,
-        "energy_MJ": energy_mj,
-        "waste_solid_kg": waste_solid_kg,
-        "waste_hazardous_kg": hazardous_kg,
+        "yield_metal_t": r.yield_metal_t,
+        "total_material_input_kg": r.total_material_input_kg,
+        "energy_MJ": r.energy_MJ,
+        "water_m3": r.water_m3,
+        "land_occupied_m2": float(inputs.get("land_area_m2", 0.0)),
+        "waste_solid_kg": r.waste_solid_kg,
         "emissions": {
-            "co2_kg": emissions_co2,
-            "ch4_kg": emissions_ch4,
-            "n2o_kg": emissions_n2o,
-            "nox_kg": emissions_nox,
-            "particulates_kg": particulates
+            "co2_kg": r.co2_kg,
+            "ch4_kg": r.ch4_kg,
+            "n2o_kg": r.n2o_kg,
+            "nox_kg": r.nox_kg,
+            "particulates_kg": r.particulates_kg
         },
-        "gwp_kgCO2e": gwp
+        "gwp_kgCO2e": r.gwp_kgCO2e
     }
 
 
-def compute_steel_manufacturing(inputs: Dict[str, Any]) -> Dict[str, Any]:
-    metal_input_kg = float(inputs.get(
-        "metal_input_kg", inputs.get("ore_input_kg", 0.0)))
-    eta = float(inputs.get("process_yield", 0.98))
-    yield_metal_t = (metal_input_kg * eta) / 1000.0
-    total_material_input_kg = metal_input_kg + \
-        float(inputs.get("auxiliary_materials_kg", 0.0))
-    energy_mj = _sum_energy_mj_from_inputs(inputs)
-    freshwater_m3 = float(inputs.get("freshwater_m3", 0.0))
-    process_water_m3 = float(inputs.get("process_water_m3", 0.0))
-    water_consumed_m3 = freshwater_m3 + process_water_m3
-    waste_solid_kg = float(inputs.get("scrap_kg", 0.0)
-                           ) if "scrap_kg" in inputs else 0.0
+def _default_slag_factor(route: str) -> float:
+    """Slag factor for a route string ('eaf' anywhere in it means an EAF route)."""
+    return SLAG_FACTOR_EAF if route and "eaf" in route else SLAG_FACTOR_BF_BOF
 
-    emissions_co2 = 0.0
-    emissions_co2 += float(inputs.get("electricity_kWh",
-                           0.0)) * EF_ELECTRICITY_CO2_INDIA
-    emissions_co2 += float(inputs.get("fuel_naturalGas_MJ", 0.0)) * EF_GAS_CO2
 
-    total_fuel_mj = _sum_energy_mj_from_inputs(inputs)
-    emissions_nox = total_fuel_mj * (EF_NOX_PER_GJ / 1000.0)
-    particulates = float(inputs.get("auxiliary_materials_kg", 0.0)) * 0.001
+def _extraction_record(inputs: Dict[str, Any], default_slag: float) -> SteelExtractionResult:
+    # extraction / smelting inputs vary; default factors used
+    get = inputs.get
+    ore_input_kg = float(get("ore_input_kg", 0.0))
+    eta = float(get("reduction_efficiency", get("process_recovery", 0.95)))
+    aux_kg = float(get("auxiliary_materials_kg", 0.0))
+    fuels = _fuel_inputs(inputs)
+    slag_factor = float(get("slag_factor", default_slag))
+
+    # process CO2 (reduction + carbonate decomposition) - approximate; process_CO2_direct
+    # is given in t, unset / 0 falls back to 0.5 kg per kg ore
+    process_co2_t = get("process_CO2_direct")
+    process_co2_direct = float(process_co2_t) * 1000.0 if process_co2_t else ore_input_kg * 0.5
+
+    return _extraction_core(AL_CONSTANTS, ore_input_kg, eta, aux_kg, *fuels, slag_factor,
+                            process_co2_direct)
 
-    gwp = emissions_co2
 
+def _extraction_dict(r: SteelExtractionResult) -> Dict[str, Any]:
     return {
-        "yield_metal_t": yield_metal_t,
-        "total_material_input_kg": total_material_input_kg,
-        "energy_MJ": energy_mj,
-        "water_m3": water_consumed_m3,
-        "waste_solid_kg": waste_solid_kg,
+        "yield_metal_t": r.yield_metal_t,
+        "total_material_input_kg": r.total_material_input_kg,
+        "energy_MJ": r.energy_MJ,
+        "waste_solid_kg": r.waste_solid_kg,
+        "waste_hazardous_kg": r.waste_hazardous_kg,
         "emissions": {
-            "co2_kg": emissions_co2,
-            "nox_kg": emissions_nox,
-            "particulates_kg": particulates
+            "co2_kg": r.co2_kg,
+            "ch4_kg": r.ch4_kg,
+            "n2o_kg": r.n2o_kg,
+            "nox_kg": r.nox_kg,
+            "particulates_kg": r.particulates_kg
         },
-        "gwp_kgCO2e": gwp
+        "gwp_kgCO2e": r.gwp_kgCO2e
     }
 
 
+def _manufacturing_record(inputs: Dict[str, Any]) -> SteelManufacturingResult:
+    get = inputs.get
+    return _manufacturing_core(
+        AL_CONSTANTS,
+        float(get("metal_input_kg", get("ore_input_kg", 0.0))),
+        float(get("process_yield", 0.98)),
+        float(get("auxiliary_materials_kg", 0.0)),
+        *_fuel_inputs(inputs),
+        float(get("freshwater_m3", 0.0)),
+        float(get("process_water_m3", 0.0)))
+
+
+def _manufacturing_dict(r: SteelManufacturingResult, inputs: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "yield_metal_t": r.yield_metal_t,
+        "total_material_input_kg": r.total_material_input_kg,
+        "energy_MJ": r.energy_MJ,
+        "water_m3": r.water_m3,
+        "waste_solid_kg": float(inputs.get("scrap_kg", 0.0)),
+        "emissions": {
+            "co2_kg": r.co2_kg,
+            "nox_kg": r.nox_kg,
+            "particulates_kg": r.particulates_kg
+        },
+        "gwp_kgCO2e": r.gwp_kgCO2e
+    }
+
+
+def compute_steel_mining(inputs: Dict[str, Any]) -> Dict[str, Any]:
+    return _mining_dict(_mining_record(inputs), inputs)
+
+
+def compute_steel_extraction(inputs: Dict[str, Any], route: str = "primary") -> Dict[str, Any]:
+    return _extraction_dict(_extraction_record(inputs, _default_slag_factor(route)))
+
+
+def compute_steel_manufacturing(inputs: Dict[str, Any]) -> Dict[str, Any]:
+    return _manufacturing_dict(_manufacturing_record(inputs), inputs)
+
+
+def warm_up() -> None:
+    """Touch each numeric core once so the API can do it before serving traffic."""
+    _mining_core(AL_CONSTANTS, *(_F,) * 10)
+    _extraction_core(AL_CONSTANTS, *(_F,) * 9)
+    _manufacturing_core(AL_CONSTANTS, *(_F,) * 9)
+    compute_combined_lca_steel_batch({"inputs": {}})
+
+
 def compute_combined_lca_steel(payload: Dict[str, Any]) -> Dict[str, Any]:
     """
     payload: same top-level keys as other calculators: projectId, scenarioId, route, functionalUnit_kg, recycling_rate, inputs: { mining, extraction, manufacturing }
@@ -206,24 +317,35 @@ def compute_combined_lca_steel(payload: Dict[str, Any]) -> Dict[str, Any]:
     extraction_inputs = inputs.get("extraction", {}) or {}
     manufacturing_inputs = inputs.get("manufacturing", {}) or {}
 
-    route = (payload.get("route") or "").lower()
-
-    mining_res = compute_steel_mining(mining_inputs) if mining_inputs else {}
-    extraction_res = compute_steel_extraction(
-        extraction_inputs, route=route) if extraction_inputs else {}
-    manufacturing_res = compute_steel_manufacturing(
-        manufacturing_inputs) if manufacturing_inputs else {}
-
-    # totals
+    # the route only picks the default slag factor: resolve it once per payload
+    default_slag = _default_slag_factor((payload.get("route") or "").lower())
+
+    # stage records for the arithmetic below; the nested dicts are only for the response
+    mining = extraction = manufacturing = None
+    mining_res = extraction_res = manufacturing_res = {}
+    if mining_inputs:
+        mining = _mining_record(mining_inputs)
+        mining_res = _mining_dict(mining, mining_inputs)
+    if extraction_inputs:
+        extraction = _extraction_record(extraction_inputs, default_slag)
+        extraction_res = _extraction_dict(extraction)
+    if manufacturing_inputs:
+        manufacturing = _manufacturing_record(manufacturing_inputs)
+        manufacturing_res = _manufacturing_dict(manufacturing, manufacturing_inputs)
+
+    # totals (extraction has no water term)
     total_gwp = 0.0
     total_energy = 0.0
     total_water = 0.0
-    for r in (mining_res, extraction_res, manufacturing_res):
-        if not r:
+    for r in (mining, extraction, manufacturing):
+        if r is None:
             continue
-        total_gwp += float(r.get("gwp_kgCO2e", 0.0) or 0.0)
-        total_energy += float(r.get("energy_MJ", 0.0) or 0.0)
-        total_water += float(r.get("water_m3", 0.0) or 0.0)
+        total_gwp += r.gwp_kgCO2e
+        total_energy += r.energy_MJ
+    if mining is not None:
+        total_water += mining.water_m3
+    if manufacturing is not None:
+        total_water += manufacturing.water_m3
 
     recycling_rate = float(payload.get("recycling_rate", 0.0))
     primary_route_gwp = float(payload.get(
@@ -232,10 +354,8 @@ def compute_combined_lca_steel(payload: Dict[str, Any]) -> Dict[str, Any]:
 
     # simple LCIA results
     global_warming = total_gwp
-    acidification = ((extraction_res.get("emissions", {}).get(
-        "co2_kg", 0.0) if extraction_res else 0.0) * 0.0) + 0.0
-    eutroph = (extraction_res.get("emissions", {}).get(
-        "nox_kg", 0.0) if extraction_res else 0.0) * 0.1
+    acidification = ((extraction.co2_kg if extraction is not None else 0.0) * 0.0) + 0.0
+    eutroph = (extraction.nox_kg if extraction is not None else 0.0) * 0.1
     water_depletion = total_water
     resource_depletion = float(mining_inputs.get("ore_input_kg", 0.0))
 
@@ -245,7 +365,7 @@ def compute_combined_lca_steel(payload: Dict[str, Any]) -> Dict[str, Any]:
         "eutrophication_kg_po4e": eutroph,
         "water_depletion_m3": water_depletion,
         "resource_depletion_kg_resource_eq": resource_depletion,
-        "particulate_matter_kg_pm2_5_eq": (mining_res.get("emissions", {}).get("particulates_kg", 0.0) if mining_res else 0.0) * PM2_5_FRACTION
+        "particulate_matter_kg_pm2_5_eq": (mining.particulates_kg if mining is not None else 0.0) * PM2_5_FRACTION
     }
 
     return {
@@ -271,3 +391,106 @@ def compute_combined_lca_steel(payload: Dict[str, Any]) -> Dict[str, Any]:
         },
         "lcia_results": lcia
     }
+
+
+# -----------------------
+# Parallel combined batch: per-scenario totals for Monte Carlo / sensitivity sweeps
+# -----------------------
+BATCH_COLUMNS = (
+    "gwp_kgCO2e", "energy_MJ", "water_m3",
+    "mining_gwp_kgCO2e", "extraction_gwp_kgCO2e", "manufacturing_gwp_kgCO2e",
+)
+
+# Input fields (and defaults) in the positional order each core expects; except
+# process_CO2_direct, which is given in t (0 = the 0.5 kg per kg ore default)
+_MINING_FIELDS = (
+    ("ore_input_kg", 0.0), ("ore_grade_percent", 0.0), ("process_recovery", 0.95),
+    ("auxiliary_materials_kg", 0.0), ("electricity_kWh", 0.0), ("fuel_diesel_L", 0.0),
+    ("fuel_coal_kg", 0.0), ("fuel_naturalGas_MJ", 0.0), ("freshwater_m3", 0.0),
+    ("process_water_m3", 0.0),
+)
+_EXTRACTION_FIELDS = (
+    ("ore_input_kg", 0.0), ("reduction_efficiency", 0.95), ("auxiliary_materials_kg", 0.0),
+    ("electricity_kWh", 0.0), ("fuel_diesel_L", 0.0), ("fuel_coal_kg", 0.0),
+    ("fuel_naturalGas_MJ", 0.0), ("slag_factor", SLAG_FACTOR_BF_BOF),
+    ("process_CO2_direct", 0.0),
+)
+# EAF routes default to the smaller slag factor, as in compute_steel_extraction
+_EAF_EXTRACTION_FIELDS = tuple(
+    (key, SLAG_FACTOR_EAF if key == "slag_factor" else default)
+    for key, default in _EXTRACTION_FIELDS)
+_MANUFACTURING_FIELDS = (
+    ("metal_input_kg", 0.0), ("process_yield", 0.98), ("auxiliary_materials_kg", 0.0),
+    ("electricity_kWh", 0.0), ("fuel_diesel_L", 0.0), ("fuel_coal_kg", 0.0),
+    ("fuel_naturalGas_MJ", 0.0), ("freshwater_m3", 0.0), ("process_water_m3", 0.0),
+)
+
+MINING_INPUT_DTYPE = input_dtype(_MINING_FIELDS)
+EXTRACTION_INPUT_DTYPE = input_dtype(_EXTRACTION_FIELDS)
+MANUFACTURING_INPUT_DTYPE = input_dtype(_MANUFACTURING_FIELDS)
+
+
+@njit(parallel=True, nogil=True, cache=True)
+def _run_batch(C, mining, extraction, manufacturing, out):
+    """Fill out[:, i] (rows as BATCH_COLUMNS) for every scenario i, in parallel."""
+    for i in prange(out.shape[1]):
+        m = mining[i]
+        e = extraction[i]
+        f = manufacturing[i]
+        process_co2_direct = e[8] * 1000.0 if e[8] != 0.0 else e[0] * 0.5
+        mining_res = _mining_core(C, m[0], m[1], m[2], m[3], m[4], m[5], m[6], m[7], m[8],
+                                  m[9])
+        extraction_res = _extraction_core(C, e[0], e[1], e[2], e[3], e[4], e[5], e[6], e[7],
+                                          process_co2_direct)
+        manufacturing_res = _manufacturing_core(C, f[0], f[1], f[2], f[3], f[4], f[5], f[6],
+                                                f[7], f[8])
+        out[0, i] = mining_res.gwp_kgCO2e + extraction_res.gwp_kgCO2e + \
+            manufacturing_res.gwp_kgCO2e
+        out[1, i] = mining_res.energy_MJ + extraction_res.energy_MJ + \
+            manufacturing_res.energy_MJ
+        out[2, i] = mining_res.water_m3 + manufacturing_res.water_m3
+        out[3, i] = mining_res.gwp_kgCO2e
+        out[4, i] = extraction_res.gwp_kgCO2e
+        out[5, i] = manufacturing_res.gwp_kgCO2e
+
+
+def compute_combined_lca_steel_batch(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Batch version of compute_combined_lca_steel, same payload conventions as the
+    aluminium batch: each stage field is an array (or list) with one value per
+    scenario, scalars broadcast, and a section may be a structured array such as
+    MINING_INPUT_DTYPE. route is one string for the whole batch.
+    Returns {"n_scenarios": n, "results": {column: array}} with BATCH_COLUMNS plus
+    avoided_primary_co2e_kg.
+    Raises ValueError if a section is not an object or any input is non-numeric,
+    NaN, infinite or negative.
+    """
+    inputs = batch_inputs(payload)
+    mining_inputs = stage_section(inputs, "mining")
+    extraction_inputs = field_alias(
+        stage_section(inputs, "extraction"), "reduction_efficiency", "process_recovery")
+    manufacturing_inputs = field_alias(
+        stage_section(inputs, "manufacturing"), "metal_input_kg", "ore_input_kg")
+    route = (payload.get("route") or "").lower()
+    extraction_fields = _EAF_EXTRACTION_FIELDS if "eaf" in route else _EXTRACTION_FIELDS
+
+    n = max(batch_size(mining_inputs), batch_size(extraction_inputs),
+            batch_size(manufacturing_inputs))
+    # one contiguous row per output column
+    out = np.empty((len(BATCH_COLUMNS), n), dtype=np.float64)
+    _run_batch(AL_CONSTANTS,
+               check_stage_matrix(stage_matrix(mining_inputs, _MINING_FIELDS, n),
+                                  _MINING_FIELDS, "mining"),
+               check_stage_matrix(stage_matrix(extraction_inputs, extraction_fields, n),
+                                  extraction_fields, "extraction"),
+               check_stage_matrix(stage_matrix(manufacturing_inputs, _MANUFACTURING_FIELDS, n),
+                                  _MANUFACTURING_FIELDS, "manufacturing"),
+               out)
+
+    results = {name: out[j] for j, name in enumerate(BATCH_COLUMNS)}
+    recycling_rate = batch_field(payload, "recycling_rate", 0.0, n)
+    primary_route_gwp = batch_field(
+        payload, "primary_route_gwp_kgCO2e", 0.0, n) if "primary_route_gwp_kgCO2e" in payload \
+        else results["gwp_kgCO2e"]
+    results["avoided_primary_co2e_kg"] = recycling_rate * primary_route_gwp
+    return {"n_scenarios": n, "results": results}
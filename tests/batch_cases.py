@@ -0,0 +1,58 @@
+import random
+
+import numpy as np
+
+STAGES = ("mining", "extraction", "manufacturing")
+
+
+def stage_fields(module):
+    return {"mining": module._MINING_FIELDS, "extraction": module._EXTRACTION_FIELDS,
+            "manufacturing": module._MANUFACTURING_FIELDS}
+
+
+def scenarios(module, n, seed=0):
+    """n scalar payloads with every core field set to a positive value."""
+    rng = random.Random(seed)
+    fields = stage_fields(module)
+    return [{
+        "recycling_rate": rng.uniform(0.0, 1.0),
+        "inputs": {stage: {key: rng.uniform(0.01, 1000.0) for key, _ in fields[stage]}
+                   for stage in STAGES},
+    } for _ in range(n)]
+
+
+def as_batch(scenarios):
+    """The scalar payloads as one batch payload, one list entry per scenario."""
+    return {
+        "recycling_rate": [p["recycling_rate"] for p in scenarios],
+        "inputs": {stage: {key: [p["inputs"][stage][key] for p in scenarios]
+                           for key in scenarios[0]["inputs"][stage]}
+                   for stage in STAGES},
+    }
+
+
+def check_batch_matches_scalar(module, scalar_fn, batch_fn, n=50):
+    cases = scenarios(module, n)
+    result = batch_fn(as_batch(cases))
+    assert result["n_scenarios"] == n
+    columns = result["results"]
+    for i, payload in enumerate(cases):
+        scalar = scalar_fn(payload)
+        assert columns["gwp_kgCO2e"][i] == scalar["totals"]["gwp_kgCO2e"]
+        assert columns["energy_MJ"][i] == scalar["totals"]["energy_MJ"]
+        assert columns["water_m3"][i] == scalar["totals"]["water_m3"]
+        for stage in STAGES:
+            assert columns[f"{stage}_gwp_kgCO2e"][i] == \
+                scalar["breakdown"][stage]["gwp_kgCO2e"]
+        assert columns["avoided_primary_co2e_kg"][i] == \
+            scalar["circularity"]["avoided_primary_co2e_kg"]
+
+
+def check_structured_array_section(module, batch_fn):
+    payload = as_batch(scenarios(module, 5, seed=1))
+    records = np.zeros(5, dtype=module.MINING_INPUT_DTYPE)
+    for key in records.dtype.names:
+        records[key] = payload["inputs"]["mining"][key]
+    expected = batch_fn(payload)["results"]["mining_gwp_kgCO2e"]
+    payload["inputs"]["mining"] = records
+    np.testing.assert_array_equal(batch_fn(payload)["results"]["mining_gwp_kgCO2e"], expected)
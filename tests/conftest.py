@@ -0,0 +1,8 @@
+import os
+import sys
+
+# same threading-layer preference as the api_service launcher: the API tests run the
+# parallel batch kernels from TestClient's worker threads
+os.environ.setdefault("NUMBA_THREADING_LAYER_PRIORITY", "omp tbb workqueue")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,28 @@
+import aluminium_calculators as al
+from batch_cases import (STAGES, as_batch, check_batch_matches_scalar,
+                         check_structured_array_section, scenarios)
+
+
+def test_batch_matches_scalar():
+    check_batch_matches_scalar(al, al.compute_combined_lca, al.compute_combined_lca_batch)
+
+
+def test_batch_structured_array_section():
+    check_structured_array_section(al, al.compute_combined_lca_batch)
+
+
+def test_stage_batches_match_scalar():
+    scalar_fns = {"mining": al.compute_mining, "extraction": al.compute_extraction,
+                  "manufacturing": al.compute_manufacturing}
+    batch_fns = {"mining": al.compute_mining_batch, "extraction": al.compute_extraction_batch,
+                 "manufacturing": al.compute_manufacturing_batch}
+    cases = scenarios(al, 20, seed=2)
+    batch = as_batch(cases)
+    for stage in STAGES:
+        result = batch_fns[stage](batch["inputs"][stage])
+        for i, payload in enumerate(cases):
+            scalar = scalar_fns[stage](payload["inputs"][stage])
+            assert result["gwp_kgCO2e"][i] == scalar["gwp_kgCO2e"]
+            assert result["energy_MJ"][i] == scalar["energy_MJ"]
+            for key, value in scalar["emissions"].items():
+                assert result["emissions"][key][i] == value
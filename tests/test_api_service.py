@@ -0,0 +1,146 @@
+import json
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+
+import aluminium_constants
+import api_service
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+METALS = ["aluminium", "copper", "steel", "tin"]
+
+
+def _payload(name):
+    with open(os.path.join(ROOT, name)) as f:
+        return json.load(f)
+
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(api_service.app) as c:
+        yield c
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    api_service.clear_lca_cache()
+    yield
+    api_service.clear_lca_cache()
+
+
+@pytest.mark.parametrize("metal", METALS)
+def test_batch_endpoint_negative_400(client, metal):
+    r = client.post(f"/{metal}/run_batch", json={
+        "inputs": {"mining": {"ore_input_kg": [1.0, -1.0]}}})
+    assert r.status_code == 400
+    assert "mining.ore_input_kg" in r.json()["detail"]
+
+
+@pytest.mark.parametrize("metal", METALS)
+def test_batch_endpoint_nan_400(client, metal):
+    # NaN isn't JSON; the body parser rejects the literal before the batch checks run
+    r = client.post(f"/{metal}/run_batch",
+                    content=b'{"inputs": {"mining": {"ore_input_kg": [1.0, NaN]}}}',
+                    headers={"Content-Type": "application/json"})
+    assert r.status_code == 400
+
+
+@pytest.mark.parametrize("body", [
+    {"inputs": {"mining": {"ore_input_kg": [1.0, 2.0, 3.0], "electricity_kWh": [1.0, 2.0]}}},
+    {"inputs": {"mining": {"ore_input_kg": {"a": 1.0}}}},
+    {"inputs": {"mining": [1.0, 2.0]}},
+    {"inputs": [1.0]},
+    {"recycling_rate": None, "inputs": {"mining": {"ore_input_kg": [1.0]}}},
+], ids=["ragged", "dict-value", "list-section", "list-inputs", "null-recycling"])
+@pytest.mark.parametrize("metal", METALS)
+def test_batch_endpoint_malformed_400(client, metal, body):
+    r = client.post(f"/{metal}/run_batch", json=body)
+    assert r.status_code == 400
+    assert r.json()["detail"].startswith("Invalid batch inputs")
+
+
+@pytest.mark.parametrize("metal", METALS)
+def test_batch_endpoint_ok(client, metal):
+    r = client.post(f"/{metal}/run_batch", json={
+        "inputs": {"mining": {"ore_input_kg": [1.0, 2.0], "electricity_kWh": 3.0}}})
+    assert r.status_code == 200
+    assert r.json()["n_scenarios"] == 2
+    assert len(r.json()["results"]["gwp_kgCO2e"]) == 2
+
+
+def test_cache_miss_then_hit(client):
+    payload = _payload("test_payload.json")
+    first = client.post("/aluminium/run", json=payload)
+    assert len(api_service._lca_cache) == 1
+    # same payload with the keys in another order is the same entry
+    second = client.post("/aluminium/run", json=dict(reversed(list(payload.items()))))
+    assert len(api_service._lca_cache) == 1
+    assert first.content == second.content
+    client.post("/aluminium/run", json=dict(payload, recycling_rate=0.5))
+    assert len(api_service._lca_cache) == 2
+
+
+def test_cache_steel_route(client):
+    payload = _payload("test_payload_steel.json")
+    first = client.post("/steel/run", json=payload)
+    second = client.post("/steel/run", json=payload)
+    assert first.content == second.content
+    assert len(api_service._lca_cache) == 1
+
+
+def test_cache_shared_with_metal_route(client):
+    payload = dict(_payload("test_payload_tin.json"), metal="tin")
+    direct = client.post("/tin/run", json=payload)
+    dispatched = client.post("/metal/run", json=payload)
+    assert direct.content == dispatched.content
+    assert len(api_service._lca_cache) == 1
+
+
+def test_cache_keyed_by_calculator(client):
+    client.post("/copper/run", json=_payload("test_payload_copper.json"))
+    client.post("/lithium/run", json=_payload("test_payload_lithium.json"))
+    assert {key[0] for key in api_service._lca_cache} == {
+        api_service.compute_combined_lca_copper, api_service.compute_combined_lca_lithium}
+
+
+def test_cache_skips_large_payloads(client):
+    payload = dict(_payload("test_payload.json"),
+                   notes="x" * (api_service._LCA_CACHE_MAX_PAYLOAD_BYTES + 1))
+    r = client.post("/aluminium/run", json=payload)
+    assert r.status_code == 200
+    assert len(api_service._lca_cache) == 0
+
+
+def test_cache_cleared_on_constants_reload(client, monkeypatch):
+    client.post("/aluminium/run", json=_payload("test_payload.json"))
+    assert len(api_service._lca_cache) == 1
+    # importlib.reload(aluminium_constants) rebinds AL_CONSTANTS
+    monkeypatch.setattr(aluminium_constants, "AL_CONSTANTS",
+                        aluminium_constants.AL_CONSTANTS._replace())
+    payload = dict(_payload("test_payload.json"), recycling_rate=0.5)
+    client.post("/aluminium/run", json=payload)
+    assert len(api_service._lca_cache) == 1
+
+
+def test_cache_key_holds_digest_not_payload(client):
+    client.post("/aluminium/run", json=_payload("test_payload.json"))
+    (key,) = api_service._lca_cache
+    calc_fn, version, digest = key
+    assert calc_fn is api_service.compute_combined_lca_aluminium
+    assert version == api_service._constants_version
+    assert isinstance(digest, bytes) and len(digest) == 16
+
+
+@pytest.mark.parametrize("iso", [5, {"FR": 1}, ["FR", 5]])
+def test_copper_batch_bad_country_iso_400(client, iso):
+    r = client.post("/copper/run_batch", json={
+        "country_iso": iso, "inputs": {"mining": {"ore_input_kg": [1.0, 2.0]}}})
+    assert r.status_code == 400
+    assert "country_iso" in r.json()["detail"]
+
+
+@pytest.mark.parametrize("iso", [["FR"], {"FR": 1}])
+def test_copper_run_non_string_country_iso_200(client, iso):
+    payload = dict(_payload("test_payload_copper.json"), country_iso=iso)
+    assert client.post("/copper/run", json=payload).status_code == 200
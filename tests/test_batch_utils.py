@@ -0,0 +1,57 @@
+import pytest
+
+import aluminium_calculators
+import copper_calculators
+import steel_calculators
+import tin_calculators
+
+BATCH_FNS = [
+    aluminium_calculators.compute_combined_lca_batch,
+    copper_calculators.compute_combined_lca_copper_batch,
+    steel_calculators.compute_combined_lca_steel_batch,
+    tin_calculators.compute_combined_lca_tin_batch,
+]
+IDS = ["aluminium", "copper", "steel", "tin"]
+
+
+@pytest.mark.parametrize("bad", [float("nan"), float("inf"), -1.0], ids=["nan", "inf", "neg"])
+@pytest.mark.parametrize("batch_fn", BATCH_FNS, ids=IDS)
+def test_batch_rejects_bad_values(batch_fn, bad):
+    payload = {"inputs": {"mining": {"ore_input_kg": [1.0, bad, 3.0]}}}
+    with pytest.raises(ValueError, match="mining.ore_input_kg"):
+        batch_fn(payload)
+
+
+@pytest.mark.parametrize("batch_fn", BATCH_FNS, ids=IDS)
+def test_batch_rejects_ragged_columns(batch_fn):
+    payload = {"inputs": {"mining": {"ore_input_kg": [1.0, 2.0, 3.0],
+                                     "electricity_kWh": [1.0, 2.0]}}}
+    with pytest.raises(ValueError):
+        batch_fn(payload)
+
+
+@pytest.mark.parametrize("value", [{"a": 1.0}, "abc", [1.0, "abc"], [[1.0], [2.0]]],
+                         ids=["dict", "str", "str-item", "nested"])
+@pytest.mark.parametrize("batch_fn", BATCH_FNS, ids=IDS)
+def test_batch_rejects_non_numeric_values(batch_fn, value):
+    payload = {"inputs": {"mining": {"ore_input_kg": value}}}
+    with pytest.raises(ValueError, match="ore_input_kg"):
+        batch_fn(payload)
+
+
+@pytest.mark.parametrize("batch_fn", BATCH_FNS, ids=IDS)
+def test_batch_rejects_malformed_sections(batch_fn):
+    with pytest.raises(ValueError, match="mining"):
+        batch_fn({"inputs": {"mining": [1.0, 2.0]}})
+    with pytest.raises(ValueError, match="inputs"):
+        batch_fn({"inputs": [1.0]})
+
+
+@pytest.mark.parametrize("key", ["recycling_rate", "primary_route_gwp_kgCO2e"])
+@pytest.mark.parametrize("bad", [None, [0.5, None], -0.5, float("inf"), {"a": 1.0}],
+                         ids=["null", "null-item", "neg", "inf", "dict"])
+@pytest.mark.parametrize("batch_fn", BATCH_FNS, ids=IDS)
+def test_batch_rejects_bad_payload_columns(batch_fn, key, bad):
+    payload = {key: bad, "inputs": {"mining": {"ore_input_kg": [1.0, 2.0]}}}
+    with pytest.raises(ValueError, match=key):
+        batch_fn(payload)
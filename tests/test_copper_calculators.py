@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+
+import copper_calculators as cu
+from batch_cases import check_batch_matches_scalar, check_structured_array_section
+
+
+def test_batch_matches_scalar():
+    check_batch_matches_scalar(cu, cu.compute_combined_lca_copper,
+                               cu.compute_combined_lca_copper_batch)
+
+
+def test_batch_structured_array_section():
+    check_structured_array_section(cu, cu.compute_combined_lca_copper_batch)
+
+
+INPUTS = {
+    "mining": {"ore_input_kg": 1000.0, "ore_grade_percent": 1.0, "electricity_kWh": 500.0},
+    "extraction": {"ore_input_kg": 100.0, "electricity_kWh": 2000.0},
+    "manufacturing": {"metal_input_kg": 10.0, "electricity_kWh": 300.0},
+}
+
+
+def _gwp(**payload):
+    return cu.compute_combined_lca_copper(dict(payload, inputs=INPUTS))["totals"]["gwp_kgCO2e"]
+
+
+def _with_grid(factor):
+    inputs = {stage: dict(section, grid_co2_factor=factor) for stage, section in INPUTS.items()}
+    return cu.compute_combined_lca_copper({"inputs": inputs})["totals"]["gwp_kgCO2e"]
+
+
+def _batch(n, **payload):
+    inputs = {stage: {key: [value] * n for key, value in section.items()}
+              for stage, section in INPUTS.items()}
+    return cu.compute_combined_lca_copper_batch(dict(payload, inputs=inputs))
+
+
+def test_country_iso_picks_regional_grid():
+    assert _gwp(country_iso="FR") == _with_grid(cu.GRID_CO2_KG_PER_KWH_BY_ISO["FR"])
+    assert _gwp(country_iso="IN") == _with_grid(cu.GRID_CO2_KG_PER_KWH_INDIA)
+
+
+def test_country_iso_ignores_case_and_whitespace():
+    assert _gwp(country_iso="fr") == _gwp(country_iso="FR")
+    assert _gwp(country_iso=" In ") == _gwp(country_iso="IN")
+
+
+def test_country_iso_falls_back_to_global_grid():
+    expected = _with_grid(cu.GRID_CO2_KG_PER_KWH_GLOBAL)
+    assert _gwp() == expected
+    assert _gwp(country_iso="ZZ") == expected
+    assert _gwp(country_iso=None) == expected
+
+
+@pytest.mark.parametrize("iso", [["FR"], {"FR": 1}, 5])
+def test_country_iso_non_string_gets_global_grid(iso):
+    assert _gwp(country_iso=iso) == _with_grid(cu.GRID_CO2_KG_PER_KWH_GLOBAL)
+
+
+def test_stage_grid_factor_overrides_country_iso():
+    inputs = {stage: dict(section, grid_co2_factor=0.3) for stage, section in INPUTS.items()}
+    result = cu.compute_combined_lca_copper({"country_iso": "FR", "inputs": inputs})
+    assert result["totals"]["gwp_kgCO2e"] == _with_grid(0.3)
+
+
+def test_batch_country_iso_per_scenario():
+    gwp = _batch(4, country_iso=["FR", "fr", "ZZ", None])["results"]["gwp_kgCO2e"]
+    np.testing.assert_array_equal(
+        gwp, [_gwp(country_iso="FR")] * 2 + [_gwp(country_iso="ZZ"), _gwp()])
+
+
+def test_batch_single_country_iso_broadcasts():
+    gwp = _batch(2, country_iso="in")["results"]["gwp_kgCO2e"]
+    np.testing.assert_array_equal(gwp, [_gwp(country_iso="IN")] * 2)
+
+
+@pytest.mark.parametrize("iso", [5, {"FR": 1}, ["FR", 5], ["FR", "IN", "CA"]],
+                         ids=["int", "dict", "int-item", "wrong-length"])
+def test_batch_rejects_bad_country_iso(iso):
+    with pytest.raises(ValueError, match="country_iso"):
+        _batch(2, country_iso=iso)
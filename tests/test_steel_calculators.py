@@ -0,0 +1,11 @@
+import steel_calculators as st
+from batch_cases import check_batch_matches_scalar, check_structured_array_section
+
+
+def test_batch_matches_scalar():
+    check_batch_matches_scalar(st, st.compute_combined_lca_steel,
+                               st.compute_combined_lca_steel_batch)
+
+
+def test_batch_structured_array_section():
+    check_structured_array_section(st, st.compute_combined_lca_steel_batch)
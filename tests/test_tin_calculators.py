@@ -0,0 +1,11 @@
+import tin_calculators as tn
+from batch_cases import check_batch_matches_scalar, check_structured_array_section
+
+
+def test_batch_matches_scalar():
+    check_batch_matches_scalar(tn, tn.compute_combined_lca_tin,
+                               tn.compute_combined_lca_tin_batch)
+
+
+def test_batch_structured_array_section():
+    check_structured_array_section(tn, tn.compute_combined_lca_tin_batch)
@@ -1,45 +1,92 @@
 # tin_calculators.py
-from typing import Dict, Any
-from aluminium_constants import (
-    KWH_TO_MJ, L_DIESEL_MJ, KG_COAL_MJ,
-    GRID_CO2_KG_PER_KWH, DIESEL_CO2_KG_PER_L,
-    COAL_CO2_KG_PER_KG, NG_CO2_KG_PER_MJ,
-    DIESEL_CH4_KG_PER_L, DIESEL_N2O_KG_PER_L,
-    PM_PER_DIESEL_L, NOX_PER_GAS_MJ, PM_PER_COAL_KG,
-)
+from typing import Dict, Any, NamedTuple
+import numpy as np
+# the shared factors reach the cores as AL_CONSTANTS (an argument, not a global),
+# so editing aluminium_constants.py is never hidden by a stale Numba cache
+from aluminium_constants import AL_CONSTANTS
+from jit_utils import njit, prange, eager_signature
+from batch_utils import (batch_inputs, batch_size, batch_field, input_dtype,
+                         stage_section, stage_matrix, check_stage_matrix, field_alias)
+
+# GWP100 weights (kg CO2e / kg), IPCC AR5 - same as the aluminium calculators
+GWP_CH4 = 28.0
+GWP_N2O = 265.0
+
+# example argument used to build the eager-compilation signatures below
+_F = 0.0
 
 # --- helper ---
 
 
-def _sum_energy_mj_from_inputs(inputs: Dict[str, Any]) -> float:
+def _fuel_inputs(inputs: Dict[str, Any]):
+    """(electricity_kWh, fuel_diesel_L, fuel_coal_kg, fuel_naturalGas_MJ), each read once; missing = 0."""
+    get = inputs.get
+    return (float(get("electricity_kWh", 0.0)), float(get("fuel_diesel_L", 0.0)),
+            float(get("fuel_coal_kg", 0.0)), float(get("fuel_naturalGas_MJ", 0.0)))
+
+
+# Flat per-stage results returned by the numeric cores; the public calculators
+# turn these into the nested result dicts exactly once.
+class TinMiningResult(NamedTuple):
+    yield_metal_t: float
+    total_material_input_kg: float
+    energy_MJ: float
+    water_m3: float
+    waste_solid_kg: float
+    co2_kg: float
+    ch4_kg: float
+    n2o_kg: float
+    nox_kg: float
+    particulates_kg: float
+    gwp_kgCO2e: float
+
+
+class TinExtractionResult(NamedTuple):
+    yield_metal_t: float
+    total_material_input_kg: float
+    energy_MJ: float
+    waste_solid_kg: float
+    waste_hazardous_kg: float
+    co2_kg: float
+    nox_kg: float
+    particulates_kg: float
+    metal_ions_kg: float
+    gwp_kgCO2e: float
+
+
+class TinManufacturingResult(NamedTuple):
+    yield_metal_t: float
+    total_material_input_kg: float
+    energy_MJ: float
+    water_m3: float
+    waste_solid_kg: float
+    co2_kg: float
+    nox_kg: float
+    particulates_kg: float
+    gwp_kgCO2e: float
+
+# --- numeric cores (Numba-compiled when available): positional floats in, result record out ---
+
+
+@njit(eager_signature(1, AL_CONSTANTS, *(_F,) * 4), cache=True)
+def _energy_mj(C, electricity_kWh, diesel_L, coal_kg, gas_MJ):
     total = 0.0
-    if "electricity_kWh" in inputs:
-        total += float(inputs.get("electricity_kWh", 0.0)) * KWH_TO_MJ
-    if "fuel_diesel_L" in inputs:
-        total += float(inputs.get("fuel_diesel_L", 0.0)) * L_DIESEL_MJ
-    if "fuel_coal_kg" in inputs:
-        total += float(inputs.get("fuel_coal_kg", 0.0)) * KG_COAL_MJ
-    if "fuel_naturalGas_MJ" in inputs:
-        total += float(inputs.get("fuel_naturalGas_MJ", 0.0))
+    total += electricity_kWh * C.KWH_TO_MJ
+    total += diesel_L * C.L_DIESEL_MJ
+    total += coal_kg * C.KG_COAL_MJ
+    total += gas_MJ
     return total
 
-# --- mining stage for tin (cassiterite -> concentrate) ---
-
-
-def compute_mining_tin(inputs: Dict[str, Any]) -> Dict[str, Any]:
-    ore_input_kg = float(inputs.get("ore_input_kg", 0.0))
-    ore_grade_percent = float(inputs.get("ore_grade_percent", 0.0))
-    eta = float(inputs.get("process_recovery", 0.85))  # mining recovery
-    aux_kg = float(inputs.get("auxiliary_materials_kg", 0.0))
 
+@njit(eager_signature(TinMiningResult, AL_CONSTANTS, *(_F,) * 11), cache=True)
+def _mining_core(C, ore_input_kg, ore_grade_percent, eta, aux_kg,
+                 electricity_kWh, diesel_L, coal_kg, gas_MJ,
+                 freshwater_m3, process_water_m3, water_returned_m3):
     MWF = ore_grade_percent / 100.0
     yield_metal_t = (ore_input_kg * MWF * eta) / 1000.0
     total_material_input_kg = ore_input_kg + aux_kg
-    energy_mj = _sum_energy_mj_from_inputs(inputs)
+    energy_mj = _energy_mj(C, electricity_kWh, diesel_L, coal_kg, gas_MJ)
 
-    freshwater_m3 = float(inputs.get("freshwater_m3", 0.0))
-    process_water_m3 = float(inputs.get("process_water_m3", 0.0))
-    water_returned_m3 = float(inputs.get("water_returned_m3", 0.0))
     water_consumed_m3 = freshwater_m3 + process_water_m3 - water_returned_m3
 
     # waste
@@ -47,145 +94,199 @@ def compute_mining_tin(inputs: Dict[str, Any]) -> Dict[str, Any]:
 
     # emissions - simple fuel & electricity driven
     emissions_co2 = 0.0
-    if "electricity_kWh" in inputs:
-        emissions_co2 += float(inputs.get("electricity_kWh",
-                               0.0)) * GRID_CO2_KG_PER_KWH
-    emissions_co2 += float(inputs.get("fuel_diesel_L",
-                           0.0)) * DIESEL_CO2_KG_PER_L
+    emissions_co2 += electricity_kWh * C.GRID_CO2_KG_PER_KWH
+    emissions_co2 += diesel_L * C.DIESEL_CO2_KG_PER_L
     # small natural gas in mining sometimes:
-    emissions_co2 += float(inputs.get("fuel_naturalGas_MJ",
-                           0.0)) * NG_CO2_KG_PER_MJ
+    emissions_co2 += gas_MJ * C.NG_CO2_KG_PER_MJ
 
-    emissions_ch4 = float(inputs.get("fuel_diesel_L", 0.0)
-                          ) * DIESEL_CH4_KG_PER_L
-    emissions_n2o = float(inputs.get("fuel_diesel_L", 0.0)
-                          ) * DIESEL_N2O_KG_PER_L
-    emissions_nox = float(inputs.get("fuel_diesel_L", 0.0)) * \
-        PM_PER_DIESEL_L  # placeholder reuse
-    particulates = float(inputs.get("fuel_diesel_L", 0.0)) * PM_PER_DIESEL_L
+    emissions_ch4 = diesel_L * C.DIESEL_CH4_KG_PER_L
+    emissions_n2o = diesel_L * C.DIESEL_N2O_KG_PER_L
+    emissions_nox = diesel_L * C.PM_PER_DIESEL_L  # placeholder reuse
+    particulates = diesel_L * C.PM_PER_DIESEL_L
 
-    gwp = emissions_co2 + emissions_ch4 * 28.0 + emissions_n2o * 265.0
+    gwp = emissions_co2 + emissions_ch4 * GWP_CH4 + emissions_n2o * GWP_N2O
 
-    return {
-        "yield_metal_t": yield_metal_t,
-        "total_material_input_kg": total_material_input_kg,
-        "energy_MJ": energy_mj,
-        "water_m3": water_consumed_m3,
-        "waste_solid_kg": waste_solid_kg,
-        "emissions": {
-            "co2_kg": emissions_co2,
-            "ch4_kg": emissions_ch4,
-            "n2o_kg": emissions_n2o,
-            "nox_kg": emissions_nox,
-            "particulates_kg": particulates
-        },
-        "gwp_kgCO2e": gwp
-    }
-
-# --- extraction stage for tin (concentrate -> smelt/refine) ---
+    return TinMiningResult(yield_metal_t, total_material_input_kg, energy_mj,
+                           water_consumed_m3, waste_solid_kg, emissions_co2, emissions_ch4,
+                           emissions_n2o, emissions_nox, particulates, gwp)
 
 
-def compute_extraction_tin(inputs: Dict[str, Any]) -> Dict[str, Any]:
-    ore_input_kg = float(inputs.get("ore_input_kg", 0.0))
-    eta = float(inputs.get("reduction_efficiency",
-                inputs.get("process_recovery", 0.95)))
+@njit(eager_signature(TinExtractionResult, AL_CONSTANTS, *(_F,) * 11), cache=True)
+def _extraction_core(C, ore_input_kg, eta, aux_kg, electricity_kWh, diesel_L, coal_kg,
+                     gas_MJ, slag_factor, hazardous_fraction, process_co2_per_kg_ore,
+                     leaching_factor_metal):
     yield_metal_t = (ore_input_kg * eta) / 1000.0
-    total_material_input_kg = ore_input_kg + \
-        float(inputs.get("auxiliary_materials_kg", 0.0))
-
-    energy_mj = _sum_energy_mj_from_inputs(inputs)
+    total_material_input_kg = ore_input_kg + aux_kg
+    energy_mj = _energy_mj(C, electricity_kWh, diesel_L, coal_kg, gas_MJ)
 
     # waste & hazardous
-    slag_factor = float(inputs.get("slag_factor", 0.25))
     waste_solid_kg = ore_input_kg * slag_factor
-    hazardous_fraction = float(inputs.get("hazardous_fraction", 0.05))
     waste_hazardous_kg = waste_solid_kg * hazardous_fraction
 
     # emissions
     emissions_co2 = 0.0
-    if "electricity_kWh" in inputs:
-        emissions_co2 += float(inputs.get("electricity_kWh",
-                               0.0)) * GRID_CO2_KG_PER_KWH
-    emissions_co2 += float(inputs.get("fuel_coal_kg", 0.0)
-                           ) * COAL_CO2_KG_PER_KG
-    emissions_co2 += float(inputs.get("fuel_naturalGas_MJ",
-                           0.0)) * NG_CO2_KG_PER_MJ
+    emissions_co2 += electricity_kWh * C.GRID_CO2_KG_PER_KWH
+    emissions_co2 += coal_kg * C.COAL_CO2_KG_PER_KG
+    emissions_co2 += gas_MJ * C.NG_CO2_KG_PER_MJ
     # process CO2 approx (carbon-based reduction)
-    process_co2 = float(inputs.get(
-        "process_CO2_per_kg_ore", 0.3)) * ore_input_kg
-    emissions_co2 += process_co2
+    emissions_co2 += process_co2_per_kg_ore * ore_input_kg
 
     # particulates / nox
-    nox_kg = float(inputs.get("fuel_naturalGas_MJ", 0.0)) * NOX_PER_GAS_MJ
-    particulates_kg = float(inputs.get("fuel_coal_kg", 0.0)) * PM_PER_COAL_KG + \
-        float(inputs.get("fuel_diesel_L", 0.0)) * PM_PER_DIESEL_L
+    nox_kg = gas_MJ * C.NOX_PER_GAS_MJ
+    particulates_kg = coal_kg * C.PM_PER_COAL_KG + diesel_L * C.PM_PER_DIESEL_L
 
     # water metal ions (simple leaching loss)
-    metal_ions_kg = float(inputs.get("ore_input_kg", 0.0)) * \
-        float(inputs.get("leaching_factor_metal", 0.0001))
+    metal_ions_kg = ore_input_kg * leaching_factor_metal
 
     gwp = emissions_co2  # CH4/N2O small; omit for simplicity or add from fuels if desired
 
+    return TinExtractionResult(yield_metal_t, total_material_input_kg, energy_mj,
+                               waste_solid_kg, waste_hazardous_kg, emissions_co2, nox_kg,
+                               particulates_kg, metal_ions_kg, gwp)
+
+
+@njit(eager_signature(TinManufacturingResult, AL_CONSTANTS, *(_F,) * 10), cache=True)
+def _manufacturing_core(C, metal_input_kg, process_yield, aux_kg, electricity_kWh, diesel_L,
+                        coal_kg, gas_MJ, freshwater_m3, process_water_m3, loss_fraction):
+    yield_metal_t = (metal_input_kg * process_yield) / 1000.0
+    total_material_input_kg = metal_input_kg + aux_kg
+    energy_mj = _energy_mj(C, electricity_kWh, diesel_L, coal_kg, gas_MJ)
+
+    water_m3 = freshwater_m3 + process_water_m3
+    waste_solid_kg = metal_input_kg * loss_fraction
+
+    emissions_co2 = 0.0
+    emissions_co2 += electricity_kWh * C.GRID_CO2_KG_PER_KWH
+    emissions_co2 += gas_MJ * C.NG_CO2_KG_PER_MJ
+
+    nox_kg = gas_MJ * C.NOX_PER_GAS_MJ
+    particulates_kg = aux_kg * 0.001
+
+    return TinManufacturingResult(yield_metal_t, total_material_input_kg, energy_mj, water_m3,
+                                  waste_solid_kg, emissions_co2, nox_kg, particulates_kg,
+                                  emissions_co2)
+
+# --- mining stage for tin (cassiterite -> concentrate) ---
+
+
+def _mining_record(inputs: Dict[str, Any]) -> TinMiningResult:
+    get = inputs.get
+    return _mining_core(
+        AL_CONSTANTS,
+        float(get("ore_input_kg", 0.0)),
+        float(get("ore_grade_percent", 0.0)),
+        float(get("process_recovery", 0.85)),  # mining recovery
+        float(get("auxiliary_materials_kg", 0.0)),
+        *_fuel_inputs(inputs),
+        float(get("freshwater_m3", 0.0)),
+        float(get("process_water_m3", 0.0)),
+        float(get("water_returned_m3", 0.0)))
+
+
+def _mining_dict(r: TinMiningResult) -> Dict[str, Any]:
     return {
-        "yield_metal_t": yield_metal_t,
-        "total_material_input_kg": total_material_input_kg,
-        "energy_MJ": energy_mj,
-        "waste_solid_kg": waste_solid_kg,
-        "waste_hazardous_kg": waste_hazardous_kg,
+        "yield_metal_t": r.yield_metal_t,
+        "total_material_input_kg": r.total_material_input_kg,
+        "energy_MJ": r.energy_MJ,
+        "water_m3": r.water_m3,
+        "waste_solid_kg": r.waste_solid_kg,
         "emissions": {
-            "co2_kg": emissions_co2,
+            "co2_kg": r.co2_kg,
+            "ch4_kg": r.ch4_kg,
+            "n2o_kg": r.n2o_kg,
+            "nox_kg": r.nox_kg,
+            "particulates_kg": r.particulates_kg
+        },
+        "gwp_kgCO2e": r.gwp_kgCO2e
+    }
+
+
+def compute_mining_tin(inputs: Dict[str, Any]) -> Dict[str, Any]:
+    return _mining_dict(_mining_record(inputs))
+
+# --- extraction stage for tin (concentrate -> smelt/refine) ---
+
+
+def _extraction_record(inputs: Dict[str, Any]) -> TinExtractionResult:
+    get = inputs.get
+    return _extraction_core(
+        AL_CONSTANTS,
+        float(get("ore_input_kg", 0.0)),
+        float(get("reduction_efficiency", get("process_recovery", 0.95))),
+        float(get("auxiliary_materials_kg", 0.0)),
+        *_fuel_inputs(inputs),
+        float(get("slag_factor", 0.25)),
+        float(get("hazardous_fraction", 0.05)),
+        float(get("process_CO2_per_kg_ore", 0.3)),
+        float(get("leaching_factor_metal", 0.0001)))
+
+
+def _extraction_dict(r: TinExtractionResult, inputs: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "yield_metal_t": r.yield_metal_t,
+        "total_material_input_kg": r.total_material_input_kg,
+        "energy_MJ": r.energy_MJ,
+        "waste_solid_kg": r.waste_solid_kg,
+        "waste_hazardous_kg": r.waste_hazardous_kg,
+        "emissions": {
+            "co2_kg": r.co2_kg,
             "so2_kg": float(inputs.get("so2_kg_override", 0.0)),
-            "nox_kg": nox_kg,
-            "particulates_kg": particulates_kg
+            "nox_kg": r.nox_kg,
+            "particulates_kg": r.particulates_kg
         },
         "emissions_water": {
-            "metal_ions_kg": metal_ions_kg
+            "metal_ions_kg": r.metal_ions_kg
         },
-        "gwp_kgCO2e": gwp
+        "gwp_kgCO2e": r.gwp_kgCO2e
     }
 
-# --- manufacturing stage for tin (refined -> semifab) ---
-
 
-def compute_manufacturing_tin(inputs: Dict[str, Any]) -> Dict[str, Any]:
-    metal_input_kg = float(inputs.get(
-        "metal_input_kg", inputs.get("ore_input_kg", 0.0)))
-    process_yield = float(inputs.get("process_yield", 0.98))
-    yield_metal_t = (metal_input_kg * process_yield) / 1000.0
-    total_material_input_kg = metal_input_kg + \
-        float(inputs.get("auxiliary_materials_kg", 0.0))
-    energy_mj = _sum_energy_mj_from_inputs(inputs)
+def compute_extraction_tin(inputs: Dict[str, Any]) -> Dict[str, Any]:
+    return _extraction_dict(_extraction_record(inputs), inputs)
 
-    water_m3 = float(inputs.get("freshwater_m3", 0.0)) + \
-        float(inputs.get("process_water_m3", 0.0))
-    waste_solid_kg = metal_input_kg * float(inputs.get("loss_fraction", 0.005))
+# --- manufacturing stage for tin (refined -> semifab) ---
 
-    emissions_co2 = 0.0
-    if "electricity_kWh" in inputs:
-        emissions_co2 += float(inputs.get("electricity_kWh",
-                               0.0)) * GRID_CO2_KG_PER_KWH
-    emissions_co2 += float(inputs.get("fuel_naturalGas_MJ",
-                           0.0)) * NG_CO2_KG_PER_MJ
 
-    nox_kg = float(inputs.get("fuel_naturalGas_MJ", 0.0)) * NOX_PER_GAS_MJ
-    particulates_kg = float(inputs.get("auxiliary_materials_kg", 0.0)) * 0.001
+def _manufacturing_record(inputs: Dict[str, Any]) -> TinManufacturingResult:
+    get = inputs.get
+    return _manufacturing_core(
+        AL_CONSTANTS,
+        float(get("metal_input_kg", get("ore_input_kg", 0.0))),
+        float(get("process_yield", 0.98)),
+        float(get("auxiliary_materials_kg", 0.0)),
+        *_fuel_inputs(inputs),
+        float(get("freshwater_m3", 0.0)),
+        float(get("process_water_m3", 0.0)),
+        float(get("loss_fraction", 0.005)))
 
-    gwp = emissions_co2
 
+def _manufacturing_dict(r: TinManufacturingResult) -> Dict[str, Any]:
     return {
-        "yield_metal_t": yield_metal_t,
-        "total_material_input_kg": total_material_input_kg,
-        "energy_MJ": energy_mj,
-        "water_m3": water_m3,
-        "waste_solid_kg": waste_solid_kg,
+        "yield_metal_t": r.yield_metal_t,
+        "total_material_input_kg": r.total_material_input_kg,
+        "energy_MJ": r.energy_MJ,
+        "water_m3": r.water_m3,
+        "waste_solid_kg": r.waste_solid_kg,
         "emissions": {
-            "co2_kg": emissions_co2,
-            "nox_kg": nox_kg,
-            "particulates_kg": particulates_kg
+            "co2_kg": r.co2_kg,
+            "nox_kg": r.nox_kg,
+            "particulates_kg": r.particulates_kg
         },
-        "gwp_kgCO2e": gwp
+        "gwp_kgCO2e": r.gwp_kgCO2e
     }
 
+
+def compute_manufacturing_tin(inputs: Dict[str, Any]) -> Dict[str, Any]:
+    return _manufacturing_dict(_manufacturing_record(inputs))
+
+
+def warm_up() -> None:
+    """Touch each numeric core once so the API can do it before serving traffic."""
+    _mining_core(AL_CONSTANTS, *(_F,) * 11)
+    _extraction_core(AL_CONSTANTS, *(_F,) * 11)
+    _manufacturing_core(AL_CONSTANTS, *(_F,) * 10)
+    compute_combined_lca_tin_batch({"inputs": {}})
+
 # --- combined LCA entrypoint ---
 
 
@@ -199,22 +300,33 @@ def compute_combined_lca_tin(payload: Dict[str, Any]) -> Dict[str, Any]:
     extraction_inputs = inputs.get("extraction", {}) or {}
     manufacturing_inputs = inputs.get("manufacturing", {}) or {}
 
-    mining_res = compute_mining_tin(mining_inputs) if mining_inputs else {}
-    extraction_res = compute_extraction_tin(
-        extraction_inputs) if extraction_inputs else {}
-    manufacturing_res = compute_manufacturing_tin(
-        manufacturing_inputs) if manufacturing_inputs else {}
-
+    # stage records for the arithmetic below; the nested dicts are only for the response
+    mining = extraction = manufacturing = None
+    mining_res = extraction_res = manufacturing_res = {}
+    if mining_inputs:
+        mining = _mining_record(mining_inputs)
+        mining_res = _mining_dict(mining)
+    if extraction_inputs:
+        extraction = _extraction_record(extraction_inputs)
+        extraction_res = _extraction_dict(extraction, extraction_inputs)
+    if manufacturing_inputs:
+        manufacturing = _manufacturing_record(manufacturing_inputs)
+        manufacturing_res = _manufacturing_dict(manufacturing)
+
+    # totals (extraction has no water term)
     total_gwp = 0.0
     total_energy = 0.0
     total_water = 0.0
 
-    for r in (mining_res, extraction_res, manufacturing_res):
-        if not r:
+    for r in (mining, extraction, manufacturing):
+        if r is None:
             continue
-        total_gwp += float(r.get("gwp_kgCO2e", 0.0) or 0.0)
-        total_energy += float(r.get("energy_MJ", 0.0) or 0.0)
-        total_water += float(r.get("water_m3", 0.0) or 0.0)
+        total_gwp += r.gwp_kgCO2e
+        total_energy += r.energy_MJ
+    if mining is not None:
+        total_water += mining.water_m3
+    if manufacturing is not None:
+        total_water += manufacturing.water_m3
 
     recycling_rate = float(payload.get("recycling_rate", 0.0))
     primary_route_gwp = float(payload.get(
@@ -252,3 +364,98 @@ def compute_combined_lca_tin(payload: Dict[str, Any]) -> Dict[str, Any]:
         },
         "lcia_results": lcia
     }
+
+
+# --- parallel combined batch: per-scenario totals for Monte Carlo / sensitivity sweeps ---
+
+BATCH_COLUMNS = (
+    "gwp_kgCO2e", "energy_MJ", "water_m3",
+    "mining_gwp_kgCO2e", "extraction_gwp_kgCO2e", "manufacturing_gwp_kgCO2e",
+)
+
+# Input fields (and defaults) in the positional order each core expects
+_MINING_FIELDS = (
+    ("ore_input_kg", 0.0), ("ore_grade_percent", 0.0), ("process_recovery", 0.85),
+    ("auxiliary_materials_kg", 0.0), ("electricity_kWh", 0.0), ("fuel_diesel_L", 0.0),
+    ("fuel_coal_kg", 0.0), ("fuel_naturalGas_MJ", 0.0), ("freshwater_m3", 0.0),
+    ("process_water_m3", 0.0), ("water_returned_m3", 0.0),
+)
+_EXTRACTION_FIELDS = (
+    ("ore_input_kg", 0.0), ("reduction_efficiency", 0.95), ("auxiliary_materials_kg", 0.0),
+    ("electricity_kWh", 0.0), ("fuel_diesel_L", 0.0), ("fuel_coal_kg", 0.0),
+    ("fuel_naturalGas_MJ", 0.0), ("slag_factor", 0.25), ("hazardous_fraction", 0.05),
+    ("process_CO2_per_kg_ore", 0.3), ("leaching_factor_metal", 0.0001),
+)
+_MANUFACTURING_FIELDS = (
+    ("metal_input_kg", 0.0), ("process_yield", 0.98), ("auxiliary_materials_kg", 0.0),
+    ("electricity_kWh", 0.0), ("fuel_diesel_L", 0.0), ("fuel_coal_kg", 0.0),
+    ("fuel_naturalGas_MJ", 0.0), ("freshwater_m3", 0.0), ("process_water_m3", 0.0),
+    ("loss_fraction", 0.005),
+)
+
+MINING_INPUT_DTYPE = input_dtype(_MINING_FIELDS)
+EXTRACTION_INPUT_DTYPE = input_dtype(_EXTRACTION_FIELDS)
+MANUFACTURING_INPUT_DTYPE = input_dtype(_MANUFACTURING_FIELDS)
+
+
+@njit(parallel=True, nogil=True, cache=True)
+def _run_batch(C, mining, extraction, manufacturing, out):
+    """Fill out[:, i] (rows as BATCH_COLUMNS) for every scenario i, in parallel."""
+    for i in prange(out.shape[1]):
+        m = mining[i]
+        e = extraction[i]
+        f = manufacturing[i]
+        mining_res = _mining_core(C, m[0], m[1], m[2], m[3], m[4], m[5], m[6], m[7], m[8],
+                                  m[9], m[10])
+        extraction_res = _extraction_core(C, e[0], e[1], e[2], e[3], e[4], e[5], e[6], e[7],
+                                          e[8], e[9], e[10])
+        manufacturing_res = _manufacturing_core(C, f[0], f[1], f[2], f[3], f[4], f[5], f[6],
+                                                f[7], f[8], f[9])
+        out[0, i] = mining_res.gwp_kgCO2e + extraction_res.gwp_kgCO2e + \
+            manufacturing_res.gwp_kgCO2e
+        out[1, i] = mining_res.energy_MJ + extraction_res.energy_MJ + \
+            manufacturing_res.energy_MJ
+        out[2, i] = mining_res.water_m3 + manufacturing_res.water_m3
+        out[3, i] = mining_res.gwp_kgCO2e
+        out[4, i] = extraction_res.gwp_kgCO2e
+        out[5, i] = manufacturing_res.gwp_kgCO2e
+
+
+def compute_combined_lca_tin_batch(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Batch version of compute_combined_lca_tin, same payload conventions as the
+    aluminium batch: each stage field is an array (or list) with one value per
+    scenario, scalars broadcast, and a section may be a structured array such as
+    MINING_INPUT_DTYPE.
+    Returns {"n_scenarios": n, "results": {column: array}} with BATCH_COLUMNS plus
+    avoided_primary_co2e_kg.
+    Raises ValueError if a section is not an object or any input is non-numeric,
+    NaN, infinite or negative.
+    """
+    inputs = batch_inputs(payload)
+    mining_inputs = stage_section(inputs, "mining")
+    extraction_inputs = field_alias(
+        stage_section(inputs, "extraction"), "reduction_efficiency", "process_recovery")
+    manufacturing_inputs = field_alias(
+        stage_section(inputs, "manufacturing"), "metal_input_kg", "ore_input_kg")
+
+    n = max(batch_size(mining_inputs), batch_size(extraction_inputs),
+            batch_size(manufacturing_inputs))
+    # one contiguous row per output column
+    out = np.empty((len(BATCH_COLUMNS), n), dtype=np.float64)
+    _run_batch(AL_CONSTANTS,
+               check_stage_matrix(stage_matrix(mining_inputs, _MINING_FIELDS, n),
+                                  _MINING_FIELDS, "mining"),
+               check_stage_matrix(stage_matrix(extraction_inputs, _EXTRACTION_FIELDS, n),
+                                  _EXTRACTION_FIELDS, "extraction"),
+               check_stage_matrix(stage_matrix(manufacturing_inputs, _MANUFACTURING_FIELDS, n),
+                                  _MANUFACTURING_FIELDS, "manufacturing"),
+               out)
+
+    results = {name: out[j] for j, name in enumerate(BATCH_COLUMNS)}
+    recycling_rate = batch_field(payload, "recycling_rate", 0.0, n)
+    primary_route_gwp = batch_field(
+        payload, "primary_route_gwp_kgCO2e", 0.0, n) if "primary_route_gwp_kgCO2e" in payload \
+        else results["gwp_kgCO2e"]
+    results["avoided_primary_co2e_kg"] = recycling_rate * primary_route_gwp
+    return {"n_scenarios": n, "results": results}
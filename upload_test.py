@@ -1,6 +1,12 @@
 import requests
 import os
 
+try:
+    # streams the multipart body from the open file instead of building it in memory
+    from requests_toolbelt import MultipartEncoder
+except ImportError:
+    MultipartEncoder = None
+
 # 1. URL of your FastAPI upload endpoint
 url = "http://127.0.0.1:8000/datasets/upload_excel"
 
@@ -10,9 +16,9 @@ file_path = os.path.join("data", "iai_aluminium_simple.xlsx")
 if not os.path.exists(file_path):
     raise FileNotFoundError(f"File not found at: {file_path}")
 
-# 3. Open file and send in one go
+# 3. Open file and send it
 with open(file_path, "rb") as f:
-    files = {
+    fields = {
         # 👇 IMPORTANT: name must be "file" (same as UploadFile(..., name="file"))
         #     Use a .xlsx filename + correct Excel MIME type
         "file": (
@@ -21,7 +27,13 @@ with open(file_path, "rb") as f:
             "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
         )
     }
-    response = requests.post(url, files=files)
+    if MultipartEncoder is not None:
+        encoder = MultipartEncoder(fields=fields)
+        response = requests.post(
+            url, data=encoder, headers={"Content-Type": encoder.content_type})
+    else:
+        print("requests-toolbelt not installed; sending the file in one buffered request")
+        response = requests.post(url, files=fields)
 
 print("Status code:", response.status_code)
 print("Response text:", response.text)